@@ -1,14 +1,22 @@
 # SPDX-License-Identifier: MPL-2.0
-from .namespaces import *
-from .rdflib_tools import *
-from .synthesizer import *
-from .utility import *
-from .ir_gen import *
+from kindynsyn.utility.lazy import lazy_package
 
 __all__ = [
     "namespaces",
     "rdflib_tools",
     "synthesizer",
     "utility",
-    "ir_gen"
+    "ir_gen",
+    "ir_eval",
+    "optimizer",
+    "code_gen"
 ]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "namespaces": [
+        "GEOM_ENT", "GEOM_REL", "GEOM_COORD", "GEOM_OP", "RBDYN_ENT", "RBDYN_COORD", "RBDYN_OP",
+        "KC_ENT", "KC_NAV", "KC_STAT", "KC_OP", "SPEC", "ALGO", "QUDT_SCHEMA", "QUDT_QKIND",
+        "QUDT_UNIT", "UUID"
+    ]
+})
@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.utility.lazy import lazy_package
+
+__all__ = ["template", "interpreter", "group"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "template": [
+        "KEYWORDS", "SIMPLE_TOKENS", "FUNCTIONS", "OPTION_DEFAULTS", "is_id_start", "is_id_letter",
+        "is_ws", "Token", "Lexer", "Template", "Text", "Newline", "Expression", "Indented", "If",
+        "Parser", "compile_elements", "compile_template"
+    ],
+    "interpreter": [
+        "DictKey", "DICT_KEY", "Instance", "Scope", "Writer", "java_double", "to_text", "iterable",
+        "to_iterator", "test_attribute", "Interpreter", "Dictionary", "DictionaryTemplate"
+    ],
+    "group": [
+        "is_group_id_start", "is_group_id_letter", "GroupLexer", "replace_escapes", "trim_newline",
+        "TemplateGroup", "load_group"
+    ]
+})
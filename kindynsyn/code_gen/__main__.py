@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import json
+import argparse
+from .group import load_group
+
+
+def main():
+    # The same interface as the StringTemplate Standalone Tool (stst)
+    parser = argparse.ArgumentParser(prog="python -m kindynsyn.code_gen",
+        description="Render a template of a StringTemplate group with JSON data")
+    parser.add_argument("-s", dest="delimiters", default="<>",
+        help="start and stop delimiter characters (default: \"<>\")")
+    parser.add_argument("-t", dest="directory", default=".",
+        help="directory that contains the group files")
+    parser.add_argument("template", help="<group>.<template>")
+    parser.add_argument("data", nargs="?", help="JSON file (default: standard input)")
+    args = parser.parse_args()
+
+    if len(args.delimiters) != 2:
+        parser.error("expected two delimiter characters")
+    group, _, name = args.template.rpartition(".")
+    if not group:
+        parser.error("expected <group>.<template>")
+
+    if args.data:
+        with open(args.data) as f:
+            data = json.load(f)
+    else:
+        data = json.load(sys.stdin)
+
+    try:
+        g = load_group("{}/{}.stg".format(args.directory, group), *args.delimiters)
+        sys.stdout.write(g.render(name, data))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+from .template import compile_template
+from .interpreter import Interpreter, Instance, Dictionary, DictionaryTemplate, DICT_KEY
+
+
+def is_group_id_start(c):
+    return ("a" <= c <= "z") or ("A" <= c <= "Z") or c == "_"
+
+
+def is_group_id_letter(c):
+    return is_group_id_start(c) or ("0" <= c <= "9") or c == "-"
+
+
+class GroupLexer:
+    """
+    Tokens of a group file: identifiers, strings ("..."), big strings
+    (<<...>>), anonymous templates ({...}) and punctuation. Comments are
+    skipped.
+    """
+    def __init__(self, text, name):
+        self.text = text
+        self.name = name
+        self.pos = 0
+        self.line = 1
+
+    def error(self, msg):
+        raise ValueError("{}:{}: {}".format(self.name, self.line, msg))
+
+    def advance(self, n):
+        self.line += self.text.count("\n", self.pos, self.pos + n)
+        self.pos += n
+
+    def skip(self):
+        text = self.text
+        while self.pos < len(text):
+            c = text[self.pos]
+            if c in " \t\r\n":
+                self.advance(1)
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.advance((end if end >= 0 else len(text)) - self.pos)
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end < 0:
+                    self.error("unterminated comment")
+                self.advance(end + 2 - self.pos)
+            else:
+                return
+
+    def tokens(self):
+        text = self.text
+        while True:
+            self.skip()
+            if self.pos >= len(text):
+                yield ("EOF", "", self.line)
+                return
+            c = text[self.pos]
+            line = self.line
+
+            if text.startswith("::=", self.pos):
+                self.advance(3)
+                yield ("DEFINED", "::=", line)
+            elif text.startswith("<<", self.pos):
+                end = self.pos + 2
+                while not text.startswith(">>", end):
+                    if end >= len(text):
+                        self.error("unterminated template")
+                    end += 2 if text[end] == "\\" else 1
+                body = text[self.pos + 2:end].replace("\\>", ">")
+                self.advance(end + 2 - self.pos)
+                yield ("BIGSTRING", body, line)
+            elif c == '"':
+                end = self.pos + 1
+                while end < len(text) and text[end] != '"':
+                    end += 2 if text[end] == "\\" else 1
+                if end >= len(text):
+                    self.error("unterminated string")
+                body = text[self.pos + 1:end].replace('\\"', '"')
+                self.advance(end + 1 - self.pos)
+                yield ("STRING", body, line)
+            elif c == "{":
+                depth = 0
+                end = self.pos
+                while True:
+                    if end >= len(text):
+                        self.error("unterminated anonymous template")
+                    if text[end] == "\\":
+                        end += 2
+                        continue
+                    if text[end] == "{":
+                        depth += 1
+                    elif text[end] == "}":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    end += 1
+                body = text[self.pos + 1:end]
+                self.advance(end + 1 - self.pos)
+                yield ("ANONYMOUS_TEMPLATE", body, line)
+            elif is_group_id_start(c):
+                end = self.pos + 1
+                while end < len(text) and is_group_id_letter(text[end]):
+                    end += 1
+                name = text[self.pos:end]
+                self.advance(end - self.pos)
+                yield ("ID", name, line)
+            elif c in "()[],:=.@":
+                self.advance(1)
+                yield (c, c, line)
+            else:
+                self.error("unexpected character {!r}".format(c))
+
+
+def replace_escapes(text):
+    return text.replace("\\n", "\n").replace("\\r", "\r").replace("\\t", "\t")
+
+
+def trim_newline(text):
+    """
+    Remove one leading and one trailing newline of a template definition
+    """
+    for nl in ("\r\n", "\n"):
+        if text.startswith(nl):
+            text = text[len(nl):]
+            break
+    for nl in ("\r\n", "\n"):
+        if text.endswith(nl):
+            text = text[:-len(nl)]
+            break
+    return text
+
+
+class TemplateGroup:
+    """
+    The templates and dictionaries of a StringTemplate group file (".stg")
+    together with the groups that it imports. Imports are resolved relative
+    to the group's directory, the working directory and the ancestors of the
+    group's directory (in this order).
+
+    Templates are looked up in the group first and then, depth-first, in the
+    imported groups. A template's dictionaries are looked up in the group that
+    defines the template and the groups it imports.
+    """
+    def __init__(self, path, start="<", stop=">"):
+        self.path = os.path.abspath(path)
+        self.start = start
+        self.stop = stop
+        self.templates = {}
+        self.dictionaries = {}
+        self.imports = []
+
+        with open(self.path) as f:
+            text = f.read()
+        self.parse(text)
+
+    def error(self, token, msg):
+        raise ValueError("{}:{}: {}".format(self.path, token[2], msg))
+
+    def resolve(self, name):
+        base = os.path.dirname(self.path)
+        candidates = [os.path.join(base, name), os.path.abspath(name)]
+        d = os.path.dirname(base)
+        while d != os.path.dirname(d):
+            candidates.append(os.path.join(d, name))
+            d = os.path.dirname(d)
+        for c in candidates:
+            if os.path.isfile(c):
+                return os.path.normpath(c)
+        raise ValueError("{}: can't find imported group: {}".format(self.path, name))
+
+    def la(self, i=0):
+        return self.tokens[min(self.pos + i, len(self.tokens) - 1)]
+
+    def consume(self):
+        t = self.la()
+        self.pos += 1
+        return t
+
+    def match(self, type, text=None):
+        t = self.consume()
+        if t[0] != type or (text is not None and t[1] != text):
+            self.error(t, "expected {} but found {!r}".format(text or type, t[1]))
+        return t
+
+    def parse(self, text):
+        self.tokens = list(GroupLexer(text, self.path).tokens())
+        self.pos = 0
+
+        while self.la()[:2] == ("ID", "import"):
+            self.consume()
+            name = self.match("STRING")[1]
+            self.imports.append(load_group(self.resolve(name), self.start, self.stop))
+
+        while self.la()[0] != "EOF":
+            name = self.match("ID")
+            if self.la()[0] == "(":
+                self.template_definition(name)
+            else:
+                self.match("DEFINED")
+                if self.la()[0] == "[":
+                    self.dictionary_definition(name)
+                else:
+                    # Alias of another template
+                    target = self.match("ID")[1]
+                    if target not in self.templates:
+                        self.error(name, "no such template: {}".format(target))
+                    self.templates[name[1]] = self.templates[target]
+
+        del self.tokens
+
+    def template_definition(self, name):
+        self.match("(")
+        args, defaults = [], {}
+        while self.la()[0] != ")":
+            arg = self.match("ID")[1]
+            args.append(arg)
+            if self.la()[0] == "=":
+                self.consume()
+                defaults[arg] = self.value(["STRING", "ANONYMOUS_TEMPLATE", "true", "false", "[]"])
+            if self.la()[0] != ")":
+                self.match(",")
+        self.match(")")
+        self.match("DEFINED")
+
+        t = self.consume()
+        if t[0] not in ("STRING", "BIGSTRING"):
+            self.error(t, "expected template but found {!r}".format(t[1]))
+        self.templates[name[1]] = self.compile(name[1], args, defaults, t[1], t[2])
+
+    def dictionary_definition(self, name):
+        self.match("[")
+        pairs, default = {}, None
+        allowed = ["STRING", "BIGSTRING", "ANONYMOUS_TEMPLATE", "true", "false", "[]", "key"]
+        while self.la()[0] != "]":
+            if self.la()[:2] == ("ID", "default"):
+                self.consume()
+                self.match(":")
+                default = self.value(allowed)
+            else:
+                key = replace_escapes(self.match("STRING")[1])
+                self.match(":")
+                pairs[key] = self.value(allowed)
+            if self.la()[0] != "]":
+                self.match(",")
+        self.match("]")
+        self.dictionaries[name[1]] = Dictionary(pairs, default)
+
+    def value(self, allowed):
+        """
+        Parse the default value of a formal argument or a dictionary's value
+        """
+        t = self.consume()
+        type, text = t[0], t[1]
+        if type == "STRING" and type in allowed:
+            return replace_escapes(text)
+        if type in ("BIGSTRING", "ANONYMOUS_TEMPLATE") and type in allowed:
+            return DictionaryTemplate(self.compile("_value", [], {}, text, t[2], True))
+        if type == "ID" and text in ("true", "false") and text in allowed:
+            return text == "true"
+        if type == "ID" and text == "key" and text in allowed:
+            return DICT_KEY
+        if type == "[" and "[]" in allowed:
+            self.match("]")
+            return []
+        self.error(t, "invalid value {!r}".format(text))
+
+    def compile(self, name, args, defaults, text, line, anonymous=False):
+        try:
+            res = compile_template(name, args, defaults, trim_newline(text), self,
+                                   self.start, self.stop)
+        except ValueError as e:
+            raise ValueError("{}:{}: template {}: {}".format(self.path, line, name, e))
+        res.anonymous = anonymous
+        if anonymous:
+            res.args = res.args + ["i", "i0"]
+        return res
+
+    def lookup(self, name):
+        """
+        Return the template with the given name or None
+        """
+        if name in self.templates:
+            return self.templates[name]
+        for g in self.imports:
+            t = g.lookup(name)
+            if t is not None:
+                return t
+        return None
+
+    def dictionary(self, name):
+        """
+        Return whether a dictionary with the given name exists and its value
+        """
+        if name in self.dictionaries:
+            return True, self.dictionaries[name]
+        for g in self.imports:
+            found, d = g.dictionary(name)
+            if found:
+                return found, d
+        return False, None
+
+    def files(self):
+        """
+        The paths of the group file and all (transitively) imported group files
+        """
+        res = [self.path]
+        for g in self.imports:
+            res.extend(f for f in g.files() if f not in res)
+        return res
+
+    def render(self, name, attributes={}):
+        """
+        Render the template with the given name. The attributes (e.g. the IR)
+        map the template's formal arguments to their values.
+        """
+        template = self.lookup(name)
+        if template is None:
+            raise ValueError("No such template: {}".format(name))
+        for k in attributes:
+            if k not in template.args:
+                raise ValueError("No such attribute: {}".format(k))
+        return Interpreter(self).render(Instance(template, dict(attributes)))
+
+
+_groups = {}    # (path, start, stop) -> (group, modification times)
+
+
+def load_group(path, start="<", stop=">"):
+    """
+    Load a group file. The parsed groups are cached until the group file or one
+    of its imports changes.
+    """
+    key = (os.path.abspath(path), start, stop)
+    if key in _groups:
+        group, mtimes = _groups[key]
+        try:
+            if all(os.stat(f).st_mtime_ns == t for f, t in mtimes.items()):
+                return group
+        except OSError:
+            pass
+
+    group = TemplateGroup(path, start, stop)
+    _groups[key] = (group, {f: os.stat(f).st_mtime_ns for f in group.files()})
+    return group
@@ -0,0 +1,570 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import math
+
+
+class DictKey:
+    """
+    The value "key" in a dictionary: the lookup returns the key itself
+    """
+    def __repr__(self):
+        return "key"
+
+
+DICT_KEY = DictKey()
+
+
+class Instance:
+    """
+    An instance of a template with the values of (some of) its formal
+    arguments. Instances are rendered lazily where they are written so that
+    attributes that are not formal arguments are resolved in the scope of the
+    writing template (dynamic scoping).
+    """
+    __slots__ = ("template", "locals")
+
+    def __init__(self, template, locals=None):
+        self.template = template
+        self.locals = locals if locals is not None else {}
+
+    def __repr__(self):
+        return "Instance({})".format(self.template.name)
+
+
+class Scope:
+    __slots__ = ("instance", "parent")
+
+    def __init__(self, instance, parent):
+        self.instance = instance
+        self.parent = parent
+
+
+class Writer:
+    """
+    Writer that indents each line by the current indentation (the indentation
+    of the enclosing expressions) and drops carriage returns.
+    """
+    def __init__(self):
+        self.out = []
+        self.indents = []
+        self.at_start = True
+
+    def push(self, indent):
+        self.indents.append(indent)
+
+    def pop(self):
+        self.indents.pop()
+
+    def write(self, text):
+        """
+        Return the number of characters written including the indentation.
+        """
+        if "\r" in text:
+            text = text.replace("\r", "")
+
+        n = 0
+        for k, line in enumerate(text.split("\n")):
+            if k > 0:
+                self.out.append("\n")
+                self.at_start = True
+                n += 1
+            if line:
+                if self.at_start:
+                    indent = "".join(self.indents)
+                    self.out.append(indent)
+                    n += len(indent)
+                    self.at_start = False
+                self.out.append(line)
+                n += len(line)
+        return n
+
+    def getvalue(self):
+        return "".join(self.out)
+
+
+def java_double(x):
+    """
+    Format a float like Java's Double.toString (StringTemplate relies on the
+    Java representation of the values).
+    """
+    if math.isnan(x):
+        return "NaN"
+    if math.isinf(x):
+        return "Infinity" if x > 0 else "-Infinity"
+    if x == 0:
+        return "-0.0" if math.copysign(1, x) < 0 else "0.0"
+
+    sign = "-" if x < 0 else ""
+    # The shortest digits that represent the value and the decimal exponent
+    mantissa, _, exponent = "{!r}".format(abs(x)).partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = (whole + fraction).lstrip("0")
+    e = int(exponent or 0) + len(whole.lstrip("0")) - 1
+    if not whole.lstrip("0"):
+        e -= len(fraction) - len(fraction.lstrip("0"))
+    digits = digits.rstrip("0") or "0"
+
+    if -3 <= e < 7:
+        if e >= 0:
+            whole, fraction = digits[:e + 1].ljust(e + 1, "0"), digits[e + 1:]
+        else:
+            whole, fraction = "0", "0" * (-e - 1) + digits
+        return "{}{}.{}".format(sign, whole, fraction or "0")
+    return "{}{}.{}E{}".format(sign, digits[0], digits[1:] or "0", e)
+
+
+def to_text(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return java_double(value)
+    return str(value)
+
+
+def iterable(value):
+    return isinstance(value, (list, tuple, dict))
+
+
+def to_iterator(value):
+    # Dictionaries iterate over their keys
+    return iter(value)
+
+
+def test_attribute(value):
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if iterable(value):
+        return len(value) > 0
+    return True
+
+
+class Interpreter:
+    """
+    Execute the instructions of compiled templates (see template.py). The
+    number of characters written by each template determines whether newlines
+    and separators are emitted:
+    - a newline is only written if something was written on the current line,
+      or if the line is empty in the template itself
+    - a separator is only written after an element that produced output
+    """
+    def __init__(self, group, errors=sys.stderr):
+        self.group = group
+        self.errors = errors
+
+    def error(self, scope, msg):
+        names = []
+        while scope is not None:
+            names.append(scope.instance.template.name)
+            scope = scope.parent
+        print("context [{}] {}".format(" ".join(reversed(names)), msg), file=self.errors)
+
+    def instance(self, scope, name):
+        template = self.group.lookup(name)
+        if template is None:
+            self.error(scope, "no such template: {}".format(name))
+            return None
+        return Instance(template)
+
+    def store_args(self, scope, inst, args):
+        formal = inst.template.args
+        if inst.template.anonymous:
+            formal = formal[:-2]
+        if len(args) > len(formal):
+            self.error(scope, "passed {} arg(s) to template {} with {} declared arg(s)".format(
+                len(args), inst.template.name, len(formal)))
+        for name, value in zip(formal, args):
+            inst.locals[name] = value
+
+    def new(self, scope, name, args):
+        inst = self.instance(scope, name)
+        if inst is None:
+            return None
+        if isinstance(args, dict):
+            for k, v in args.items():
+                if k == "...":
+                    continue
+                if k not in inst.template.args:
+                    self.error(scope, "attribute {} isn't defined".format(k))
+                    continue
+                inst.locals[k] = self.evaluate(scope, v)
+            if "..." in args:
+                for k in inst.template.args:
+                    if k not in inst.locals:
+                        found, value = self.lookup_scope(scope, k)
+                        if found:
+                            inst.locals[k] = value
+        else:
+            self.store_args(scope, inst, [self.evaluate(scope, a) for a in args])
+        return inst
+
+    # Attributes
+
+    def lookup_scope(self, scope, name):
+        while scope is not None:
+            if name in scope.instance.template.args:
+                return True, scope.instance.locals.get(name)
+            scope = scope.parent
+        return False, None
+
+    def attribute(self, scope, name):
+        found, value = self.lookup_scope(scope, name)
+        if found:
+            return value
+        found, value = scope.instance.template.group.dictionary(name)
+        if found:
+            return value
+        self.error(scope, "attribute {} isn't defined".format(name))
+        return None
+
+    def property(self, scope, obj, prop):
+        if obj is None:
+            return None
+        name = prop if isinstance(prop, str) else self.to_string(scope, prop)
+
+        if isinstance(obj, dict):
+            if prop is None:
+                value = obj.default if isinstance(obj, Dictionary) else None
+            elif isinstance(prop, (str, int, float, bool)) and prop in obj:
+                value = obj[prop]
+            elif name in obj:
+                value = obj[name]
+            elif name == "keys":
+                value = list(obj.keys())
+            elif name == "values":
+                value = list(obj.values())
+            else:
+                value = obj.default if isinstance(obj, Dictionary) else None
+            if value is DICT_KEY:
+                value = prop
+            elif isinstance(value, DictionaryTemplate):
+                value = Instance(value.template)
+            return value
+
+        if isinstance(obj, Instance):
+            if name in obj.template.args:
+                return obj.locals.get(name)
+
+        self.error(scope, "no such property or can't access: {}.{}".format(
+            type(obj).__name__, name))
+        return None
+
+    # Expressions
+
+    def evaluate(self, scope, expr):
+        kind = expr[0]
+        if kind == "attr":
+            return self.attribute(scope, expr[1])
+        if kind == "str" or kind == "bool":
+            return expr[1]
+        if kind == "null":
+            return None
+        if kind == "prop":
+            return self.property(scope, self.evaluate(scope, expr[1]), expr[2])
+        if kind == "prop-ind":
+            obj = self.evaluate(scope, expr[1])
+            return self.property(scope, obj, self.evaluate(scope, expr[2]))
+        if kind == "include":
+            return self.new(scope, expr[1], expr[2])
+        if kind == "include-ind":
+            name = self.to_string(scope, self.evaluate(scope, expr[1]))
+            return self.new(scope, name, expr[2])
+        if kind == "tostr":
+            return self.to_string(scope, self.evaluate(scope, expr[1]))
+        if kind == "sub":
+            return Instance(expr[1])
+        if kind == "list":
+            res = []
+            for e in expr[1]:
+                value = self.evaluate(scope, e)
+                if iterable(value):
+                    res.extend(to_iterator(value))
+                else:
+                    res.append(value)
+            return res
+        if kind == "func":
+            arg = self.evaluate(scope, expr[2]) if expr[2] is not None else None
+            return getattr(self, "func_" + expr[1])(scope, arg)
+        if kind == "map":
+            return self.map(scope, self.evaluate(scope, expr[1]), expr[2])
+        if kind == "zip":
+            return self.zip(scope, [self.evaluate(scope, e) for e in expr[1]], expr[2])
+        if kind == "not":
+            return not test_attribute(self.evaluate(scope, expr[1]))
+        if kind == "and":
+            return test_attribute(self.evaluate(scope, expr[1])) \
+                and test_attribute(self.evaluate(scope, expr[2]))
+        if kind == "or":
+            return test_attribute(self.evaluate(scope, expr[1])) \
+                or test_attribute(self.evaluate(scope, expr[2]))
+        raise ValueError("unknown expression: {}".format(kind))
+
+    def prototype(self, scope, ref, nexprs):
+        """
+        Instantiate a template reference of a map operation. The iterated
+        values precede the reference's arguments.
+        """
+        kind = ref[0]
+        if kind == "sub":
+            return Instance(ref[1])
+        if kind == "ref":
+            name, args = ref[1], ref[2]
+        else:
+            name, args = self.to_string(scope, self.evaluate(scope, ref[1])), ref[2]
+
+        inst = self.instance(scope, name)
+        if inst is None:
+            return None
+        if isinstance(args, dict):
+            for k, v in args.items():
+                if k != "...":
+                    inst.locals[k] = self.evaluate(scope, v)
+        else:
+            self.store_args(scope, inst, [None] * nexprs + [self.evaluate(scope, a) for a in args])
+        return inst
+
+    def set_first(self, scope, inst, value, i):
+        args = inst.template.args
+        if inst.template.anonymous:
+            args = args[:-2]
+            inst.locals["i0"] = i - 1
+            inst.locals["i"] = i
+        elif not args:
+            self.error(scope, "passed 1 arg(s) to template {} with 0 declared arg(s)".format(
+                inst.template.name))
+        if args:
+            inst.locals[args[0]] = value
+
+    def copy(self, inst):
+        return Instance(inst.template, dict(inst.locals))
+
+    def map(self, scope, value, refs):
+        if value is None:
+            return None
+        prototypes = [self.prototype(scope, r, 1) for r in refs]
+        if any(p is None for p in prototypes):
+            return None
+
+        if not iterable(value):
+            inst = self.copy(prototypes[0])
+            self.set_first(scope, inst, value, 1)
+            return inst
+
+        res = []
+        i = 1
+        for v in to_iterator(value):
+            if v is None:
+                res.append(None)
+                continue
+            inst = self.copy(prototypes[(i - 1) % len(prototypes)])
+            self.set_first(scope, inst, v, i)
+            res.append(inst)
+            i += 1
+        return res
+
+    def zip(self, scope, values, ref):
+        prototype = self.prototype(scope, ref, len(values))
+        if prototype is None or not values:
+            return None
+
+        iterators = []
+        for v in values:
+            if v is None:
+                iterators.append(None)
+            else:
+                iterators.append(to_iterator(v) if iterable(v) else iter([v]))
+
+        formal = prototype.template.args
+        if prototype.template.anonymous:
+            formal = formal[:-2]
+        if len(formal) != len(values):
+            self.error(scope, "iterating through {} values in zip map but template has {} declared arguments".format(
+                len(values), len(formal)))
+        n = min(len(formal), len(values))
+
+        res = []
+        i = 0
+        _end = object()
+        while True:
+            inst = self.copy(prototype)
+            inst.locals["i0"] = i
+            inst.locals["i"] = i + 1
+            empty = 0
+            for a in range(n):
+                v = next(iterators[a], _end) if iterators[a] is not None else _end
+                if v is _end:
+                    empty += 1
+                else:
+                    inst.locals[formal[a]] = v
+            if empty == n:
+                return res
+            res.append(inst)
+            i += 1
+
+    # Functions
+
+    def func_first(self, scope, v):
+        if iterable(v):
+            return next(to_iterator(v), None)
+        return v
+
+    def func_last(self, scope, v):
+        if iterable(v):
+            res = None
+            for res in to_iterator(v):
+                pass
+            return res
+        return v
+
+    def func_rest(self, scope, v):
+        if iterable(v):
+            elements = list(to_iterator(v))
+            return elements[1:] if len(elements) > 1 else None
+        return None
+
+    def func_trunc(self, scope, v):
+        if iterable(v):
+            elements = list(to_iterator(v))
+            return elements[:-1] if len(elements) > 1 else None
+        return v
+
+    def func_strip(self, scope, v):
+        if iterable(v):
+            return [e for e in to_iterator(v) if e is not None]
+        return v
+
+    def func_reverse(self, scope, v):
+        if iterable(v):
+            return list(reversed(list(to_iterator(v))))
+        return v
+
+    def func_length(self, scope, v):
+        if v is None:
+            return 0
+        if iterable(v):
+            return len(v)
+        return 1
+
+    def func_strlen(self, scope, v):
+        if v is None:
+            return 0
+        return len(self.to_string(scope, v))
+
+    def func_trim(self, scope, v):
+        if isinstance(v, str):
+            return v.strip("".join(chr(c) for c in range(33)))
+        return v
+
+    # Output
+
+    def to_string(self, scope, value):
+        if value is None or isinstance(value, str):
+            return value
+        out = Writer()
+        self.write_object(out, scope, value, None)
+        return out.getvalue()
+
+    def write_object(self, out, scope, value, options):
+        if value is None:
+            if options is None or options.get("null") is None:
+                return 0
+            value = options["null"]
+        if isinstance(value, Instance):
+            return self.execute(out, Scope(value, scope))
+        if iterable(value):
+            return self.write_iterator(out, scope, value, options)
+        return out.write(to_text(value))
+
+    def write_iterator(self, out, scope, value, options):
+        separator = options.get("separator") if options is not None else None
+        null = options.get("null") if options is not None else None
+
+        n = 0
+        seen = False
+        for v in to_iterator(value):
+            if seen and separator is not None and (v is not None or null is not None):
+                n += out.write(separator)
+            written = self.write_object(out, scope, v, options)
+            if written > 0:
+                seen = True
+            n += written
+        return n
+
+    def write(self, out, scope, value, options):
+        if options:
+            options = {k: self.to_string(scope, self.evaluate(scope, v)) for k, v in options.items()}
+        return self.write_object(out, scope, value, options)
+
+    def defaults(self, scope, inst):
+        for name, default in inst.template.defaults.items():
+            if name in inst.locals:
+                continue
+            if isinstance(default, DictionaryTemplate):
+                inst.locals[name] = Instance(default.template)
+            else:
+                inst.locals[name] = default
+
+    def execute(self, out, scope):
+        """
+        Write the instance of the scope and return the number of characters
+        written.
+        """
+        inst = scope.instance
+        self.defaults(scope, inst)
+
+        code = inst.template.code
+        n = 0
+        nwline = 0      # Characters written on the current line
+        prev = None
+        ip = 0
+        while ip < len(code):
+            instr = code[ip]
+            op = instr[0]
+            ip += 1
+            if op == "text":
+                k = out.write(instr[1])
+                n += k
+                nwline += k
+            elif op == "write":
+                k = self.write(out, scope, self.evaluate(scope, instr[1]), instr[2])
+                n += k
+                nwline += k
+            elif op == "newline":
+                if prev == "newline" or prev == "indent" or nwline > 0:
+                    out.write("\n")
+                nwline = 0
+            elif op == "indent":
+                out.push(instr[1])
+            elif op == "dedent":
+                out.pop()
+            elif op == "brf":
+                if not test_attribute(self.evaluate(scope, instr[1])):
+                    ip = instr[2]
+            elif op == "br":
+                ip = instr[1]
+            prev = op
+        return n
+
+    def render(self, inst):
+        out = Writer()
+        self.execute(out, Scope(inst, None))
+        return out.getvalue()
+
+
+class Dictionary(dict):
+    """
+    A dictionary of a group with its default value ("default" in the group)
+    """
+    def __init__(self, pairs, default=None):
+        super().__init__(pairs)
+        self.default = default
+
+
+class DictionaryTemplate:
+    """
+    A template as value of a dictionary or as default value of a formal
+    argument that is instantiated whenever it is used
+    """
+    def __init__(self, template):
+        self.template = template
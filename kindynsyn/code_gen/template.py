@@ -0,0 +1,740 @@
+# SPDX-License-Identifier: MPL-2.0
+
+#
+# Lexer, parser and compiler for the templates of a StringTemplate 4 group.
+# The templates are compiled to a flat list of instructions that mirrors
+# StringTemplate's byte code in all aspects that affect the output (in
+# particular the treatment of indentation and newlines).
+#
+
+KEYWORDS = {
+    "if": "IF",
+    "elseif": "ELSEIF",
+    "else": "ELSE",
+    "endif": "ENDIF",
+    "super": "SUPER",
+    "true": "TRUE",
+    "false": "FALSE"
+}
+
+SIMPLE_TOKENS = {
+    "(": "LPAREN",
+    ")": "RPAREN",
+    "[": "LBRACK",
+    "]": "RBRACK",
+    ",": "COMMA",
+    ":": "COLON",
+    ";": "SEMI",
+    "=": "EQUALS",
+    "!": "BANG",
+    "@": "AT"
+}
+
+# Predefined functions
+FUNCTIONS = ["first", "last", "rest", "trunc", "strip", "trim", "length", "strlen", "reverse"]
+
+# Options of expressions without a value
+OPTION_DEFAULTS = {"anchor": "true", "wrap": "\n"}
+
+
+def is_id_start(c):
+    return c is not None and (("a" <= c <= "z") or ("A" <= c <= "Z") or c in "_/")
+
+
+def is_id_letter(c):
+    return c is not None and (("a" <= c <= "z") or ("A" <= c <= "Z") or ("0" <= c <= "9") or c in "-_/")
+
+
+def is_ws(c):
+    return c is not None and c in " \t\n\r"
+
+
+class Token:
+    __slots__ = ("type", "text", "line", "column")
+
+    def __init__(self, type, text, line, column):
+        self.type = type
+        self.text = text
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return "{}({!r})@{}:{}".format(self.type, self.text, self.line, self.column)
+
+
+class Lexer:
+    """
+    Split a template into tokens. Outside of expressions the lexer produces
+    TEXT, INDENT (whitespace at the start of a line), NEWLINE and COMMENT
+    tokens, inside of expressions the tokens of the expression language.
+    """
+    def __init__(self, text, start="<", stop=">"):
+        self.text = text
+        self.start = start
+        self.stop = stop
+        self.pos = 0
+        self.line = 1
+        self.column = 0
+        self.depth = 0          # Nesting of subtemplates
+        self.inside = False     # Scanning inside of an expression
+        self.tokens = []
+
+    def la(self, i=1):
+        p = self.pos + i - 1
+        return self.text[p] if p < len(self.text) else None
+
+    def consume(self):
+        if self.text[self.pos] == "\n":
+            self.line += 1
+            self.column = 0
+        else:
+            self.column += 1
+        self.pos += 1
+
+    def emit(self, type, text, line, column):
+        self.tokens.append(Token(type, text, line, column))
+
+    def error(self, msg):
+        raise ValueError("{}:{}: {}".format(self.line, self.column, msg))
+
+    def tokenize(self):
+        while True:
+            if self.la() is None and not self.inside:
+                self.emit("EOF", "", self.line, self.column)
+                return self.tokens
+            if self.inside:
+                self.inside_token()
+            else:
+                self.outside_token()
+
+    def outside_token(self):
+        c = self.la()
+        line, column = self.line, self.column
+
+        if column == 0 and c in " \t":
+            begin = self.pos
+            while self.la() is not None and self.la() in " \t":
+                self.consume()
+            ws = self.text[begin:self.pos]
+            self.emit("INDENT" if self.la() is not None else "TEXT", ws, line, column)
+        elif c == self.start:
+            self.consume()
+            if self.la() == "!":
+                self.comment(line, column)
+            elif self.la() == "\\":
+                self.escape(line, column)
+            else:
+                self.inside = True
+                self.emit("LDELIM", self.start, line, column)
+        elif c == "\r":
+            self.consume()
+            if self.la() == "\n":
+                self.consume()
+            self.emit("NEWLINE", "\n", line, column)
+        elif c == "\n":
+            self.consume()
+            self.emit("NEWLINE", "\n", line, column)
+        elif c == "}" and self.depth > 0:
+            self.consume()
+            self.depth -= 1
+            self.inside = True
+            self.emit("RCURLY", "}", line, column)
+        else:
+            self.text_token(line, column)
+
+    def text_token(self, line, column):
+        buf = []
+        while True:
+            c = self.la()
+            if c is None or c == self.start or c in "\r\n":
+                break
+            if c == "}" and self.depth > 0:
+                break
+            if c == "\\":
+                n = self.la(2)
+                if n == "\\":
+                    self.consume()
+                    self.consume()
+                    buf.append("\\")
+                    continue
+                if n == self.start or n == "}":
+                    self.consume()
+                    buf.append(n)
+                    self.consume()
+                    continue
+            buf.append(c)
+            self.consume()
+        self.emit("TEXT", "".join(buf), line, column)
+
+    def comment(self, line, column):
+        self.consume()
+        while not (self.la() == "!" and self.la(2) == self.stop):
+            if self.la() is None:
+                self.error("unterminated comment")
+            self.consume()
+        self.consume()
+        self.consume()
+        self.emit("COMMENT", "", line, column)
+
+    def escape(self, line, column):
+        self.consume()
+        c = self.la()
+        if c == "\\":
+            # Line break: skip the following newline and indentation
+            self.consume()
+            if self.la() != self.stop:
+                self.error("expected end of line break escape")
+            self.consume()
+            while self.la() is not None and self.la() in " \t":
+                self.consume()
+            if self.la() == "\r":
+                self.consume()
+            if self.la() == "\n":
+                self.consume()
+            while self.la() is not None and self.la() in " \t":
+                self.consume()
+            return
+        text = {"n": "\n", "t": "\t", " ": " "}.get(c)
+        if text is None:
+            self.error("invalid escape {!r}".format(c))
+        self.consume()
+        if self.la() != self.stop:
+            self.error("expected end of escape")
+        self.consume()
+        self.emit("TEXT", text, line, column)
+
+    def inside_token(self):
+        while is_ws(self.la()):
+            self.consume()
+        c = self.la()
+        line, column = self.line, self.column
+
+        if c is None:
+            self.error("unterminated expression")
+        if c == self.stop:
+            self.consume()
+            self.inside = False
+            self.emit("RDELIM", self.stop, line, column)
+        elif c == "." and self.la(2) == "." and self.la(3) == ".":
+            for _ in range(3):
+                self.consume()
+            self.emit("ELLIPSIS", "...", line, column)
+        elif c == ".":
+            self.consume()
+            self.emit("DOT", ".", line, column)
+        elif c in SIMPLE_TOKENS:
+            self.consume()
+            self.emit(SIMPLE_TOKENS[c], c, line, column)
+        elif c in "&|":
+            self.consume()
+            if self.la() != c:
+                self.error("expected {!r}".format(c + c))
+            self.consume()
+            self.emit("AND" if c == "&" else "OR", c + c, line, column)
+        elif c == '"':
+            self.string(line, column)
+        elif c == "{":
+            self.subtemplate(line, column)
+        elif is_id_start(c):
+            name = self.identifier()
+            self.emit(KEYWORDS.get(name, "ID"), name, line, column)
+        else:
+            self.error("unexpected character {!r}".format(c))
+
+    def identifier(self):
+        begin = self.pos
+        self.consume()
+        while is_id_letter(self.la()):
+            self.consume()
+        return self.text[begin:self.pos]
+
+    def string(self, line, column):
+        self.consume()
+        buf = []
+        while self.la() != '"':
+            c = self.la()
+            if c is None:
+                self.error("unterminated string")
+            if c == "\\":
+                self.consume()
+                c = self.la()
+                buf.append({"n": "\n", "r": "\r", "t": "\t"}.get(c, c))
+                self.consume()
+                continue
+            buf.append(c)
+            self.consume()
+        self.consume()
+        self.emit("STRING", "".join(buf), line, column)
+
+    def subtemplate(self, line, column):
+        """
+        Look for the formal arguments "{ a, b | ..." of a subtemplate, otherwise
+        the subtemplate's text starts right after the curly brace.
+        """
+        self.depth += 1
+        self.consume()
+        mark = (self.pos, self.line, self.column)
+
+        args = []
+        while is_ws(self.la()):
+            self.consume()
+        if self.la() is not None:
+            args.append(Token("ID", self.identifier(), self.line, self.column))
+            while is_ws(self.la()):
+                self.consume()
+            while self.la() == "," and self.la(2) is not None:
+                args.append(Token("COMMA", ",", self.line, self.column))
+                self.consume()
+                while is_ws(self.la()):
+                    self.consume()
+                args.append(Token("ID", self.identifier(), self.line, self.column))
+                while is_ws(self.la()):
+                    self.consume()
+
+        self.emit("LCURLY", "{", line, column)
+        if self.la() == "|":
+            args.append(Token("PIPE", "|", self.line, self.column))
+            self.consume()
+            # A single whitespace after the pipe is ignored
+            if is_ws(self.la()):
+                self.consume()
+            self.tokens.extend(args)
+        else:
+            self.pos, self.line, self.column = mark
+        self.inside = False
+
+
+class Template:
+    """
+    A compiled template: the names of its formal arguments, their default
+    values and the instructions.
+    """
+    def __init__(self, name, args, defaults, code, group, anonymous=False):
+        self.name = name
+        self.args = args
+        self.defaults = defaults
+        self.code = code
+        self.group = group
+        self.anonymous = anonymous
+
+    def __repr__(self):
+        return "Template({}({}))".format(self.name, ", ".join(self.args))
+
+
+# Elements of a parsed template
+class Text:
+    def __init__(self, text):
+        self.text = text
+
+
+class Newline:
+    pass
+
+
+class Expression:
+    def __init__(self, expr, options):
+        self.expr = expr
+        self.options = options
+
+
+class Indented:
+    def __init__(self, indent, element):
+        self.indent = indent
+        self.element = element
+
+
+class If:
+    def __init__(self, indent, branches, otherwise):
+        self.indent = indent
+        self.branches = branches
+        self.otherwise = otherwise
+
+
+class Parser:
+    """
+    Recursive-descent parser for a template that follows StringTemplate's
+    grammar. Expressions are represented as nested tuples whose first element
+    is the kind of expression (see Interpreter.evaluate).
+    """
+    def __init__(self, tokens, name, group):
+        self.tokens = tokens
+        self.pos = 0
+        self.name = name
+        self.group = group
+        self.conditional = 0
+        self.subtemplates = 0
+
+    def lt(self, i=1):
+        return self.tokens[min(self.pos + i - 1, len(self.tokens) - 1)]
+
+    def la(self, i=1):
+        return self.lt(i).type
+
+    def consume(self):
+        t = self.tokens[self.pos]
+        self.pos += 1
+        return t
+
+    def match(self, type):
+        t = self.lt()
+        if t.type != type:
+            raise ValueError("{}:{}:{}: expected {} but found {!r}".format(
+                self.name, t.line, t.column, type, t.text))
+        return self.consume()
+
+    def starts_clause(self, i=1):
+        """
+        Whether an "else", "elseif" or "endif" tag starts at the given token
+        """
+        if self.la(i) == "INDENT":
+            i += 1
+        return self.la(i) == "LDELIM" and self.la(i + 1) in ("ELSE", "ELSEIF", "ENDIF")
+
+    def template(self):
+        elements = self.elements()
+        self.match("EOF")
+        return elements
+
+    def elements(self):
+        res = []
+        while True:
+            t = self.lt()
+            if t.type in ("EOF", "RCURLY") or self.starts_clause():
+                return res
+
+            # A comment on a line by itself is removed together with the line
+            i = 2 if t.type == "INDENT" else 1
+            if t.column == 0 and self.la(i) == "COMMENT" and self.la(i + 1) == "NEWLINE":
+                self.pos += i + 1
+                continue
+
+            if (t.type == "INDENT" and self.la(2) == "LDELIM" and self.la(3) == "IF") \
+                    or (t.type == "LDELIM" and self.la(2) == "IF"):
+                res.append(self.ifstat())
+            elif t.type == "INDENT":
+                self.consume()
+                res.append(Indented(t.text, self.single_element()))
+            else:
+                element = self.single_element()
+                if element is not None:
+                    res.append(element)
+
+    def single_element(self):
+        t = self.consume()
+        if t.type == "TEXT":
+            return Text(t.text)
+        if t.type == "NEWLINE":
+            return Newline()
+        if t.type == "COMMENT":
+            return None
+        if t.type == "LDELIM":
+            expr = self.expr()
+            options = {}
+            if self.la() == "SEMI":
+                self.consume()
+                options = self.options()
+            self.match("RDELIM")
+            return Expression(expr, options)
+        raise ValueError("{}:{}:{}: unexpected {!r}".format(self.name, t.line, t.column, t.text))
+
+    def options(self):
+        res = {}
+        while True:
+            name = self.match("ID").text
+            if self.la() == "EQUALS":
+                self.consume()
+                res[name] = self.expr_no_comma()
+            else:
+                res[name] = ("str", OPTION_DEFAULTS.get(name, "true"))
+            if self.la() != "COMMA":
+                return res
+            self.consume()
+
+    def ifstat(self):
+        start = self.lt()
+        i = self.consume() if self.la() == "INDENT" else None
+        self.match("LDELIM")
+        self.match("IF")
+        self.match("LPAREN")
+        cond = self.condition()
+        self.match("RPAREN")
+        self.match("RDELIM")
+        # An indented IF that is not followed by a newline is indented as a
+        # whole, otherwise the indentation is discarded
+        indent = i.text if i is not None and self.la() != "NEWLINE" else None
+
+        branches = [(cond, self.elements())]
+        otherwise = None
+        while self.starts_clause():
+            if self.la() == "INDENT":
+                self.consume()
+            self.match("LDELIM")
+            t = self.consume()
+            if t.type == "ELSEIF":
+                self.match("LPAREN")
+                cond = self.condition()
+                self.match("RPAREN")
+                self.match("RDELIM")
+                branches.append((cond, self.elements()))
+            elif t.type == "ELSE":
+                self.match("RDELIM")
+                otherwise = self.elements()
+            else:
+                self.match("RDELIM")
+                break
+        else:
+            raise ValueError("{}:{}:{}: missing endif".format(self.name, start.line, start.column))
+
+        # Remove the newline after an endif on a line by itself if the IF
+        # spans multiple lines
+        if self.la() == "NEWLINE" and self.lt().line != start.line:
+            self.consume()
+
+        return If(indent, branches, otherwise)
+
+    def condition(self):
+        self.conditional += 1
+        res = self.and_condition()
+        while self.la() == "OR":
+            self.consume()
+            res = ("or", res, self.and_condition())
+        self.conditional -= 1
+        return res
+
+    def and_condition(self):
+        res = self.not_condition()
+        while self.la() == "AND":
+            self.consume()
+            res = ("and", res, self.not_condition())
+        return res
+
+    def not_condition(self):
+        if self.la() == "BANG":
+            self.consume()
+            return ("not", self.not_condition())
+        return self.member_expr()
+
+    def expr(self):
+        e = self.member_expr()
+        zipped = False
+        if self.la() == "COMMA":
+            exprs = [e]
+            while self.la() == "COMMA":
+                self.consume()
+                exprs.append(self.member_expr())
+            self.match("COLON")
+            e = ("zip", exprs, self.template_ref())
+            zipped = True
+        while self.la() == "COLON":
+            self.consume()
+            refs = [self.template_ref()]
+            while not zipped and self.la() == "COMMA":
+                self.consume()
+                refs.append(self.template_ref())
+            e = ("map", e, refs)
+        return e
+
+    def expr_no_comma(self):
+        e = self.member_expr()
+        if self.la() == "COLON":
+            self.consume()
+            e = ("map", e, [self.template_ref()])
+        return e
+
+    def template_ref(self):
+        if self.la() == "ID" and self.la(2) == "LPAREN":
+            name = self.consume().text
+            self.consume()
+            args = self.args()
+            self.match("RPAREN")
+            return ("ref", name, args)
+        if self.la() == "LCURLY":
+            return ("sub", self.subtemplate())
+        if self.la() == "LPAREN":
+            self.consume()
+            e = self.expr()
+            self.match("RPAREN")
+            self.match("LPAREN")
+            args = self.arg_list() if self.la() != "RPAREN" else []
+            self.match("RPAREN")
+            return ("ind", e, args)
+        t = self.lt()
+        raise ValueError("{}:{}:{}: expected template reference".format(self.name, t.line, t.column))
+
+    def member_expr(self):
+        e = self.include_expr()
+        while self.la() == "DOT":
+            self.consume()
+            if self.la() == "LPAREN":
+                self.consume()
+                e = ("prop-ind", e, self.expr())
+                self.match("RPAREN")
+            else:
+                e = ("prop", e, self.match("ID").text)
+        return e
+
+    def include_expr(self):
+        if self.la() == "ID" and self.la(2) == "LPAREN":
+            name = self.consume().text
+            self.consume()
+            if name in FUNCTIONS:
+                arg = self.expr() if self.la() != "RPAREN" else None
+                self.match("RPAREN")
+                return ("func", name, arg)
+            args = self.args()
+            self.match("RPAREN")
+            return ("include", name, args)
+        if self.la() in ("SUPER", "AT"):
+            t = self.lt()
+            raise ValueError("{}:{}:{}: regions and super are not supported".format(
+                self.name, t.line, t.column))
+        return self.primary()
+
+    def primary(self):
+        t = self.lt()
+        if t.type == "ID":
+            self.consume()
+            return ("attr", t.text)
+        if t.type == "STRING":
+            self.consume()
+            return ("str", t.text)
+        if t.type in ("TRUE", "FALSE"):
+            self.consume()
+            return ("bool", t.type == "TRUE")
+        if t.type == "LCURLY":
+            return ("sub", self.subtemplate())
+        if t.type == "LBRACK":
+            self.consume()
+            elements = []
+            while self.la() != "RBRACK":
+                elements.append(self.expr_no_comma() if self.la() != "COMMA" else ("null",))
+                if self.la() == "COMMA":
+                    self.consume()
+            self.consume()
+            return ("list", elements)
+        if t.type == "LPAREN":
+            self.consume()
+            if self.conditional > 0:
+                e = self.condition()
+                self.match("RPAREN")
+                return e
+            e = self.expr()
+            self.match("RPAREN")
+            if self.la() == "LPAREN":
+                self.consume()
+                args = self.arg_list() if self.la() != "RPAREN" else []
+                self.match("RPAREN")
+                return ("include-ind", e, args)
+            return ("tostr", e)
+        raise ValueError("{}:{}:{}: unexpected {!r}".format(self.name, t.line, t.column, t.text))
+
+    def args(self):
+        """
+        Positional arguments as a list, named arguments as a dictionary
+        """
+        if self.la() == "RPAREN":
+            return []
+        if self.la() == "ID" and self.la(2) == "EQUALS":
+            res = {}
+            while True:
+                if self.la() == "ELLIPSIS":
+                    self.consume()
+                    res["..."] = True
+                    return res
+                name = self.match("ID").text
+                self.match("EQUALS")
+                res[name] = self.expr_no_comma()
+                if self.la() != "COMMA":
+                    return res
+                self.consume()
+        if self.la() == "ELLIPSIS":
+            self.consume()
+            return {"...": True}
+        return self.arg_list()
+
+    def arg_list(self):
+        res = [self.expr_no_comma()]
+        while self.la() == "COMMA":
+            self.consume()
+            res.append(self.expr_no_comma())
+        return res
+
+    def subtemplate(self):
+        self.match("LCURLY")
+        args = []
+        if self.la() == "ID" and self.la(2) in ("COMMA", "PIPE"):
+            args.append(self.consume().text)
+            while self.la() == "COMMA":
+                self.consume()
+                args.append(self.match("ID").text)
+            self.match("PIPE")
+        elements = self.elements()
+        self.match("RCURLY")
+
+        self.subtemplates += 1
+        name = "_sub{}_{}".format(self.subtemplates, self.name)
+        # The index of the iteration is implicitly available in subtemplates
+        return Template(name, args + ["i", "i0"], {}, compile_elements(elements), self.group, True)
+
+
+def compile_elements(elements, code=None):
+    """
+    Translate the parsed elements to instructions:
+    - ("text", text): write the text
+    - ("write", expr, options): evaluate the expression and write the result
+    - ("newline",): write a newline (see Interpreter.execute)
+    - ("indent", indent) and ("dedent",): push or pop the indentation
+    - ("brf", condition, target): jump to the target if the condition is false
+    - ("br", target): jump to the target
+    """
+    if code is None:
+        code = []
+
+    for el in elements:
+        if isinstance(el, Text):
+            if el.text:
+                code.append(("text", el.text))
+        elif isinstance(el, Newline):
+            code.append(("newline",))
+        elif isinstance(el, Expression):
+            code.append(("write", el.expr, el.options))
+        elif isinstance(el, Indented):
+            code.append(("indent", el.indent))
+            if el.element is not None:
+                compile_elements([el.element], code)
+            code.append(("dedent",))
+        elif isinstance(el, If):
+            if el.indent is not None:
+                code.append(("indent", el.indent))
+
+            ends = []
+            prev = None
+            for cond, body in el.branches:
+                if prev is not None:
+                    ends.append(len(code))
+                    code.append(["br", None])
+                    code[prev][2] = len(code)
+                prev = len(code)
+                code.append(["brf", cond, None])
+                compile_elements(body, code)
+            if el.otherwise is not None:
+                ends.append(len(code))
+                code.append(["br", None])
+                code[prev][2] = len(code)
+                prev = None
+                compile_elements(el.otherwise, code)
+            if prev is not None:
+                code[prev][2] = len(code)
+            for e in ends:
+                code[e][1] = len(code)
+
+            if el.indent is not None:
+                code.append(("dedent",))
+
+    return code
+
+
+def compile_template(name, args, defaults, text, group, start="<", stop=">"):
+    tokens = Lexer(text, start, stop).tokenize()
+    elements = Parser(tokens, name, group).template()
+    return Template(name, args, defaults, compile_elements(elements), group)
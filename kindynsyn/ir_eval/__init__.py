@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.utility.lazy import lazy_package
+
+__all__ = ["operators", "evaluator", "compiler"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "operators": [
+        "rotation", "position", "screws", "rotate", "rotate_transpose", "cross", "AXES",
+        "axis_index", "compose_pose", "add_screw", "transform_velocity_twist_to_distal",
+        "rotate_velocity_twist_to_proximal_with_pose", "transform_acceleration_twist_to_distal",
+        "assign_wrench", "invert_wrench", "transform_wrench_to_proximal",
+        "rotate_wrench_to_distal_with_pose", "rigid_body_inertia",
+        "acceleration_twist_to_wrench_with_rigid_body_inertia", "inertial_wrench",
+        "accumulate_wrench", "joint_position_to_pose", "joint_velocity_to_velocity_twist",
+        "joint_acceleration_to_acceleration_twist", "joint_force_from_wrench", "operator_list"
+    ],
+    "evaluator": ["IREvaluator"],
+    "compiler": [
+        "KernelBuilder", "emit_compose_pose", "emit_add_screw",
+        "emit_transform_velocity_twist_to_distal",
+        "emit_rotate_velocity_twist_to_proximal_with_pose",
+        "emit_transform_acceleration_twist_to_distal", "emit_assign_wrench", "emit_invert_wrench",
+        "emit_transform_wrench_to_proximal", "emit_rotate_wrench_to_distal_with_pose",
+        "emit_acceleration_twist_to_wrench_with_rigid_body_inertia", "emit_inertial_wrench",
+        "emit_accumulate_wrench", "emit_joint_position_to_pose", "emit_joint_to_twist",
+        "emit_joint_velocity_to_velocity_twist", "emit_joint_acceleration_to_acceleration_twist",
+        "emit_joint_force_from_wrench", "emitter_list", "Kernel", "KernelCompiler"
+    ]
+})
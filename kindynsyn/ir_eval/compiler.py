@@ -0,0 +1,475 @@
+# SPDX-License-Identifier: MPL-2.0
+import numpy as np
+from kindynsyn.ir_gen.layout import SCREW_SIZE, variable_size, variable_init, \
+    loop_closures
+from kindynsyn.ir_eval.operators import axis_index
+
+
+class KernelBuilder:
+    """
+    Accumulates the source code of a kernel. The buffer stores one row per
+    value of the variables, i.e. it is of shape (size, batch), so that every
+    block of consecutive values is a contiguous view. All views into the buffer
+    and all scratch arrays are created once in the "setup" part, the "body"
+    only consists of NumPy calls that write to their "out" arguments.
+
+    NumPy only evaluates a ufunc without allocating (e.g. an iterator) if all
+    operands are contiguous and of the same shape. Hence, the views are named
+    together with their shape (without the batch dimension) and other operands
+    (e.g. strided or broadcast views) are first copied into scratch arrays,
+    which never allocates. Vectors are views of shape (n, 3). Scratch arrays
+    are only valid during the emission of a single operator and are reused by
+    subsequent operators.
+    """
+    def __init__(self, offsets, sizes):
+        self.offsets = offsets
+        self.sizes = sizes
+        self.setup = []
+        self.body = []
+        self.views = {}
+        self.shapes = {}
+        self.contiguous = set()
+        self.scratch = {}
+        self.in_use = {}
+
+    def begin(self):
+        self.in_use = {}
+
+    def name(self, expr, shape, contiguous=False):
+        if expr not in self.views:
+            self.views[expr] = "v{}".format(len(self.views))
+            self.shapes[self.views[expr]] = shape
+            if contiguous:
+                self.contiguous.add(self.views[expr])
+            self.setup.append("{} = {}".format(self.views[expr], expr))
+        return self.views[expr]
+
+    def temp(self, *shape):
+        i = self.in_use.get(shape, 0)
+        self.in_use[shape] = i + 1
+        pool = self.scratch.setdefault(shape, [])
+        if i == len(pool):
+            pool.append("t{}".format(sum(map(len, self.scratch.values()))))
+            self.shapes[pool[i]] = shape
+            self.contiguous.add(pool[i])
+            self.setup.append("{} = np.empty(({}, B))".format(
+                pool[i], ", ".join(map(str, shape))))
+        return pool[i]
+
+    def emit(self, line):
+        self.body.append(line)
+
+    def slice(self, var, start, stop):
+        o = self.offsets[var]
+        return "buf[{}:{}]".format(o + start, o + stop)
+
+    def var(self, var, start=0, stop=None):
+        stop = self.sizes[var] if stop is None else stop
+        return self.name(self.slice(var, start, stop), (stop - start,), True)
+
+    def vectors(self, var, start, n):
+        """
+        "n" consecutive vectors starting at index "start"
+        """
+        return self.name(self.slice(var, start, start + 3 * n) + ".reshape({}, 3, B)".format(n),
+                         (n, 3), True)
+
+    def select(self, view, start, stop):
+        """
+        Vectors "start" to "stop" of a view
+        """
+        return self.name("{}[{}:{}]".format(view, start, stop), (stop - start, 3),
+                         view in self.contiguous)
+
+    def components(self, view, start, stop):
+        n, size = self.shapes[view]
+        return self.name("{}[:, {}:{}]".format(view, start, stop), (n, stop - start),
+                         view in self.contiguous and (n == 1 or stop - start == size))
+
+    # Pose: the rotation is stored column-major. Matrices are views of shape
+    # (3, 1, 3) that stack their columns (see "rotate"). The rotation matrix
+    # rotates to the proximal frame and its transpose to the distal frame.
+    def rot(self, var):
+        return self.name(self.slice(var, 0, 9) + ".reshape(3, 1, 3, B)", (3, 1, 3), True)
+
+    def rot_t(self, var):
+        return self.name(self.slice(var, 0, 9) + ".reshape(3, 3, B).transpose(1, 0, 2)[:, None]",
+                         (3, 1, 3))
+
+    def pos(self, var):
+        return self.vectors(var, 9, 1)
+
+    # Screws: the "n" screws starting at index "i" as 2n vectors and their
+    # first and second vectors
+    def screws(self, var, n=1, i=0):
+        return self.vectors(var, SCREW_SIZE * i, 2 * n)
+
+    def screw_parts(self, view):
+        n = self.shapes[view][0] // 2
+        return [self.name("{}.reshape({}, 2, 3, B)[:, {}]".format(view, n, part), (n, 3),
+                          n == 1 and view in self.contiguous)
+                for part in [0, 1]]
+
+    def screw(self, var, part, n=1, i=0):
+        return self.screw_parts(self.screws(var, n, i))[part]
+
+    # Rigid-body inertia: the columns of the rotational inertia, the first
+    # moment of mass and the mass
+    def rbi(self, var):
+        return (self.rot(var), self.vectors(var, 9, 1),
+                self.name(self.slice(var, 12, 13) + ".reshape(1, 1, B)", (1, 1), True))
+
+    def copy(self, out, src):
+        self.emit("np.copyto({}, {})".format(out, src))
+
+    def operand(self, view, shape):
+        """
+        Return the view or a contiguous copy of the given shape
+        """
+        if view in self.contiguous and self.shapes[view] == shape:
+            return view
+        t = self.temp(*shape)
+        self.copy(t, view)
+        return t
+
+    def call(self, function, out, *operands):
+        """
+        Emit the NumPy function with all operands converted to the shape of
+        "out". A non-contiguous "out" receives a copy of the result.
+        """
+        shape = self.shapes[out]
+        operands = [self.operand(o, shape) for o in operands]
+        res = out if out in self.contiguous else self.temp(*shape)
+        self.emit("np.{}({}, out={})".format(function, ", ".join(operands), res))
+        if res != out:
+            self.copy(out, res)
+
+    def rotate(self, m, x, out):
+        """
+        Multiply the vectors with the matrix. The matrix' columns and the
+        vectors' components are repeated to the shape (3, n, 3) so that the
+        products are the sums of their element-wise products.
+        """
+        n = self.shapes[x][0]
+        m = self.operand(m, (3, n, 3))
+        t = self.temp(3, n, 3)
+        self.copy(t, self.name("{}.transpose(1, 0, 2)[:, :, None]".format(x), (3, n, 1)))
+        self.emit("np.multiply({0}, {1}, out={1})".format(m, t))
+
+        res = out if out in self.contiguous else self.temp(n, 3)
+        t0, t1, t2 = [self.name("{}[{}]".format(t, k), (n, 3), True) for k in range(3)]
+        self.emit("np.add({}, {}, out={})".format(t0, t1, res))
+        self.emit("np.add({0}, {1}, out={0})".format(res, t2))
+        if res != out:
+            self.copy(out, res)
+
+    def cross(self, a, b, out):
+        """
+        Cross product of the vectors. The components (x1, x2, x0) and
+        (x2, x0, x1) of a vector x are views of the vector repeated twice.
+        """
+        n = max(self.shapes[a][0], self.shapes[b][0])
+        ta, tb = self.temp(n, 6), self.temp(n, 6)
+        for t, x in [(ta, a), (tb, b)]:
+            self.copy(self.name("{}.reshape({}, 2, 3, B)".format(t, n), (n, 2, 3), True),
+                      self.name("{}[:, None]".format(x), (self.shapes[x][0], 1, 3)))
+
+        res = out if out in self.contiguous else self.temp(n, 3)
+        t = self.temp(n, 3)
+        self.call("multiply", res, self.components(ta, 1, 4), self.components(tb, 2, 5))
+        self.call("multiply", t, self.components(ta, 2, 5), self.components(tb, 1, 4))
+        self.call("subtract", res, res, t)
+        if res != out:
+            self.copy(out, res)
+
+
+#
+# Kinematics
+#
+
+def emit_compose_pose(b, args):
+    # The columns of the second rotation and the second position are rotated
+    # at once
+    b.rotate(b.rot(args["in1"]), b.vectors(args["in2"], 0, 4), b.vectors(args["out"], 0, 4))
+    b.call("add", b.pos(args["out"]), b.pos(args["out"]), b.pos(args["in1"]))
+
+def emit_add_screw(b, args):
+    b.call("add", b.var(args["out"]), b.var(args["in1"]), b.var(args["in2"]))
+
+def emit_transform_velocity_twist_to_distal(b, args):
+    n = args["number-of-velocities"]
+    ang, lin = b.screw(args["from"], 0, n), b.screw(args["from"], 1, n)
+    # The twists with respect to the distal origin, then rotated at once
+    s = b.temp(2 * n, 3)
+    s_ang, s_lin = b.screw_parts(s)
+    b.copy(s_ang, ang)
+    b.cross(b.pos(args["pose"]), ang, s_lin)
+    b.call("subtract", s_lin, lin, s_lin)
+    b.rotate(b.rot_t(args["pose"]), s, b.screws(args["to"], n))
+
+def emit_rotate_velocity_twist_to_proximal_with_pose(b, args):
+    n = args["number-of-velocities"]
+    b.rotate(b.rot(args["pose"]), b.screws(args["from"], n), b.screws(args["to"], n))
+
+def emit_transform_acceleration_twist_to_distal(b, args):
+    p = b.pos(args["pose"])
+
+    # The acceleration and the absolute velocity with respect to the distal
+    # origin, then rotated at once
+    s = b.temp(4, 3)
+    for i, var in enumerate([args["from"], args["absolute-velocity"]]):
+        ang, lin = b.screw(var, 0), b.screw(var, 1)
+        s_ang, s_lin = b.screw_parts(b.select(s, 2 * i, 2 * i + 2))
+        b.copy(s_ang, ang)
+        b.cross(p, ang, s_lin)
+        b.call("subtract", s_lin, lin, s_lin)
+    r = b.temp(4, 3)
+    b.rotate(b.rot_t(args["pose"]), s, r)
+
+    acc_ang, acc_lin, vel_ang, vel_lin = [b.select(r, i, i + 1) for i in range(4)]
+    rel_ang, rel_lin = b.screw(args["relative-velocity"], 0), b.screw(args["relative-velocity"], 1)
+    to_ang, to_lin = b.screw(args["to"], 0), b.screw(args["to"], 1)
+
+    t = b.temp(1, 3)
+    b.cross(vel_ang, rel_ang, t)
+    b.call("add", to_ang, acc_ang, t)
+    b.cross(vel_ang, rel_lin, t)
+    b.call("add", to_lin, acc_lin, t)
+    b.cross(vel_lin, rel_ang, t)
+    b.call("add", to_lin, to_lin, t)
+
+
+
+#
+# Mechanics
+#
+
+def emit_assign_wrench(b, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    b.copy(b.var(args["to"], 0, n), b.var(args["from"], 0, n))
+
+def emit_invert_wrench(b, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    b.call("negative", b.var(args["inverse"], 0, n), b.var(args["original"], 0, n))
+
+def emit_transform_wrench_to_proximal(b, args):
+    n, i = args["number-of-wrenches"], args["at-index"]
+    to = b.screws(args["to"], n, i)
+    b.rotate(b.rot(args["pose"]), b.screws(args["from"], n), to)
+    f, t = b.screw_parts(to)
+    c = b.temp(n, 3)
+    b.cross(b.pos(args["pose"]), f, c)
+    b.call("add", t, t, c)
+
+def emit_rotate_wrench_to_distal_with_pose(b, args):
+    n, i = args["number-of-wrenches"], args["at-index"]
+    b.rotate(b.rot_t(args["pose"]), b.screws(args["from"], n), b.screws(args["to"], n, i))
+
+def emit_acceleration_twist_to_wrench_with_rigid_body_inertia(b, args):
+    i, h, m = b.rbi(args["rigid-body-inertia"])
+    ang, lin = b.screw(args["acceleration-twist"], 0), b.screw(args["acceleration-twist"], 1)
+    f, t = b.screw(args["wrench"], 0), b.screw(args["wrench"], 1)
+    c = b.temp(1, 3)
+    b.cross(h, ang, c)
+    b.call("multiply", f, m, lin)
+    b.call("subtract", f, f, c)
+    b.cross(h, lin, c)
+    b.rotate(i, ang, t)
+    b.call("add", t, t, c)
+
+def emit_inertial_wrench(b, args):
+    i, h, m = b.rbi(args["rigid-body-inertia"])
+    ang, lin = b.screw(args["velocity-twist"], 0), b.screw(args["velocity-twist"], 1)
+    f, t = b.screw(args["wrench"], 0), b.screw(args["wrench"], 1)
+    lin_mom, ang_mom, c = b.temp(1, 3), b.temp(1, 3), b.temp(1, 3)
+    # Momentum
+    b.cross(h, ang, c)
+    b.call("multiply", lin_mom, m, lin)
+    b.call("subtract", lin_mom, lin_mom, c)
+    b.cross(h, lin, c)
+    b.rotate(i, ang, ang_mom)
+    b.call("add", ang_mom, ang_mom, c)
+    # Force cross product of the velocity with the momentum
+    b.cross(ang, lin_mom, f)
+    b.cross(ang, ang_mom, t)
+    b.cross(lin, lin_mom, c)
+    b.call("add", t, t, c)
+
+def emit_accumulate_wrench(b, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    agg = b.var(args["aggregate"], 0, n)
+    b.call("add", agg, agg, b.var(args["element"], 0, n))
+
+
+
+#
+# Kinematic chain
+#
+
+def emit_joint_position_to_pose(b, args):
+    a = axis_index(args["joint"])
+    u, w = (a + 1) % 3, (a + 2) % 3
+    q = b.var(args["joint-position"], 0, 1)
+    pose = args["pose"]
+
+    def element(r, c):
+        return b.var(pose, 3 * c + r, 3 * c + r + 1)
+
+    # Column-major rotation about the joint axis
+    b.emit("{}.fill(0.0)".format(b.var(pose)))
+    b.emit("{}.fill(1.0)".format(element(a, a)))
+    b.call("cos", element(u, u), q)
+    b.copy(element(w, w), element(u, u))
+    b.call("sin", element(w, u), q)
+    b.call("negative", element(u, w), element(w, u))
+
+def emit_joint_to_twist(b, joint, joint_value, twist):
+    a = axis_index(joint)
+    b.emit("{}.fill(0.0)".format(b.var(twist)))
+    b.copy(b.var(twist, a, a + 1), b.var(joint_value, 0, 1))
+
+def emit_joint_velocity_to_velocity_twist(b, args):
+    emit_joint_to_twist(b, args["joint"], args["joint-velocity"], args["velocity-twist"])
+
+def emit_joint_acceleration_to_acceleration_twist(b, args):
+    emit_joint_to_twist(b, args["joint"], args["joint-acceleration"], args["acceleration-twist"])
+
+def emit_joint_force_from_wrench(b, args):
+    n = args["number-of-wrenches"]
+    a = axis_index(args["joint"])
+    b.copy(b.var(args["joint-force"], 0, n),
+           b.name(b.slice(args["wrench"], 0, SCREW_SIZE * n) + ".reshape({}, 6, B)[:, {}]".format(n, 3 + a), (n,)))
+
+
+
+emitter_list = {
+    "compose-pose": emit_compose_pose,
+    "add-velocity-twist": emit_add_screw,
+    "add-acceleration-twist": emit_add_screw,
+    "transform-velocity-twist-to-distal": emit_transform_velocity_twist_to_distal,
+    "rotate-velocity-twist-to-proximal-with-pose": emit_rotate_velocity_twist_to_proximal_with_pose,
+    "transform-acceleration-twist-to-distal": emit_transform_acceleration_twist_to_distal,
+    "assign-wrench": emit_assign_wrench,
+    "invert-wrench": emit_invert_wrench,
+    "transform-wrench-to-proximal": emit_transform_wrench_to_proximal,
+    "rotate-wrench-to-distal-with-pose": emit_rotate_wrench_to_distal_with_pose,
+    "acceleration-twist-to-wrench-with-rigid-body-inertia": emit_acceleration_twist_to_wrench_with_rigid_body_inertia,
+    "inertial-wrench": emit_inertial_wrench,
+    "accumulate-wrench": emit_accumulate_wrench,
+    "joint-position-to-pose": emit_joint_position_to_pose,
+    "joint-velocity-to-velocity-twist": emit_joint_velocity_to_velocity_twist,
+    "joint-acceleration-to-acceleration-twist": emit_joint_acceleration_to_acceleration_twist,
+    "joint-force-from-wrench": emit_joint_force_from_wrench
+}
+
+
+
+class Kernel:
+    """
+    A compiled schedule. All variables are stored in one contiguous buffer of
+    shape (size, batch) and accessed through views of shape (batch, size).
+    Inputs are written to and outputs read from these views, e.g.
+    "kernel[name][:] = value". Calling the kernel evaluates the schedule in
+    place.
+    """
+    def __init__(self, source, buffer, offsets, sizes, function):
+        self.source = source
+        self.buffer = buffer
+        self.offsets = offsets
+        self.sizes = sizes
+        self.function = function
+
+    def __getitem__(self, name):
+        o = self.offsets[name]
+        return self.buffer[o:o + self.sizes[name]].T
+
+    def __call__(self):
+        self.function()
+
+
+class KernelCompiler:
+    """
+    Lower the IR's schedule to the source code of a single Python function that
+    consists of a fixed sequence of NumPy calls. Additional operators can be
+    provided as a dictionary that maps the operator name to a function
+    "f(builder, args)" that emits the code via the KernelBuilder.
+    """
+    def __init__(self, ir, emitters=None):
+        self.ir = ir
+        self.emitters = emitter_list | (emitters or {})
+
+    def layout(self):
+        """
+        Variables that have been assigned to an arena (see
+        kindynsyn.optimizer.BufferAllocation) share the arena's block.
+        Variables that alias an interface's buffer (see
+        kindynsyn.optimizer.InterfaceAliasing) are laid out as in that buffer.
+        """
+        offsets, sizes = {}, {}
+        offset = 0
+        arena, buffers = {}, {}
+        for name, var in self.ir["variables"].items():
+            sizes[name] = variable_size(var)
+            dt = self.ir["data-types"].get(name, {})
+            if dt.get("data-type") == "arena":
+                arena[name] = dt["offset"]
+                continue
+            if dt.get("data-type") == "alias":
+                buffers.setdefault(dt["buffer"], {})[name] = dt["offset"]
+                continue
+            offsets[name] = offset
+            offset += sizes[name]
+
+        for name, o in arena.items():
+            offsets[name] = offset + o
+        if arena:
+            offset += self.ir["arena"]["size"]
+
+        for buffer in buffers.values():
+            for name, o in buffer.items():
+                offsets[name] = offset + o
+            offset += max(o + sizes[name] for name, o in buffer.items())
+
+        return offsets, sizes, offset
+
+    def generate(self):
+        offsets, sizes, _ = self.layout()
+
+        b = KernelBuilder(offsets, sizes)
+        for c in self.ir["schedule"]:
+            args = self.ir["closures"][c]
+            # Loops are unrolled as the kernel is a fixed sequence of calls
+            if args["operator"] == "loop":
+                closures = list(loop_closures(args))
+            else:
+                closures = [args]
+            for a in closures:
+                b.begin()
+                b.emit("# " + c + ": " + a["operator"])
+                self.emitters[a["operator"]](b, a)
+
+        src = ["def make_kernel(np, buf, B):"]
+        src.extend("    " + l for l in b.setup)
+        src.append("")
+        src.append("    def kernel():")
+        src.extend("        " + l for l in b.body)
+        src.append("        pass")
+        src.append("")
+        src.append("    return kernel")
+        return "\n".join(src) + "\n"
+
+    def compile(self, batch_size=1):
+        offsets, sizes, size = self.layout()
+
+        buffer = np.zeros((size, batch_size))
+        for name, var in self.ir["variables"].items():
+            init = variable_init(var)
+            if init is not None:
+                buffer[offsets[name]:offsets[name] + sizes[name]] = np.reshape(init, (-1, 1))
+
+        source = self.generate()
+        namespace = {}
+        exec(compile(source, "<kernel>", "exec"), namespace)
+        function = namespace["make_kernel"](np, buffer, batch_size)
+
+        return Kernel(source, buffer, offsets, sizes, function)
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MPL-2.0
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from kindynsyn.ir_gen.layout import variable_size, variable_init, loop_closures
+from kindynsyn.ir_eval.operators import operator_list
+
+
+class IREvaluator:
+    """
+    Reference interpreter for the intermediate representation. All variables
+    are stored with a leading batch dimension so that the schedule is evaluated
+    for a whole batch of joint states at once.
+
+    Additional operators (e.g. from application-specific translators) can be
+    provided as a dictionary that maps the operator name to a function
+    "f(mem, args)" where "mem" maps variable names to arrays and "args" is the
+    closure from the IR.
+    """
+    def __init__(self, ir, operators=None):
+        self.ir = ir
+        self.operators = operator_list | (operators or {})
+        self.sizes = {name: variable_size(var) for name, var in ir["variables"].items()}
+        self.inits = {name: variable_init(var) for name, var in ir["variables"].items()}
+
+    def closures(self, schedule):
+        """
+        Return the closures of a schedule with loops (see
+        kindynsyn.optimizer.LoopRolling) expanded.
+        """
+        for c in schedule:
+            args = self.ir["closures"][c]
+            if args["operator"] == "loop":
+                yield from loop_closures(args)
+            else:
+                yield args
+
+    def variables(self, quantity):
+        """
+        Return the names of all variables of the given quantity in the order of
+        their first use in the schedule.
+        """
+        res = []
+        for args in self.closures(self.ir["schedule"]):
+            for arg in args.values():
+                for a in (arg if isinstance(arg, list) else [arg]):
+                    var = self.ir["variables"].get(a) if isinstance(a, str) else None
+                    if var and var["quantity"] == quantity and a not in res:
+                        res.append(a)
+        return res
+
+    def allocate(self, batch_size):
+        mem = {}
+        for name, size in self.sizes.items():
+            mem[name] = np.zeros((batch_size, size))
+            if self.inits[name] is not None:
+                mem[name][:] = self.inits[name]
+        return mem
+
+    def evaluate(self, inputs, workers=None):
+        """
+        Evaluate the schedule. The "inputs" map variable names to arrays of
+        shape (batch,) or (batch, size). All variables are returned in the same
+        format with shape (batch, size). If a number of "workers" is given, the
+        independent closures are executed on a thread pool.
+        """
+        inputs = {name: np.asarray(val, dtype=float) for name, val in inputs.items()}
+        batch_size = max([len(v) for v in inputs.values()], default=1)
+
+        mem = self.allocate(batch_size)
+        for name, val in inputs.items():
+            mem[name][:] = val.reshape(len(val), -1)
+
+        if workers:
+            return self.execute_parallel(mem, workers)
+        return self.execute(mem)
+
+    def execute(self, mem, schedule=None):
+        """
+        Execute a schedule (by default the IR's complete schedule) on already
+        allocated variables, e.g. to re-execute a single rate group.
+        """
+        for args in self.closures(self.ir["schedule"] if schedule is None else schedule):
+            self.operators[args["operator"]](mem, args)
+
+        return mem
+
+    def execute_parallel(self, mem, workers, schedule=None):
+        """
+        Execute a schedule level by level (see DependencyGraph) such that the
+        closures of one level run concurrently on a thread pool. This pays off
+        for large batches where NumPy releases the GIL.
+        """
+        if "levels" not in self.ir:
+            return self.execute(mem, schedule)
+
+        # A sub-schedule (e.g. a rate group) retains the levels of its
+        # closures in the complete schedule. The levels refer to the closures
+        # that have been rolled into loops.
+        selected = set()
+        for c in (self.ir["schedule"] if schedule is None else schedule):
+            args = self.ir["closures"][c]
+            selected.update(args["closures"] if args["operator"] == "loop" else [c])
+
+        def run(c):
+            for args in self.closures([c]):
+                self.operators[args["operator"]](mem, args)
+
+        with ThreadPoolExecutor(workers) as pool:
+            for level in self.ir["levels"]["schedule"]:
+                list(pool.map(run, [c for c in level if c in selected]))
+
+        return mem
@@ -0,0 +1,213 @@
+# SPDX-License-Identifier: MPL-2.0
+import numpy as np
+from kindynsyn.ir_gen.layout import POSE_SIZE, SCREW_SIZE, RBI_SIZE, variable_size, \
+    screw_init, variable_init, loop_closures
+
+# Each variable is stored as an array of shape (batch, size) in the layout of
+# kindynsyn.ir_gen.layout.
+
+
+#
+# Helpers operating on batches
+#
+
+def rotation(pose):
+    return pose[:, :9].reshape(-1, 3, 3).transpose(0, 2, 1)
+
+def position(pose):
+    return pose[:, 9:12]
+
+def screws(x):
+    return x.reshape(len(x), -1, SCREW_SIZE)
+
+def rotate(r, v):
+    # r: (B, 3, 3), v: (B, N, 3)
+    return np.einsum("bij,bnj->bni", r, v)
+
+def rotate_transpose(r, v):
+    return np.einsum("bji,bnj->bni", r, v)
+
+def cross(a, b):
+    return np.cross(a, b)
+
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+def axis_index(joint):
+    """
+    Index of the axis of a joint such as "rev_x".
+    """
+    return AXES[joint[-1]]
+
+
+
+#
+# Kinematics
+#
+
+def compose_pose(mem, args):
+    r1, p1 = rotation(mem[args["in1"]]), position(mem[args["in1"]])
+    r2, p2 = rotation(mem[args["in2"]]), position(mem[args["in2"]])
+    out = mem[args["out"]]
+    r = r1 @ r2
+    out[:, :9] = r.transpose(0, 2, 1).reshape(-1, 9)
+    out[:, 9:12] = np.einsum("bij,bj->bi", r1, p2) + p1
+
+def add_screw(mem, args):
+    np.add(mem[args["in1"]], mem[args["in2"]], out=mem[args["out"]])
+
+def transform_velocity_twist_to_distal(mem, args):
+    pose = mem[args["pose"]]
+    r, p = rotation(pose), position(pose)[:, None, :]
+    frm = screws(mem[args["from"]])
+    to = screws(mem[args["to"]])
+    ang, lin = frm[..., :3], frm[..., 3:]
+    to[..., 3:] = rotate_transpose(r, lin - cross(p, ang))
+    to[..., :3] = rotate_transpose(r, ang)
+
+def rotate_velocity_twist_to_proximal_with_pose(mem, args):
+    r = rotation(mem[args["pose"]])
+    frm = screws(mem[args["from"]])
+    to = screws(mem[args["to"]])
+    to[..., :3] = rotate(r, frm[..., :3])
+    to[..., 3:] = rotate(r, frm[..., 3:])
+
+def transform_acceleration_twist_to_distal(mem, args):
+    pose = mem[args["pose"]]
+    r, p = rotation(pose), position(pose)
+
+    def to_distal(x):
+        ang, lin = x[:, :3], x[:, 3:6]
+        return (np.einsum("bji,bj->bi", r, ang),
+                np.einsum("bji,bj->bi", r, lin - cross(p, ang)))
+
+    acc_ang, acc_lin = to_distal(mem[args["from"]])
+    vel_ang, vel_lin = to_distal(mem[args["absolute-velocity"]])
+    rel = mem[args["relative-velocity"]]
+    rel_ang, rel_lin = rel[:, :3], rel[:, 3:6]
+
+    # Motion cross product of the parent's (transformed) velocity with the
+    # relative velocity
+    to = mem[args["to"]]
+    to[:, :3] = acc_ang + cross(vel_ang, rel_ang)
+    to[:, 3:6] = acc_lin + cross(vel_ang, rel_lin) + cross(vel_lin, rel_ang)
+
+
+
+#
+# Mechanics
+#
+
+def assign_wrench(mem, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    mem[args["to"]][:, :n] = mem[args["from"]][:, :n]
+
+def invert_wrench(mem, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    np.negative(mem[args["original"]][:, :n], out=mem[args["inverse"]][:, :n])
+
+def transform_wrench_to_proximal(mem, args):
+    pose = mem[args["pose"]]
+    r, p = rotation(pose), position(pose)[:, None, :]
+    n = args["number-of-wrenches"]
+    i = args["at-index"]
+    frm = screws(mem[args["from"]])[:, :n]
+    to = screws(mem[args["to"]])[:, i:i + n]
+    f = rotate(r, frm[..., :3])
+    to[..., 3:] = rotate(r, frm[..., 3:]) + cross(p, f)
+    to[..., :3] = f
+
+def rotate_wrench_to_distal_with_pose(mem, args):
+    r = rotation(mem[args["pose"]])
+    n = args["number-of-wrenches"]
+    i = args["at-index"]
+    frm = screws(mem[args["from"]])[:, :n]
+    to = screws(mem[args["to"]])[:, i:i + n]
+    to[..., :3] = rotate_transpose(r, frm[..., :3])
+    to[..., 3:] = rotate_transpose(r, frm[..., 3:])
+
+def rigid_body_inertia(x):
+    return x[:, :9].reshape(-1, 3, 3), x[:, 9:12], x[:, 12:13]
+
+def acceleration_twist_to_wrench_with_rigid_body_inertia(mem, args):
+    i, h, m = rigid_body_inertia(mem[args["rigid-body-inertia"]])
+    acc = mem[args["acceleration-twist"]]
+    ang, lin = acc[:, :3], acc[:, 3:6]
+    out = mem[args["wrench"]]
+    out[:, :3] = m * lin - cross(h, ang)
+    out[:, 3:6] = np.einsum("bij,bj->bi", i, ang) + cross(h, lin)
+
+def inertial_wrench(mem, args):
+    i, h, m = rigid_body_inertia(mem[args["rigid-body-inertia"]])
+    vel = mem[args["velocity-twist"]]
+    ang, lin = vel[:, :3], vel[:, 3:6]
+    # Momentum
+    lin_mom = m * lin - cross(h, ang)
+    ang_mom = np.einsum("bij,bj->bi", i, ang) + cross(h, lin)
+    # Force cross product of the velocity with the momentum
+    out = mem[args["wrench"]]
+    out[:, :3] = cross(ang, lin_mom)
+    out[:, 3:6] = cross(ang, ang_mom) + cross(lin, lin_mom)
+
+def accumulate_wrench(mem, args):
+    n = SCREW_SIZE * args["number-of-wrenches"]
+    agg = mem[args["aggregate"]][:, :n]
+    np.add(agg, mem[args["element"]][:, :n], out=agg)
+
+
+
+#
+# Kinematic chain
+#
+
+def joint_position_to_pose(mem, args):
+    a = axis_index(args["joint"])
+    b, c = (a + 1) % 3, (a + 2) % 3
+    q = mem[args["joint-position"]][:, 0]
+    cq, sq = np.cos(q), np.sin(q)
+
+    # Column-major rotation about the joint axis
+    out = mem[args["pose"]]
+    out[:] = 0.0
+    out[:, 3 * a + a] = 1.0
+    out[:, 3 * b + b] = cq
+    out[:, 3 * b + c] = sq
+    out[:, 3 * c + b] = -sq
+    out[:, 3 * c + c] = cq
+
+def joint_velocity_to_velocity_twist(mem, args):
+    out = mem[args["velocity-twist"]]
+    out[:] = 0.0
+    out[:, axis_index(args["joint"])] = mem[args["joint-velocity"]][:, 0]
+
+def joint_acceleration_to_acceleration_twist(mem, args):
+    out = mem[args["acceleration-twist"]]
+    out[:] = 0.0
+    out[:, axis_index(args["joint"])] = mem[args["joint-acceleration"]][:, 0]
+
+def joint_force_from_wrench(mem, args):
+    n = args["number-of-wrenches"]
+    w = screws(mem[args["wrench"]])[:, :n]
+    mem[args["joint-force"]][:, :n] = w[..., 3 + axis_index(args["joint"])]
+
+
+
+operator_list = {
+    "compose-pose": compose_pose,
+    "add-velocity-twist": add_screw,
+    "add-acceleration-twist": add_screw,
+    "transform-velocity-twist-to-distal": transform_velocity_twist_to_distal,
+    "rotate-velocity-twist-to-proximal-with-pose": rotate_velocity_twist_to_proximal_with_pose,
+    "transform-acceleration-twist-to-distal": transform_acceleration_twist_to_distal,
+    "assign-wrench": assign_wrench,
+    "invert-wrench": invert_wrench,
+    "transform-wrench-to-proximal": transform_wrench_to_proximal,
+    "rotate-wrench-to-distal-with-pose": rotate_wrench_to_distal_with_pose,
+    "acceleration-twist-to-wrench-with-rigid-body-inertia": acceleration_twist_to_wrench_with_rigid_body_inertia,
+    "inertial-wrench": inertial_wrench,
+    "accumulate-wrench": accumulate_wrench,
+    "joint-position-to-pose": joint_position_to_pose,
+    "joint-velocity-to-velocity-twist": joint_velocity_to_velocity_twist,
+    "joint-acceleration-to-acceleration-twist": joint_acceleration_to_acceleration_twist,
+    "joint-force-from-wrench": joint_force_from_wrench
+}
@@ -1,5 +1,13 @@
 # SPDX-License-Identifier: MPL-2.0
-from .translators import *
-from .ir_gen import *
+from kindynsyn.utility.lazy import lazy_package
 
-__all__ = ["translators", "ir_gen"]
+__all__ = ["translators", "layout", "ir_gen"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "layout": [
+        "POSE_SIZE", "SCREW_SIZE", "RBI_SIZE", "variable_size", "screw_init", "variable_init",
+        "loop_closures"
+    ],
+    "ir_gen": ["batch_quantities", "IRGenerator"]
+})
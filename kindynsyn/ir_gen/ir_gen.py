@@ -5,12 +5,54 @@ from kindynsyn.utility import log
 from kindynsyn.namespaces import ALGO
 from kindynsyn.rdflib_tools import qname
 from kindynsyn.ir_gen.translators import escape
+from kindynsyn.ir_gen.layout import variable_init
+
+
+# Quantities whose values differ between the samples of a batch even if they
+# are initialized (e.g. the joint state or external wrenches)
+batch_quantities = [
+    "joint-position",
+    "joint-velocity",
+    "joint-acceleration",
+    "joint-force",
+    "wrench"
+]
 
 
 class IRGenerator:
-    def __init__(self, g, translators):
+    """
+    Translate a schedule and its algorithm to the intermediate representation.
+
+    Given a batch size, the IR describes a solver that evaluates this number of
+    samples (e.g. joint states) per execution of the schedule. All variables
+    except for initialized model parameters (e.g. the poses between joints or
+    the rigid-body inertias) get a batch dimension. The "batch" entry of the IR
+    contains:
+    - "size", "alignment" (in bytes) and "index": the number of samples, the
+      alignment of the batched arrays' start and the name of the loop index.
+      The batched variables are stored as a structure of arrays (each
+      component holds the values of all samples) so that each closure is a
+      loop over the samples that can be vectorized.
+    - "variables": the batched variables
+    - "initialized": the batched variables that are initialized with the same
+      value for all samples
+
+    Given a cycle period (in seconds), the "timing" entry of the IR instructs
+    the applications to execute the control loop at absolute deadlines and to
+    record the timing statistics. It contains:
+    - "period" (in ns) and "seconds": the cycle period
+    - "bins" and "bin-width" (in ns): the wake-up latency histogram that covers
+      "bins" times "bin-width" (the last bin collects all larger latencies)
+    """
+    def __init__(self, g, translators, batch_size=None, alignment=64, quantities=batch_quantities,
+                 cycle_period=None, bins=40):
         self.g = g
         self.translators = translators
+        self.batch_size = batch_size
+        self.alignment = alignment
+        self.quantities = quantities
+        self.cycle_period = cycle_period
+        self.bins = bins
 
 
     def generate_data_types(self, algo):
@@ -92,12 +134,46 @@ class IRGenerator:
         return seq
 
 
+    def generate_batch(self, variables):
+        if not self.batch_size:
+            return None
+
+        batched, initialized = {}, {}
+        for name, var in variables.items():
+            init = variable_init(var)
+            if init is None or var["quantity"] in self.quantities:
+                batched[name] = True
+            if init is not None and name in batched:
+                initialized[name] = True
+
+        return {
+            "size": self.batch_size,
+            "alignment": self.alignment,
+            "index": "batch_i",
+            "variables": batched,
+            "initialized": initialized
+        }
+
+    def generate_timing(self):
+        if not self.cycle_period:
+            return None
+
+        period = round(self.cycle_period * 1e9)
+        return {
+            "period": period,
+            "seconds": self.cycle_period,
+            "bins": self.bins,
+            # The histogram covers two periods
+            "bin-width": max(1, 2 * period // self.bins)
+        }
+
     def generate(self, sched, algo):
         data_types = self.generate_data_types(algo)
         variables = self.generate_variables(algo)
         local = self.generate_local(algo)
         closures = self.generate_closures(sched)
         schedule = self.generate_schedule(sched)
+        batch = self.generate_batch(variables)
 
         return {
             "data-types": data_types,
@@ -106,5 +182,7 @@ class IRGenerator:
             "output": None,
             "local": local,
             "closures": closures,
-            "schedule": schedule
+            "schedule": schedule,
+            "batch": batch,
+            "timing": self.generate_timing()
         }
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+
+#
+# Memory layout of the IR's variables (same as in dyn2b), shared by the IR
+# generator, the optimizer and the evaluator without depending on NumPy
+#
+# - pose: rotation matrix (column-major, i.e. direction cosine x, y, z), then
+#   position
+# - velocity/acceleration twist: angular, then linear part
+# - wrench: force, then torque
+# - rigid-body inertia: rotational inertia (3x3), first moment of mass, mass
+#
+
+POSE_SIZE = 12
+SCREW_SIZE = 6
+RBI_SIZE = 13
+
+
+def variable_size(var):
+    """
+    Number of floating point values required to store a variable.
+    """
+    q = var["quantity"]
+    if q == "pose":
+        return POSE_SIZE
+    if q == "velocity-twist":
+        return SCREW_SIZE * var["number-of-velocities"]
+    if q == "acceleration-twist":
+        return SCREW_SIZE * var["number-of-accelerations"]
+    if q == "wrench":
+        return SCREW_SIZE * var["number-of-wrenches"]
+    if q == "rigid-body-inertia":
+        return RBI_SIZE
+    if "size" in var:
+        return var["size"]
+
+    raise ValueError("Unknown quantity: " + str(q))
+
+
+def screw_init(first, second):
+    if not first or not second:
+        return None
+
+    res = []
+    for f, s in zip(first, second):
+        res.extend(f)
+        res.extend(s)
+    return res
+
+
+def variable_init(var):
+    """
+    Initial value of a variable as flat list (or None if the variable is not
+    initialized).
+    """
+    q = var["quantity"]
+    if q == "pose":
+        dc = [var["direction-cosine-x"], var["direction-cosine-y"], var["direction-cosine-z"]]
+        if None in dc or var["position"] is None:
+            return None
+        return dc[0] + dc[1] + dc[2] + var["position"]
+    if q == "velocity-twist":
+        return screw_init(var["angular-velocity"], var["linear-velocity"])
+    if q == "acceleration-twist":
+        return screw_init(var["angular-acceleration"], var["linear-acceleration"])
+    if q == "wrench":
+        return screw_init(var["force"], var["torque"])
+    if q == "rigid-body-inertia":
+        if var["rotational-inertia"] is None or var["moment-of-mass"] is None or var["mass"] is None:
+            return None
+        return var["rotational-inertia"] + var["moment-of-mass"] + [var["mass"]]
+
+    coord = var.get("coordinates")
+    if coord is None:
+        return None
+    return coord if isinstance(coord, list) else [coord]
+
+
+def loop_closures(args):
+    """
+    Closures of a loop (see kindynsyn.optimizer.LoopRolling) in the order of
+    their execution, i.e. the loop's body for each iteration with the table
+    references replaced by the iteration's elements.
+    """
+    index = "[" + args["index"] + "]"
+    tables = {t["name"] + index: t["elements"] for t in args["tables"]}
+    functions = {f["name"] + index: f["elements"] for f in args["functions"]}
+
+    for i in range(args["count"]):
+        for c in args["body"]:
+            if "function" in c:
+                yield functions[c["function"]][i]
+                continue
+            yield {k: tables[v][i] if isinstance(v, str) and v in tables else v
+                   for k, v in c.items()}
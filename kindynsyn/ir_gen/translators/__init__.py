@@ -1,45 +1,38 @@
 # SPDX-License-Identifier: MPL-2.0
-from .common import *
-from .spatial_relations import *
-from .dynamics import *
-from .kinematic_chain import *
+from kindynsyn.utility.lazy import lazy_package
 
 __all__ = [
     "common",
     "spatial_relations",
     "dynamics",
-    "kinematic_chain"
+    "kinematic_chain",
+    "registry"
 ]
 
-translator_list = [
-    # Data
-    PoseTranslator(),
-    VelocityTwistTranslator(),
-    AccelerationTwistTranslator(),
-    RigidBodyInertiaTranslator(),
-    WrenchTranslator(),
-    JointPositionTranslator(),
-    JointVelocityTranslator(),
-    JointAccelerationTranslator(),
-    JointForceTranslator(),
-    JointInertiaTranslator(),
-
-    # Functions
-    JointPositionToPoseTranslator(),
-    JointVelocityToVelocityTwistTranslator(),
-    JointAccelerationToAccelerationTwistTranslator(),
-    JointForceFromWrenchTranslator(),
-    TransformVelocityTwistToDistalTranslator(),
-    RotateVelocityTwistToProximalWithPoseTranslator(),
-    TransformAccelerationTwistToDistalTranslator(),
-    ComposePoseTranslator(),
-    AddVelocityTwistTranslator(),
-    AddAccelerationTwistTranslator(),
-    InvertWrenchTranslator(),
-    TransformWrenchToProximalTranslator(),
-    RotateWrenchToDistalWithPoseTranslator(),
-    InertialWrenchTranslator(),
-    AccelerationTwistToWrenchWithRigidBodyInertiaTranslator(),
-    AssignWrenchTranslator(),
-    AccumulateWrenchTranslator()
-]
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "common": [
+        "for_type", "escape", "is_literal", "is_uriref", "is_bnode", "is_list", "embed_data",
+        "parse_scalar", "parse_vector3"
+    ],
+    "spatial_relations": [
+        "parse_direction_cosine_xyz", "parse_xyz", "PoseTranslator", "VelocityTwistTranslator",
+        "AccelerationTwistTranslator", "TransformVelocityTwistToDistalTranslator",
+        "RotateVelocityTwistToProximalWithPoseTranslator",
+        "TransformAccelerationTwistToDistalTranslator", "ComposePoseTranslator",
+        "AddVelocityTwistTranslator", "AddAccelerationTwistTranslator"
+    ],
+    "dynamics": [
+        "RigidBodyInertiaTranslator", "WrenchTranslator", "InvertWrenchTranslator",
+        "TransformWrenchToProximalTranslator", "RotateWrenchToDistalWithPoseTranslator",
+        "InertialWrenchTranslator", "AccelerationTwistToWrenchWithRigidBodyInertiaTranslator",
+        "AssignWrenchTranslator", "AccumulateWrenchTranslator"
+    ],
+    "kinematic_chain": [
+        "joint_axis", "JointPositionTranslator", "JointVelocityTranslator",
+        "JointAccelerationTranslator", "JointForceTranslator", "JointInertiaTranslator",
+        "JointPositionToPoseTranslator", "JointVelocityToVelocityTwistTranslator",
+        "JointAccelerationToAccelerationTwistTranslator", "JointForceFromWrenchTranslator"
+    ],
+    "registry": ["translator_list"]
+})
@@ -41,14 +41,19 @@ class RigidBodyInertiaTranslator:
 class WrenchTranslator:
     @staticmethod
     def translate(g, node):
+        force = parse_vector3(g, g.value(node, RBDYN_COORD["force"]))
+        torque = parse_vector3(g, g.value(node, RBDYN_COORD["torque"]))
+        force = [force] if force else None
+        torque = [torque] if torque else None
+
         return {
             "represents": str(node),
             "name": escape(qname(g, node)),
             "quantity": "wrench",
             "dimensions": 3,
             "number-of-wrenches": int(g.value(node, RBDYN_COORD["number-of-wrenches"])),
-            "torque": None,
-            "force": None
+            "torque": torque,
+            "force": force
         }
 
 
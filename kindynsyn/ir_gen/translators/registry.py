@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: MPL-2.0
+from .spatial_relations import *
+from .dynamics import *
+from .kinematic_chain import *
+
+translator_list = [
+    # Data
+    PoseTranslator(),
+    VelocityTwistTranslator(),
+    AccelerationTwistTranslator(),
+    RigidBodyInertiaTranslator(),
+    WrenchTranslator(),
+    JointPositionTranslator(),
+    JointVelocityTranslator(),
+    JointAccelerationTranslator(),
+    JointForceTranslator(),
+    JointInertiaTranslator(),
+
+    # Functions
+    JointPositionToPoseTranslator(),
+    JointVelocityToVelocityTwistTranslator(),
+    JointAccelerationToAccelerationTwistTranslator(),
+    JointForceFromWrenchTranslator(),
+    TransformVelocityTwistToDistalTranslator(),
+    RotateVelocityTwistToProximalWithPoseTranslator(),
+    TransformAccelerationTwistToDistalTranslator(),
+    ComposePoseTranslator(),
+    AddVelocityTwistTranslator(),
+    AddAccelerationTwistTranslator(),
+    InvertWrenchTranslator(),
+    TransformWrenchToProximalTranslator(),
+    RotateWrenchToDistalWithPoseTranslator(),
+    InertialWrenchTranslator(),
+    AccelerationTwistToWrenchWithRigidBodyInertiaTranslator(),
+    AssignWrenchTranslator(),
+    AccumulateWrenchTranslator()
+]
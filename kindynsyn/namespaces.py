@@ -129,6 +129,8 @@ class RBDYN_COORD(DefinedNamespace):
     ProductOfInertiaXYZ: URIRef
     FirstMomentOfMassVectorXYZ: URIRef
 
+    force: URIRef
+    torque: URIRef
     mass: URIRef
     ixx: URIRef
     ixy: URIRef
@@ -186,6 +188,19 @@ class KC_ENT(DefinedNamespace):
     _NS = Namespace("https://comp-rob2b.github.io/metamodels/kinematic-chain/structural-entities#")
 
 
+class KC_NAV(DefinedNamespace):
+    # Shortcuts of multi-hop paths in a kinematic chain that are derived from
+    # the structural entities (see kindynsyn.synthesizer.shortcuts)
+    _extras = [
+        "body-of-frame",                # The rigid body that a frame is a simplex of
+        "joint-of-frame",               # The joint that a frame is an attachment of
+        "sibling-frame",                # The other attachment of a frame's joint
+        "next-segment-frame"            # The frame of the next segment (via a frame on the same body and a joint)
+    ]
+
+    _NS = Namespace("https://comp-rob2b.github.io/kindyngen/navigation#")
+
+
 class KC_STAT(DefinedNamespace):
     JointInertia: URIRef
     JointForce: URIRef
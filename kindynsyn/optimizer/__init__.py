@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.utility.lazy import lazy_package
+
+__all__ = ["access", "def_use", "dead_code", "constant", "memory", "partition", "dependency", "cost", "loop", "alias"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "access": ["access_list", "names", "access_of"],
+    "def_use": ["Operation", "DefUse"],
+    "dead_code": ["select_data", "DeadCodeElimination"],
+    "constant": [
+        "literal_list", "store_pose", "store_velocity_twist", "store_acceleration_twist",
+        "store_wrench", "store_list", "ConstantFolding"
+    ],
+    "memory": ["BufferAllocation"],
+    "partition": [
+        "runtime_quantities", "DependencyRanking", "SchedulePartition", "rate_groups",
+        "RateGroupPartition"
+    ],
+    "dependency": ["storage_aliases", "DependencyGraph"],
+    "cost": ["cost", "wrenches", "cost_list", "accumulate", "CostModel", "compare"],
+    "loop": ["signature", "identifier", "LoopRolling"],
+    "alias": ["InterfaceAliasing"]
+})
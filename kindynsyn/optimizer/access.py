@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import loop_closures
+
+# Access of the IR operators to their arguments:
+# - read: the variable is only read
+# - write: the variable is completely overwritten
+# - update: the variable is read and (partially) written, e.g. at an index or
+#   by accumulation
+# - effect: the operator has an effect outside of the algorithm (e.g. commands
+#   sent to a robot) and must never be removed
+# - input: the operator obtains data from outside of the algorithm (e.g.
+#   measurements from a robot) that changes in every control cycle
+access_list = {
+    # Kinematics
+    "compose-pose": {
+        "read": ["in1", "in2"], "write": ["out"]},
+    "add-velocity-twist": {
+        "read": ["in1", "in2"], "write": ["out"]},
+    "add-acceleration-twist": {
+        "read": ["in1", "in2"], "write": ["out"]},
+    "transform-velocity-twist-to-distal": {
+        "read": ["pose", "from"], "write": ["to"]},
+    "rotate-velocity-twist-to-proximal-with-pose": {
+        "read": ["pose", "from"], "write": ["to"]},
+    "transform-acceleration-twist-to-distal": {
+        "read": ["pose", "absolute-velocity", "relative-velocity", "from"], "write": ["to"]},
+
+    # Mechanics
+    "assign-wrench": {
+        "read": ["from"], "write": ["to"]},
+    "invert-wrench": {
+        "read": ["original"], "write": ["inverse"]},
+    "transform-wrench-to-proximal": {
+        "read": ["pose", "from"], "update": ["to"]},
+    "rotate-wrench-to-distal-with-pose": {
+        "read": ["pose", "from"], "update": ["to"]},
+    "acceleration-twist-to-wrench-with-rigid-body-inertia": {
+        "read": ["rigid-body-inertia", "acceleration-twist"], "write": ["wrench"]},
+    "inertial-wrench": {
+        "read": ["rigid-body-inertia", "velocity-twist"], "write": ["wrench"]},
+    "accumulate-wrench": {
+        "read": ["element"], "update": ["aggregate"]},
+
+    # Kinematic chain
+    "joint-position-to-pose": {
+        "read": ["joint-position"], "write": ["pose"]},
+    "joint-velocity-to-velocity-twist": {
+        "read": ["joint-velocity"], "write": ["velocity-twist"]},
+    "joint-acceleration-to-acceleration-twist": {
+        "read": ["joint-acceleration"], "write": ["acceleration-twist"]},
+    "joint-force-from-wrench": {
+        "read": ["wrench"], "write": ["joint-force"]}
+}
+
+
+def names(value):
+    """
+    Variable names of an argument (a single name or a list of names)
+    """
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+def access_of(access, args):
+    """
+    Return the sets of variable names that are read, written and updated by an
+    IR closure as well as whether it has a side effect. Operators without an
+    access description are treated conservatively: they read all their
+    arguments and have an effect. The access of a loop is the union of its
+    closures' accesses where variables that are both read and written are
+    considered as updated.
+    """
+    if args["operator"] == "loop":
+        read, write, update, effect = set(), set(), set(), False
+        for c in loop_closures(args):
+            r, w, u, e = access_of(access, c)
+            read, write, update, effect = read | r, write | w, update | u, effect or e
+        update |= read & write
+        return read - update, write - update, update, effect
+
+    acc = access.get(args["operator"])
+    if acc is None:
+        read = set()
+        for k, v in args.items():
+            if k not in ["represents", "name", "operator"]:
+                read.update(names(v))
+        return read, set(), set(), True
+
+    read = set(n for f in acc.get("read", []) for n in names(args.get(f)))
+    write = set(n for f in acc.get("write", []) for n in names(args.get(f)))
+    update = set(n for f in acc.get("update", []) for n in names(args.get(f)))
+    return read, write, update, acc.get("effect", False)
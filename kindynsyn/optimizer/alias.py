@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import variable_size, variable_init
+
+
+class InterfaceAliasing:
+    """
+    Let variables of the IR alias the buffers of an interface (e.g. the joint
+    position, velocity and force arrays of a robot interface) instead of
+    copying between them in every control cycle. The "aliases" map operators
+    that copy a single element of a buffer from or to a variable to a
+    description of their arguments:
+    - "buffer": the name of the interface's buffer
+    - "index": the argument with the index of the element in the buffer
+    - "variable": the argument with the variable
+
+    A variable is only aliased if it is a non-initialized primitive of size one
+    that is copied by exactly one closure from or to one element of a buffer
+    and no other variable aliases the same element. The copying closures are
+    removed from the schedule and the closures. Batched IRs are not changed
+    because the interfaces' buffers hold a single sample.
+
+    The result is stored in the IR:
+    - "data-types": the data type "alias" with the buffer and the variable's
+      offset in that buffer
+    """
+    def __init__(self, aliases):
+        self.aliases = aliases
+
+    def candidates(self, ir):
+        uses = {}       # variable -> closures
+        for c in ir["schedule"]:
+            args = ir["closures"][c]
+            alias = self.aliases.get(args["operator"])
+            if alias:
+                uses.setdefault(args[alias["variable"]], []).append(c)
+
+        res = {}        # closure -> (variable, buffer, offset)
+        elements = {}   # (buffer, offset) -> variables
+        for v, cs in uses.items():
+            var = ir["variables"].get(v)
+            if len(cs) != 1 or var is None or variable_init(var) is not None:
+                continue
+            if ir["data-types"].get(v, {}).get("data-type") != "primitive":
+                continue
+            if variable_size(var) != 1:
+                continue
+
+            args = ir["closures"][cs[0]]
+            alias = self.aliases[args["operator"]]
+            element = (alias["buffer"], args[alias["index"]])
+            elements.setdefault(element, []).append(v)
+            res[cs[0]] = (v,) + element
+
+        return {c: a for c, a in res.items() if len(elements[a[1:]]) == 1}
+
+    def optimize(self, ir):
+        if ir.get("batch"):
+            return ir
+
+        candidates = self.candidates(ir)
+        for c, (v, buffer, offset) in candidates.items():
+            ir["data-types"][v] = { "data-type": "alias", "buffer": buffer, "offset": offset }
+            del ir["closures"][c]
+
+        ir["schedule"] = [c for c in ir["schedule"] if c not in candidates]
+        return ir
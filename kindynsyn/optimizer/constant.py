@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: MPL-2.0
+import numpy as np
+from rdflib import collection, BNode, Literal
+from kindynsyn.namespaces import GEOM_COORD, RBDYN_COORD
+from kindynsyn.ir_gen.layout import variable_size, variable_init
+from kindynsyn.ir_eval.operators import operator_list
+from kindynsyn.optimizer.def_use import DefUse
+
+
+def literal_list(g, values):
+    id_ = BNode()
+    collection.Collection(g, id_, [Literal(float(v)) for v in values])
+    return id_
+
+
+def store_pose(g, node, val):
+    for name, i in [("direction-cosine-x", 0), ("direction-cosine-y", 3), ("direction-cosine-z", 6)]:
+        g.add((node, GEOM_COORD[name], literal_list(g, val[i:i+3])))
+    for name, i in [("x", 9), ("y", 10), ("z", 11)]:
+        g.add((node, GEOM_COORD[name], Literal(float(val[i]))))
+
+def store_velocity_twist(g, node, val):
+    g.add((node, GEOM_COORD["angular-velocity"], literal_list(g, val[0:3])))
+    g.add((node, GEOM_COORD["linear-velocity"], literal_list(g, val[3:6])))
+
+def store_acceleration_twist(g, node, val):
+    g.add((node, GEOM_COORD["angular-acceleration"], literal_list(g, val[0:3])))
+    g.add((node, GEOM_COORD["linear-acceleration"], literal_list(g, val[3:6])))
+
+def store_wrench(g, node, val):
+    g.add((node, RBDYN_COORD["force"], literal_list(g, val[0:3])))
+    g.add((node, RBDYN_COORD["torque"], literal_list(g, val[3:6])))
+
+
+# Quantities whose values can be stored as coordinates in the graph together
+# with their size
+store_list = {
+    "pose": (store_pose, 12),
+    "velocity-twist": (store_velocity_twist, 6),
+    "acceleration-twist": (store_acceleration_twist, 6),
+    "wrench": (store_wrench, 6)
+}
+
+
+class ConstantFolding:
+    """
+    Evaluate all operations whose inputs are known at synthesis time (i.e.
+    initialized data that no operation writes) with NumPy. Their results are
+    stored as coordinates of the output data in the graph, so that the IR
+    contains them as initialized variables, and the operations are removed
+    from the schedule. The folding propagates through chains of operations.
+
+    An operation is only folded if (i) its operator can be evaluated, (ii) it
+    has neither an effect nor is an input, (iii) all variables it defines are
+    only defined by folded operations, are overwritten by their first access
+    and can be stored in the graph.
+    """
+    def __init__(self, g, translators, access=None, operators=None):
+        self.g = g
+        self.def_use = DefUse(g, translators, access)
+        self.operators = operator_list | (operators or {})
+
+    def foldable(self, operations, variables):
+        writers, first = {}, {}
+        for op in operations:
+            for v in op.uses() | op.defines():
+                first.setdefault(v, op)
+            for v in op.defines():
+                writers.setdefault(v, []).append(op)
+
+        def storable(v):
+            var = variables.get(v)
+            if var is None or var["quantity"] not in store_list:
+                return False
+            return variable_size(var) == store_list[var["quantity"]][1]
+
+        fold = set()
+        for op in operations:
+            access = self.def_use.access.get(op.args["operator"], {})
+            if op.effect or access.get("input", False) \
+                    or op.args["operator"] not in self.operators:
+                continue
+            if all(storable(v) and v in op.write and first[v] is op for v in op.defines()):
+                fold.add(op)
+
+        def constant(v):
+            if v in writers:
+                return all(w in fold for w in writers[v]) and first[v] in fold \
+                    and v in first[v].write
+            var = variables.get(v)
+            return var is not None and variable_init(var) is not None
+
+        # Greatest fixpoint: drop operations with non-constant inputs
+        changed = True
+        while changed:
+            changed = False
+            for op in list(fold):
+                if not all(constant(v) for v in op.uses() | op.defines()):
+                    fold.discard(op)
+                    changed = True
+
+        return [op for op in operations if op in fold]
+
+    def optimize(self, algo, sched):
+        """
+        Return the folded operations and the data whose values are now known.
+        """
+        operations = self.def_use.operations(sched)
+        data = self.def_use.data(algo)
+        variables = {}
+        for name, node in data.items():
+            var = self.def_use.translate(node)
+            if var is not None:
+                variables[name] = var
+
+        fold = self.foldable(operations, variables)
+        if not fold:
+            return [], []
+
+        mem = {}
+        for name, var in variables.items():
+            mem[name] = np.zeros((1, variable_size(var)))
+            init = variable_init(var)
+            if init is not None:
+                mem[name][:] = init
+
+        defined = []
+        for op in fold:
+            self.operators[op.args["operator"]](mem, op.args)
+            defined.extend(v for v in op.write if v not in defined)
+
+        for v in defined:
+            store = store_list[variables[v]["quantity"]][0]
+            store(self.g, data[v], mem[v][0])
+
+        self.def_use.remove(algo, fold, [])
+
+        return [op.node for op in fold], [data[v] for v in defined]
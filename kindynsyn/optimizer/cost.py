@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import loop_closures
+
+
+def cost(flops=0, special=0, read=0, write=0):
+    """
+    Cost of one closure:
+    - flops: floating-point additions and multiplications
+    - special: transcendental functions (sin, cos, ...)
+    - read/write: memory traffic in number of doubles
+    """
+    return {"flops": flops, "special": special, "read": read, "write": write}
+
+
+def wrenches(args):
+    return args.get("number-of-wrenches", 1)
+
+
+# Cost of the IR operators as function of the closure (for three dimensions)
+cost_list = {
+    # Kinematics
+    "compose-pose":
+        lambda a: cost(flops=63, read=24, write=12),
+    "add-velocity-twist":
+        lambda a: cost(flops=6, read=12, write=6),
+    "add-acceleration-twist":
+        lambda a: cost(flops=6, read=12, write=6),
+    "transform-velocity-twist-to-distal":
+        lambda a: cost(flops=42, read=18, write=6),
+    "rotate-velocity-twist-to-proximal-with-pose":
+        lambda a: cost(flops=30, read=18, write=6),
+    "transform-acceleration-twist-to-distal":
+        lambda a: cost(flops=120, read=30, write=6),
+
+    # Mechanics
+    "assign-wrench":
+        lambda a: cost(read=6 * wrenches(a), write=6 * wrenches(a)),
+    "invert-wrench":
+        lambda a: cost(flops=6 * wrenches(a), read=6 * wrenches(a), write=6 * wrenches(a)),
+    "transform-wrench-to-proximal":
+        lambda a: cost(flops=42 * wrenches(a), read=12 + 6 * wrenches(a), write=6 * wrenches(a)),
+    "rotate-wrench-to-distal-with-pose":
+        lambda a: cost(flops=30 * wrenches(a), read=9 + 6 * wrenches(a), write=6 * wrenches(a)),
+    "acceleration-twist-to-wrench-with-rigid-body-inertia":
+        lambda a: cost(flops=42, read=19, write=6),
+    "inertial-wrench":
+        lambda a: cost(flops=72, read=19, write=6),
+    "accumulate-wrench":
+        lambda a: cost(flops=6 * wrenches(a), read=12 * wrenches(a), write=6 * wrenches(a)),
+
+    # Kinematic chain
+    "joint-position-to-pose":
+        lambda a: cost(flops=1, special=2, read=1, write=12),
+    "joint-velocity-to-velocity-twist":
+        lambda a: cost(read=1, write=6),
+    "joint-acceleration-to-acceleration-twist":
+        lambda a: cost(read=1, write=6),
+    "joint-force-from-wrench":
+        lambda a: cost(read=wrenches(a), write=wrenches(a))
+}
+
+
+def accumulate(total, c):
+    for k, v in c.items():
+        total[k] = total.get(k, 0) + v
+    total["closures"] = total.get("closures", 0) + 1
+
+
+class CostModel:
+    """
+    Static cost of the closures in an IR's schedule. The report contains the
+    total cost, the cost per control cycle (if the schedule has been
+    partitioned), the cost per operator and the number of closures whose
+    operator has no cost model. Given the origin of each closure (see
+    Provenance.table) the cost is also reported per sweep, per step and per
+    segment.
+
+    Additional operators can be provided in the same format as "cost_list".
+    Loops are accounted for by their closures.
+    """
+    def __init__(self, costs=None):
+        self.costs = cost_list | (costs or {})
+
+    def closures(self, ir, schedule):
+        for c in schedule:
+            args = ir["closures"][c]
+            if args["operator"] == "loop":
+                yield from loop_closures(args)
+            else:
+                yield args
+
+    def report(self, ir, origin=None):
+        res = {"total": {}, "operator": {}, "unknown": {}}
+        if origin is not None:
+            res |= {"sweep": {}, "step": {}, "segment": {}}
+
+        for args in self.closures(ir, ir["schedule"]):
+            op = args["operator"]
+            if op not in self.costs:
+                res["unknown"][op] = res["unknown"].get(op, 0) + 1
+                continue
+
+            cst = self.costs[op](args)
+            accumulate(res["total"], cst)
+            accumulate(res["operator"].setdefault(op, {}), cst)
+
+            if origin is None or args["represents"] not in origin:
+                continue
+            for key, value in origin[args["represents"]].items():
+                accumulate(res[key].setdefault(str(value), {}), cst)
+
+        if "cycle-schedule" in ir:
+            res["cycle"] = {}
+            for args in self.closures(ir, ir["cycle-schedule"]):
+                if args["operator"] in self.costs:
+                    accumulate(res["cycle"], self.costs[args["operator"]](args))
+
+        return res
+
+
+def compare(report, baseline, tolerance=0.0):
+    """
+    Return a description of each cost in the report that exceeds the
+    baseline's cost by more than the relative tolerance (empty if there is no
+    regression). Totals, per-cycle costs and per-step costs are compared.
+    """
+    res = []
+
+    def check(name, new, old):
+        for k, v in new.items():
+            if v > old.get(k, 0) * (1.0 + tolerance):
+                res.append(f"{name}.{k}: {old.get(k, 0)} -> {v}")
+
+    for key in ["total", "cycle"]:
+        if key in report:
+            check(key, report[key], baseline.get(key, {}))
+    for step, c in report.get("step", {}).items():
+        check("step." + step, c, baseline.get("step", {}).get(step, {}))
+    for op, n in report["unknown"].items():
+        if n > baseline.get("unknown", {}).get(op, 0):
+            res.append(f"unknown.{op}: {baseline.get('unknown', {}).get(op, 0)} -> {n}")
+
+    return res
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: MPL-2.0
+from rdflib import RDF
+from kindynsyn.rdflib_tools import qname
+from kindynsyn.ir_gen.translators import escape
+from kindynsyn.optimizer.def_use import DefUse
+
+
+def select_data(g, data, rdf_type):
+    """
+    Select all data nodes of the given type, e.g. to declare the outputs of an
+    algorithm.
+    """
+    return [d for d in data if (d, RDF["type"], rdf_type) in g]
+
+
+class DeadCodeElimination:
+    """
+    Remove all operations from a schedule that neither contribute to the
+    declared outputs nor have an effect (e.g. sending commands to a robot).
+    Afterwards, all data that is not accessed by any remaining operation and
+    that is not an output is removed from the algorithm.
+    """
+    def __init__(self, g, translators, access=None):
+        self.g = g
+        self.def_use = DefUse(g, translators, access)
+
+    def live_operations(self, operations, outputs):
+        live = set(outputs)
+        res = []
+
+        # Backward liveness analysis
+        for op in reversed(operations):
+            if not op.effect and not (op.defines() & live):
+                continue
+
+            live -= op.write
+            live |= op.uses()
+            res.append(op)
+
+        return list(reversed(res))
+
+    def optimize(self, algo, sched, outputs):
+        """
+        Return the removed operations and data.
+        """
+        outputs = set(escape(qname(self.g, o)) for o in outputs)
+        operations = self.def_use.operations(sched)
+        live = self.live_operations(operations, outputs)
+
+        accessed = set(outputs)
+        for op in live:
+            accessed |= op.uses() | op.defines()
+
+        dead_op = [op for op in operations if op not in live]
+        dead_data = [d for n, d in self.def_use.data(algo).items() if n not in accessed]
+
+        self.def_use.remove(algo, dead_op, dead_data)
+
+        return [op.node for op in dead_op], dead_data
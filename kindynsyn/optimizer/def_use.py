@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MPL-2.0
+from rdflib import collection, RDF
+from kindynsyn.utility import log
+from kindynsyn.namespaces import ALGO
+from kindynsyn.rdflib_tools import qname
+from kindynsyn.ir_gen.translators import escape
+from kindynsyn.optimizer.access import access_list, access_of
+
+
+class Operation:
+    def __init__(self, node, schedule, args, read, write, update, effect):
+        self.node = node            # The operation in the graph
+        self.schedule = schedule    # The schedule that triggers the operation
+        self.args = args            # The operation's IR
+        self.read = read
+        self.write = write
+        self.update = update
+        self.effect = effect
+
+    def uses(self):
+        return self.read | self.update
+
+    def defines(self):
+        return self.write | self.update
+
+
+class DefUse:
+    """
+    Def-use information of the operations in a schedule. The operations are
+    translated to the intermediate representation so that the variables they
+    access can be identified by the same (escaped) names that the IR uses.
+    """
+    def __init__(self, g, translators, access=None):
+        self.g = g
+        self.translators = translators
+        self.access = access_list | (access or {})
+
+    def data(self, algo):
+        res = {}
+        for d in self.g[algo : ALGO["data"]]:
+            res[escape(qname(self.g, d))] = d
+
+        # Descent into child algorithms
+        for a in self.g[algo : ALGO["algorithm"]]:
+            res |= self.data(a)
+
+        return res
+
+    def translate(self, node):
+        for t in self.translators:
+            if t.is_applicable(self.g, node):
+                return t.translate(self.g, node)
+
+        log("No function translator found:", node)
+        return None
+
+    def operations(self, sched):
+        """
+        Return the operations of a schedule (including child schedules) in
+        their order of execution.
+        """
+        res = []
+
+        chain = collection.Collection(self.g, self.g.value(sched, ALGO["trigger-chain"]))
+        for trig in chain:
+            if self.g[trig : RDF["type"] : ALGO["Schedule"]]:
+                # Descent into child schedules
+                res.extend(self.operations(trig))
+                continue
+
+            args = self.translate(trig)
+            if args is None:
+                continue
+            read, write, update, effect = access_of(self.access, args)
+            res.append(Operation(trig, sched, args, read, write, update, effect))
+
+        return res
+
+    def remove(self, algo, operations=[], data=[]):
+        """
+        Remove operations from their schedules and the algorithm as well as
+        data from the algorithm.
+        """
+        nodes = set(op.node for op in operations)
+        for sched in set(op.schedule for op in operations):
+            chain = collection.Collection(self.g, self.g.value(sched, ALGO["trigger-chain"]))
+            keep = [trig for trig in chain if trig not in nodes]
+            chain.clear()
+            chain += keep
+
+        for a in [algo] + list(self.g[algo : ALGO["algorithm"]]):
+            for op in operations:
+                self.g.remove((a, ALGO["function"], op.node))
+            for d in data:
+                self.g.remove((a, ALGO["data"], d))
@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import variable_size, loop_closures
+from kindynsyn.optimizer.access import access_list, access_of
+
+
+def storage_aliases(ir):
+    """
+    Map each variable that shares memory with other variables (see
+    BufferAllocation and InterfaceAliasing) to the set of those variables
+    (including itself).
+    """
+    ranges = {}
+    for v, dt in ir["data-types"].items():
+        if not isinstance(dt, dict) or v not in ir["variables"]:
+            continue
+        o = dt.get("offset")
+        if dt.get("data-type") == "arena":
+            ranges[v] = (dt["arena"], o, o + variable_size(ir["variables"][v]))
+        elif dt.get("data-type") == "alias":
+            ranges[v] = (dt["buffer"], o, o + variable_size(ir["variables"][v]))
+
+    res = {}
+    for v, (a, begin, end) in ranges.items():
+        res[v] = set(w for w, (b, s, e) in ranges.items() if a == b and s < end and begin < e)
+    return res
+
+
+class DependencyGraph:
+    """
+    Derive the dependencies between the closures of an IR's schedule from the
+    variables they read and write (read-after-write, write-after-read and
+    write-after-write) as well as from their effects, which retain their
+    relative order. Variables that share memory in an arena or in an
+    interface's buffer are treated as the same variable. Operators without an
+    access description (e.g. those of application extensions that read
+    sensors) may write any of their arguments, hence they are considered to
+    update all of them.
+
+    The result is stored in the IR:
+    - "dependencies": per closure the variables it reads and writes (updated
+      variables are both read and written) and the closures it must execute
+      after
+    - "levels": per schedule ("schedule" and, if partitioned, "init-schedule"
+      and "cycle-schedule") the closures grouped by their longest distance
+      from a closure without dependencies. The closures in one level are
+      independent of each other and can be executed in parallel when the
+      previous levels are done. Within a level the closures retain their order
+      in the schedule. Each rate group also receives the "levels" of its
+      schedule.
+    """
+    def __init__(self, access=None):
+        self.access = access_list | (access or {})
+
+    def described(self, args):
+        if args["operator"] == "loop":
+            return all(self.described(c) for c in loop_closures(args))
+        return args["operator"] in self.access
+
+    def dependencies(self, ir):
+        aliases = storage_aliases(ir)
+
+        def expand(vs):
+            res = set()
+            for v in vs:
+                res |= aliases.get(v, {v})
+            return res
+
+        last_write = {}     # variable -> closure
+        reads = {}          # variable -> closures since the last write
+        last_effect = None
+
+        res = {}
+        for c in ir["schedule"]:
+            args = ir["closures"][c]
+            read, write, update, effect = access_of(self.access, args)
+            if not self.described(args):
+                update |= read | write
+            read, write = read | update, write | update
+
+            after = set()
+            for v in expand(read):
+                if v in last_write:
+                    after.add(last_write[v])
+            for v in expand(write):
+                if v in last_write:
+                    after.add(last_write[v])
+                after |= reads.get(v, set())
+            if effect and last_effect is not None:
+                after.add(last_effect)
+            after.discard(c)
+
+            for v in expand(read):
+                reads.setdefault(v, set()).add(c)
+            for v in expand(write):
+                last_write[v] = c
+                reads[v] = set()
+            if effect:
+                last_effect = c
+
+            res[c] = {
+                "read": sorted(read),
+                "write": sorted(write),
+                "after": [a for a in ir["schedule"] if a in after]
+            }
+
+        return res
+
+    def levels(self, dependencies, schedule):
+        """
+        Group the closures of a (sub-)schedule into levels. Dependencies on
+        closures outside of the schedule (e.g. of the "cycle-schedule" on the
+        "init-schedule") are satisfied before the schedule executes.
+        """
+        level = {}
+        for c in schedule:
+            level[c] = max([level[a] + 1 for a in dependencies[c]["after"] if a in level],
+                           default=0)
+
+        res = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for c in schedule:
+            res[level[c]].append(c)
+        return res
+
+    def optimize(self, ir):
+        ir["dependencies"] = self.dependencies(ir)
+        ir["levels"] = {s: self.levels(ir["dependencies"], ir[s])
+                        for s in ["schedule", "init-schedule", "cycle-schedule"] if s in ir}
+        for grp in ir.get("rate-groups", []):
+            grp["levels"] = self.levels(ir["dependencies"], grp["schedule"])
+        return ir
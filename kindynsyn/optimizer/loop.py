@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: MPL-2.0
+
+
+def signature(args, variables):
+    """
+    The parts of a closure that must be the same in all iterations of a loop:
+    the operator and all arguments except for variables, joints and the
+    represented operation.
+    """
+    res = []
+    for k, v in sorted(args.items()):
+        if k in ["represents", "joint"]:
+            res.append((k, None))
+        elif isinstance(v, str) and v in variables:
+            res.append((k, None))
+        else:
+            res.append((k, repr(v)))
+    return tuple(res)
+
+
+def identifier(name):
+    return name.replace("-", "_")
+
+
+class LoopRolling:
+    """
+    Detect repeated sequences of closures in the IR's schedules (e.g. the
+    operations of each segment in a sweep along a serial chain) and replace
+    them by a single "loop" closure. The closures of an iteration may only
+    differ in their variables and joints:
+    - "tables": per argument that differs across iterations the variable of
+      each iteration. The loop's "body" refers to the table at the loop's
+      "index", e.g. "loop_0_1_pose[loop_0_i]".
+    - "functions": per closure whose joint differs across iterations the
+      original closure of each iteration. The body refers to the function via
+      the "function" argument that replaces the "joint" argument.
+    Arguments that are the same in all iterations are retained in the body.
+    The loop also lists the rolled "closures" in the order of their execution.
+
+    Only runs of at least "min-count" iterations whose body consists of at most
+    "max-period" closures are rolled. The rolled closures remain in the IR's
+    closures so that other annotations (e.g. the rate groups or levels) stay
+    valid. By default the "schedule", "init-schedule" and "cycle-schedule"
+    are rolled. Batched IRs (see IRGenerator) are not rolled because each of
+    their closures already is a loop over the samples.
+    """
+    def __init__(self, min_count=3, max_period=32, prefix="loop"):
+        self.min_count = min_count
+        self.max_period = max_period
+        self.prefix = prefix
+
+    def find(self, signatures, i):
+        """
+        Return the period and the number of iterations of the longest run that
+        starts at index "i" (preferring short periods).
+        """
+        n = len(signatures)
+        best_period, best_count = 0, 0
+        for p in range(1, min(self.max_period, (n - i) // self.min_count) + 1):
+            k = 1
+            while i + (k + 1) * p <= n \
+                    and signatures[i + k * p:i + (k + 1) * p] == signatures[i:i + p]:
+                k += 1
+            if k >= self.min_count and k * p > best_period * best_count:
+                best_period, best_count = p, k
+        return best_period, best_count
+
+    def roll(self, name, block, iterations):
+        index = name + "_i"
+        body, tables, functions = [], [], []
+
+        for j, c in enumerate(iterations[0]):
+            closures = [it[j] for it in iterations]
+            b = {"represents": name, "operator": c["operator"]}
+            for k, v in c.items():
+                if k in ["represents", "operator"]:
+                    continue
+                elements = [a[k] for a in closures]
+                if k == "joint" or all(e == v for e in elements):
+                    b[k] = v
+                    continue
+                table = identifier("{}_{}_{}".format(name, j, k))
+                tables.append({"name": table, "elements": elements})
+                b[k] = "{}[{}]".format(table, index)
+
+            if any(a.get("joint") != c.get("joint") for a in closures):
+                function = identifier("{}_{}_function".format(name, j))
+                functions.append({
+                    "name": function,
+                    "operator": c["operator"],
+                    "elements": closures
+                })
+                del b["joint"]
+                b["function"] = "{}[{}]".format(function, index)
+
+            body.append(b)
+
+        return {
+            "represents": name,
+            "operator": "loop",
+            "name": name,
+            "index": index,
+            "count": len(iterations),
+            "body": body,
+            "tables": tables,
+            "functions": functions,
+            "closures": block
+        }
+
+    def rewrite(self, ir, schedule, loops):
+        signatures = [signature(ir["closures"][c], ir["variables"]) for c in schedule]
+
+        res = []
+        i = 0
+        while i < len(schedule):
+            p, k = self.find(signatures, i)
+            if k == 0:
+                res.append(schedule[i])
+                i += 1
+                continue
+
+            block = schedule[i:i + p * k]
+            key = tuple(block)
+            if key not in loops:
+                name = "{}_{}".format(self.prefix, len(loops))
+                iterations = [[ir["closures"][c] for c in block[m * p:(m + 1) * p]]
+                              for m in range(k)]
+                loops[key] = name
+                ir["closures"][name] = self.roll(name, block, iterations)
+            res.append(loops[key])
+            i += p * k
+
+        return res
+
+    def optimize(self, ir, schedules=["schedule", "init-schedule", "cycle-schedule"]):
+        if ir.get("batch"):
+            return ir
+
+        loops = {}
+        for s in schedules:
+            if s in ir:
+                ir[s] = self.rewrite(ir, ir[s], loops)
+        return ir
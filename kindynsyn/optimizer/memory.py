@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import variable_size, variable_init
+from kindynsyn.optimizer.access import access_list, access_of, names
+
+
+class BufferAllocation:
+    """
+    Assign the intermediate variables of an IR to slots of a single buffer (the
+    "arena") such that variables with overlapping live ranges never share
+    memory.
+
+    Only variables that are (i) not initialized, (ii) completely overwritten by
+    their first access in the schedule, (iii) read by their last access and
+    (iv) only accessed by operators with a known access description are
+    candidates. All other variables keep their own storage, e.g. because their
+    value must persist across control cycles, because they are results of the
+    schedule or because they are accessed outside of the schedule. Outputs can
+    also be pinned explicitly.
+
+    The result is stored in the IR:
+    - "arena": name and size (in number of doubles) of the buffer
+    - "data-types": the data type "arena" with the variable's offset
+    """
+    def __init__(self, access=None, name="arena"):
+        self.access = access_list | (access or {})
+        self.name = name
+
+    def live_ranges(self, ir, outputs=[]):
+        first, last = {}, {}
+        result = set()
+        pinned = set(outputs)
+
+        for i, c in enumerate(ir["schedule"]):
+            args = ir["closures"][c]
+            if args["operator"] not in self.access:
+                for k, v in args.items():
+                    pinned.update(names(v))
+                continue
+
+            read, write, update, _ = access_of(self.access, args)
+            for v in read | update | write:
+                if v not in first:
+                    first[v] = i
+                    if v not in write:
+                        # The value is live when entering the schedule
+                        pinned.add(v)
+                last[v] = i
+                if v in read | update:
+                    result.discard(v)
+                else:
+                    result.add(v)
+
+        # The last access wrote the variable so that its value is a result
+        pinned |= result
+
+        # Results of the initialization must persist across control cycles
+        for c in ir.get("init-schedule", []):
+            args = ir["closures"][c]
+            read, write, update, _ = access_of(self.access, args)
+            pinned |= read | write | update
+
+        # Rate groups may be re-executed individually so that values which are
+        # passed from one group to another must persist
+        group = {}
+        for i, grp in enumerate(ir.get("rate-groups", [])):
+            for c in grp["schedule"]:
+                read, write, update, _ = access_of(self.access, ir["closures"][c])
+                for v in read | write | update:
+                    if group.setdefault(v, i) != i:
+                        pinned.add(v)
+
+        res = {}
+        for v in ir["local"]:
+            var = ir["variables"].get(v)
+            if v not in first or v in pinned or var is None:
+                continue
+            if variable_init(var) is not None:
+                continue
+            # Variables that alias an interface's buffer (see InterfaceAliasing)
+            if ir["data-types"].get(v, {}).get("data-type") == "alias":
+                continue
+            res[v] = (first[v], last[v])
+
+        return res
+
+    def allocate(self, ir, ranges):
+        """
+        First-fit allocation in order of the start of the live ranges.
+        """
+        offsets = {}
+        active = []     # (end, offset, size)
+        size = 0
+
+        for v in sorted(ranges, key=lambda v: (ranges[v][0], -variable_size(ir["variables"][v]))):
+            start, end = ranges[v]
+            n = variable_size(ir["variables"][v])
+            active = [a for a in active if a[0] >= start]
+
+            offset = 0
+            for _, o, s in sorted(active, key=lambda a: a[1]):
+                if offset + n <= o:
+                    break
+                offset = max(offset, o + s)
+
+            offsets[v] = offset
+            active.append((end, offset, n))
+            size = max(size, offset + n)
+
+        return offsets, size
+
+    def optimize(self, ir, outputs=[]):
+        """
+        The "outputs" are the (escaped) names of variables that must not be
+        assigned to the arena.
+        """
+        ranges = self.live_ranges(ir, outputs)
+        offsets, size = self.allocate(ir, ranges)
+        if not offsets:
+            return ir
+
+        ir["arena"] = { "name": self.name, "size": size }
+        for v, o in offsets.items():
+            ir["data-types"][v] = { "data-type": "arena", "arena": self.name, "offset": o }
+
+        return ir
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: MPL-2.0
+from kindynsyn.ir_gen.layout import variable_init
+from kindynsyn.optimizer.access import access_list, access_of
+
+
+# Quantities whose values change in every control cycle
+runtime_quantities = {
+    "joint-position": 1,
+    "joint-velocity": 1,
+    "joint-acceleration": 1
+}
+
+
+class DependencyRanking:
+    """
+    Rank each closure of an IR schedule by its transitive dependency on runtime
+    inputs. Rank 0 denotes closures that compute the same result in every
+    control cycle. Runtime inputs are:
+    - variables of the given runtime quantities
+    - variables that are neither initialized nor written by the schedule (e.g.
+      external wrenches that are provided by the application)
+    - variables written by operators that are marked as "input" (e.g. sensor
+      data from a robot interface)
+    Operators with an effect always execute in every control cycle.
+
+    A variable's rank is the highest rank of all closures that write it and a
+    closure's rank is the highest rank of all variables it accesses.
+    Variables that are read before they are written in the schedule carry
+    their value across control cycles and are treated as runtime inputs.
+    """
+    def __init__(self, access=None, quantities=runtime_quantities):
+        self.access = access_list | (access or {})
+        self.quantities = quantities
+
+    def source_ranks(self, ir, ops):
+        top = max(self.quantities.values(), default=1)
+
+        written = set()
+        for _, _, write, update, _, _ in ops:
+            written |= write | update
+
+        res = {}
+        for name, var in ir["variables"].items():
+            if var.get("quantity") in self.quantities:
+                res[name] = self.quantities[var["quantity"]]
+            elif name not in written and variable_init(var) is None:
+                res[name] = top
+            else:
+                res[name] = 0
+
+        # Loop-carried variables
+        defined = set()
+        for _, read, write, update, _, _ in ops:
+            for v in (read | update) - defined:
+                if v in written:
+                    res[v] = top
+            defined |= write | update
+
+        return res, top
+
+    def rank(self, ir):
+        ops = []
+        for c in ir["schedule"]:
+            args = ir["closures"][c]
+            read, write, update, effect = access_of(self.access, args)
+            is_input = self.access.get(args["operator"], {}).get("input", False)
+            ops.append((c, read, write, update, effect, is_input))
+
+        var_rank, top = self.source_ranks(ir, ops)
+
+        op_rank = {}
+        changed = True
+        while changed:
+            changed = False
+            for c, read, write, update, effect, is_input in ops:
+                acc = read | write | update
+                r = max([var_rank.get(v, 0) for v in acc], default=0)
+                if effect:
+                    r = top
+                if is_input:
+                    r = max(r, 1)
+
+                op_rank[c] = r
+                for v in write | update:
+                    if var_rank.get(v, 0) < r:
+                        var_rank[v] = r
+                        changed = True
+
+        return op_rank
+
+
+class SchedulePartition:
+    """
+    Split the IR schedule into an "init-schedule" that contains all closures
+    independent of runtime inputs and a "cycle-schedule" that contains the
+    remaining closures. The order within both schedules is the same as in the
+    original schedule. The original schedule is retained.
+    """
+    def __init__(self, access=None):
+        self.ranking = DependencyRanking(access)
+
+    def optimize(self, ir):
+        rank = self.ranking.rank(ir)
+        ir["init-schedule"] = [c for c in ir["schedule"] if rank[c] == 0]
+        ir["cycle-schedule"] = [c for c in ir["schedule"] if rank[c] > 0]
+        return ir
+
+
+# Rate groups in the order of their execution together with the quantities
+# that their closures depend on
+rate_groups = [
+    ("constant", []),
+    ("position", ["joint-position"]),
+    ("velocity", ["joint-position", "joint-velocity"]),
+    ("acceleration", ["joint-position", "joint-velocity", "joint-acceleration"])
+]
+
+
+class RateGroupPartition:
+    """
+    Split the IR schedule into named sub-schedules ("rate-groups") by their
+    dependency on the joint state: closures in the "position" group only depend
+    on joint positions, the "velocity" group additionally depends on joint
+    velocities and the "acceleration" group on joint accelerations (or any
+    other runtime input). Executing the groups in order is equivalent to the
+    original schedule. After a change of, say, the joint accelerations it
+    suffices to re-execute the "acceleration" group.
+    """
+    def __init__(self, access=None, groups=rate_groups):
+        self.groups = groups
+        quantities = {}
+        for i, (_, deps) in enumerate(groups):
+            for q in deps:
+                quantities.setdefault(q, i)
+        self.ranking = DependencyRanking(access, quantities)
+
+    def optimize(self, ir):
+        rank = self.ranking.rank(ir)
+        ir["rate-groups"] = []
+        for i, (name, deps) in enumerate(self.groups):
+            ir["rate-groups"].append({
+                "name": name,
+                "depends-on": deps,
+                "schedule": [c for c in ir["schedule"] if rank[c] == i]
+            })
+        return ir
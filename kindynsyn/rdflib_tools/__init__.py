@@ -1,6 +1,19 @@
 # SPDX-License-Identifier: MPL-2.0
-from .helpers import *
-from .sparql import *
-from .traversal import *
+from kindynsyn.utility.lazy import lazy_package
 
-__all__ = ["helpers", "sparql", "traversal"]
+__all__ = ["helpers", "layered", "parallel", "sparql", "traversal"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "helpers": [
+        "uuid_ref", "find_subject", "expand_to_named_graph", "flatten", "prepare_query",
+        "prepare_update", "prefixed", "local_name", "qname"
+    ],
+    "layered": ["LayeredStore", "LayeredGraph"],
+    "parallel": ["parse_batch", "add_batch", "install_resolver", "parse_parallel"],
+    "sparql": ["sparql_prepare", "sparql_cache"],
+    "traversal": [
+        "Direction", "OpenSet", "Expander", "BreadthFirst", "DepthFirst",
+        "traverse_nodes_with_parent_user"
+    ]
+})
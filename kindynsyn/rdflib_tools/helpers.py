@@ -3,8 +3,6 @@ import operator
 from functools import reduce
 import uuid
 import rdflib
-from rdflib.plugins.sparql.parser import parseUpdate, parseQuery
-from rdflib.plugins.sparql.algebra import translateUpdate, translateQuery
 
 
 def uuid_ref():
@@ -14,6 +12,20 @@ def uuid_ref():
     return rdflib.URIRef(uuid.uuid4().urn)
 
 
+def find_subject(g, rdf_type, properties):
+    """
+    Return a node of the given type that has all the given (predicate, object)
+    pairs or None if no such node exists. The graph factories use this to
+    return existing nodes instead of minting duplicates for the same defining
+    arguments (hash-consing). The lookup relies on the graph's own indices.
+    """
+    (p0, o0), rest = properties[0], properties[1:]
+    for s in g.subjects(p0, o0):
+        if (s, rdflib.RDF.type, rdf_type) in g and all((s, p, o) in g for p, o in rest):
+            return s
+    return None
+
+
 def expand_to_named_graph(closure, g, named_graph):
     """
     By default owlrl expands into the default graph. This functions hooks the
@@ -44,12 +56,17 @@ def prepare_query(sparql_str, base={}, initNs={}):
     """
     Pre-compile a SPARQL query so that it executes faster.
     """
+    # The SPARQL parser is expensive to import and only needed here
+    from rdflib.plugins.sparql.parser import parseQuery
+    from rdflib.plugins.sparql.algebra import translateQuery
     return translateQuery(parseQuery(sparql_str), base=base, initNs=initNs)
 
 def prepare_update(sparql_str, base={}, initNs={}):
     """
     Pre-compile a SPARQL update so that it executes faster.
     """
+    from rdflib.plugins.sparql.parser import parseUpdate
+    from rdflib.plugins.sparql.algebra import translateUpdate
     return translateUpdate(parseUpdate(sparql_str), base=base, initNs=initNs)
 
 
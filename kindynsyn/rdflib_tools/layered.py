@@ -0,0 +1,187 @@
+# SPDX-License-Identifier: MPL-2.0
+import rdflib
+import rdflib.store
+import rdflib.plugins.stores.memory
+from rdflib.namespace import NamespaceManager
+
+
+class LayeredStore(rdflib.store.Store):
+    """
+    A store that stacks a write layer on top of a read-only base store (e.g.
+    the parsed models of a robot). Reads return the union of both layers,
+    writes go to the write layer and removing triples of the base only hides
+    them. Hence, the base store must not be modified while it is layered.
+
+    The write layer is discarded in O(1) so that many syntheses can start from
+    the same base.
+    """
+    context_aware = True
+    formula_aware = False
+    graph_aware = True
+    transaction_aware = False
+
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+        # Querying the base with foreign context objects would replace the
+        # base's own ones (the memory store remembers the last one per context)
+        self.base_contexts = {c.identifier: c for c in base.contexts()}
+        self.discard()
+
+    def discard(self):
+        """
+        Discard the write layer
+        """
+        self.top = rdflib.plugins.stores.memory.Memory()
+        self.shadowed = set()   # triples of the write layer that are also in the base
+        self.removed = {}       # triple -> identifiers of base contexts that hide it
+        self.graphs = {}        # identifier -> context bound to this store
+
+    def graph(self, identifier):
+        if identifier not in self.graphs:
+            self.graphs[identifier] = rdflib.Graph(store=self, identifier=identifier)
+        return self.graphs[identifier]
+
+    def in_base(self, triple, context=None):
+        if context is None:
+            return any(True for _ in self.base.triples(triple, None))
+
+        base_ctx = self.base_contexts.get(context.identifier)
+        if base_ctx is None or context.identifier in self.removed.get(triple, ()):
+            return False
+        return any(True for _ in self.base.triples(triple, base_ctx))
+
+    def add(self, triple, context, quoted=False):
+        hidden = self.removed.get(triple)
+        if hidden and context is not None and context.identifier in hidden:
+            hidden.discard(context.identifier)
+            return
+
+        if context is not None and self.in_base(triple, context):
+            return
+
+        self.top.add(triple, context, quoted)
+        if self.in_base(triple):
+            self.shadowed.add(triple)
+
+    def remove(self, triple_pattern, context=None):
+        if context is None:
+            base_ctx = None
+        else:
+            base_ctx = self.base_contexts.get(context.identifier)
+
+        if context is None or base_ctx is not None:
+            for t, cs in list(self.base.triples(triple_pattern, base_ctx)):
+                ids = [c.identifier for c in cs] if context is None else [context.identifier]
+                self.removed.setdefault(t, set()).update(ids)
+
+        matched = [t for t, _ in self.top.triples(triple_pattern, context)]
+        self.top.remove(triple_pattern, context)
+        for t in matched:
+            if t in self.shadowed and not any(True for _ in self.top.triples(t, None)):
+                self.shadowed.discard(t)
+
+    def visible(self, triple):
+        """
+        Return whether any base context still contains the triple
+        """
+        hidden = self.removed.get(triple)
+        if not hidden:
+            return True
+        return any(c.identifier not in hidden for c in self.base.contexts(triple))
+
+    def triple_contexts(self, triple):
+        hidden = self.removed.get(triple, ())
+        for c in self.base.contexts(triple):
+            if c.identifier not in hidden:
+                yield self.graph(c.identifier)
+        for c in self.top.contexts(triple):
+            yield self.graph(c.identifier)
+
+    def triples(self, triple_pattern, context=None):
+        if context is not None:
+            # Within a context the layers are disjoint (see add)
+            base_ctx = self.base_contexts.get(context.identifier)
+            if base_ctx is not None:
+                for t, _ in self.base.triples(triple_pattern, base_ctx):
+                    if context.identifier not in self.removed.get(t, ()):
+                        yield t, self.triple_contexts(t)
+            for t, _ in self.top.triples(triple_pattern, context):
+                yield t, self.triple_contexts(t)
+            return
+
+        for t, _ in self.base.triples(triple_pattern, None):
+            if t in self.shadowed or self.visible(t):
+                yield t, self.triple_contexts(t)
+        for t, _ in self.top.triples(triple_pattern, None):
+            if t not in self.shadowed:
+                yield t, self.triple_contexts(t)
+
+    def __len__(self, context=None):
+        if self.removed:
+            return sum(1 for _ in self.triples((None, None, None), context))
+
+        if context is None:
+            return self.base.__len__() + self.top.__len__() - len(self.shadowed)
+
+        base_ctx = self.base_contexts.get(context.identifier)
+        base_len = 0 if base_ctx is None else self.base.__len__(context=base_ctx)
+        return base_len + self.top.__len__(context=context)
+
+    def contexts(self, triple=None):
+        if triple is not None and triple != (None, None, None):
+            return self.triple_contexts(triple)
+
+        ids = list(self.base_contexts)
+        ids += [c.identifier for c in self.top.contexts() if c.identifier not in self.base_contexts]
+        return (self.graph(i) for i in ids)
+
+    def add_graph(self, graph):
+        self.top.add_graph(graph)
+
+    def remove_graph(self, graph):
+        self.remove((None, None, None), graph)
+        self.top.remove_graph(graph)
+
+    def bind(self, prefix, namespace, override=True):
+        self.top.bind(prefix, namespace, override)
+
+    def namespace(self, prefix):
+        res = self.top.namespace(prefix)
+        return res if res is not None else self.base.namespace(prefix)
+
+    def prefix(self, namespace):
+        res = self.top.prefix(namespace)
+        return res if res is not None else self.base.prefix(namespace)
+
+    def namespaces(self):
+        top = dict(self.top.namespaces())
+        yield from top.items()
+        bound = set(top.values())
+        for prefix, namespace in self.base.namespaces():
+            if prefix not in top and namespace not in bound:
+                yield prefix, namespace
+
+
+class LayeredGraph(rdflib.ConjunctiveGraph):
+    """
+    A conjunctive graph that layers the synthesis' triples on top of a loaded,
+    read-only conjunctive graph (see LayeredStore). Many solvers can be
+    synthesized from one load by discarding the written triples in-between:
+
+        g = LayeredGraph(base)
+        ... synthesize ...
+        g.discard()
+    """
+    def __init__(self, base):
+        super().__init__(store=LayeredStore(base.store),
+                         identifier=base.default_context.identifier)
+
+    def discard(self):
+        """
+        Discard all changes to the base graph
+        """
+        self.store.discard()
+        # The namespace manager caches the QNames that it computed with the
+        # prefixes that it bound in the write layer (e.g. "ns1")
+        self.namespace_manager = NamespaceManager(self, self._bind_namespaces)
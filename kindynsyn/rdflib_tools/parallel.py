@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import array
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import rdflib
+from kindynsyn.utility import resolver
+
+
+def parse_batch(source, format="json-ld"):
+    """
+    Parse a document into a new graph and return its content as a compact
+    batch that is cheap to transfer between processes:
+    - the distinct terms and the identifiers of the named graphs (None for
+      the default graph)
+    - the quads as a flat array of indices into the terms
+    - the namespace bindings that the document introduced
+    """
+    g = rdflib.ConjunctiveGraph()
+    defaults = set(g.namespaces())
+    g.parse(source, format=format)
+
+    index = {}      # term -> position in the terms
+    quads = array.array("I")
+    for c in g.contexts():
+        ctx = index.setdefault(None if c == g.default_context else c.identifier, len(index))
+        for triple in c:
+            quads.extend([index.setdefault(t, len(index)) for t in triple])
+            quads.append(ctx)
+
+    return list(index), quads, [n for n in g.namespaces() if n not in defaults]
+
+
+def add_batch(g, batch):
+    """
+    Add a batch (see parse_batch) to a conjunctive graph
+    """
+    terms, quads, namespaces = batch
+
+    contexts = {i: g.default_context if terms[i] is None else g.get_context(terms[i])
+                for i in set(quads[3::4])}
+    nodes = [terms[i] for i in quads]
+    g.addN(zip(nodes[0::4], nodes[1::4], nodes[2::4], [contexts[i] for i in quads[3::4]]))
+
+    for prefix, namespace in namespaces:
+        g.bind(prefix, namespace)
+
+
+def install_resolver(url_map):
+    if url_map is not None:
+        resolver.install(resolver.IriToFileResolver(url_map))
+
+
+def parse_parallel(g, sources, format="json-ld", url_map=None, max_workers=None):
+    """
+    Parse the documents in worker processes and add them to the conjunctive
+    graph in the given order. Each document ends up in the same named graph
+    as with "g.parse". The workers resolve IRIs with the url_map (see
+    kindynsyn.utility.resolver). Without multiple documents and processors the
+    documents are parsed in-process.
+    """
+    workers = min(len(sources), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for source in sources:
+            g.parse(source, format=format)
+        return g
+
+    with ProcessPoolExecutor(workers, initializer=install_resolver, initargs=(url_map,)) as pool:
+        for batch in pool.map(parse_batch, sources, itertools.repeat(format)):
+            add_batch(g, batch)
+
+    return g
@@ -1,9 +1,11 @@
 # SPDX-License-Identifier: MPL-2.0
 import os
-from rdflib.plugins.sparql import prepareQuery, prepareUpdate
 
 
 def sparql_prepare(filename, data):
+    # The SPARQL parser is only imported once the first query is prepared
+    from rdflib.plugins.sparql import prepareQuery, prepareUpdate
+
     _, extension = os.path.splitext(filename)
 
     if extension == ".ru":
@@ -3,7 +3,7 @@ import typing
 import enum
 import collections
 import itertools
-import rdflib.plugins.sparql
+import rdflib
 
 class Direction(enum.Enum):
     IN = 1
@@ -1,6 +1,14 @@
 # SPDX-License-Identifier: MPL-2.0
-from .graph_factories import *
-from .steps import *
-from .synthesizer import *
+from kindynsyn.utility.lazy import lazy_package
 
-__all__ = ["graph_factories", "steps", "synthesizer"]
+__all__ = ["graph_factories", "steps", "synthesizer", "shortcuts"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "synthesizer": [
+        "SweepDirection", "Dispatcher", "Traverser", "Step", "SweepConfig", "SolverConfig",
+        "ConditionCache", "CompiledExpander", "TraverserRegistry", "TreeExpander",
+        "SolverSynthesizer", "Provenance"
+    ],
+    "shortcuts": ["SHORTCUT_GRAPH", "Shortcuts"]
+})
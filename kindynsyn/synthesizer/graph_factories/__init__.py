@@ -1,8 +1,5 @@
 # SPDX-License-Identifier: MPL-2.0
-from .algorithm import *
-from .spatial_relations import *
-from .dynamics import *
-from .kinematic_chain import *
+from kindynsyn.utility.lazy import lazy_package
 
 __all__ = [
     "algorithm",
@@ -10,3 +7,11 @@ __all__ = [
     "dynamics",
     "kinematic_chain"
 ]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "algorithm": ["Algorithm"],
+    "spatial_relations": ["SpatialRelations", "SpatialRelationsCoordinates", "SpatialRelationsWithCoordinates"],
+    "dynamics": ["DynamicsEntities", "DynamicsEntitiesCoordinates", "DynamicsEntitiesWithCoordinates"],
+    "kinematic_chain": ["KinematicChainState", "KinematicChainOperators"]
+})
@@ -9,6 +9,10 @@ class Algorithm:
         self.g = g
 
     def schedule(self, operation_list, name=None):
+        # The factories return the same operation for the same arguments so
+        # that an operation may have been contributed more than once
+        operation_list = list(dict.fromkeys(operation_list))
+
         trigger_chain_id = BNode()
         collection.Collection(self.g, trigger_chain_id, operation_list)
 
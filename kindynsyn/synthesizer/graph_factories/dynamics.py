@@ -2,7 +2,7 @@
 from rdflib import collection, BNode, Literal, RDF
 from kindynsyn.namespaces import GEOM_ENT, GEOM_REL, GEOM_COORD, RBDYN_ENT, \
     RBDYN_COORD, RBDYN_OP, QUDT_SCHEMA, QUDT_QKIND, QUDT_UNIT
-from kindynsyn.rdflib_tools.helpers import uuid_ref
+from kindynsyn.rdflib_tools.helpers import uuid_ref, find_subject
 
 
 class DynamicsEntities:
@@ -10,6 +10,9 @@ class DynamicsEntities:
         self.g = g
 
     def wrench(self, acts_on, reference_point):
+        # In contrast to motions, wrenches are not shared: several contributions
+        # (e.g. inertial and propagated wrenches) act on the same body at the
+        # same reference point
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], RBDYN_ENT["Wrench"]))
         self.g.add((id_, RBDYN_ENT["acts-on"], acts_on))
@@ -91,6 +94,12 @@ class DynamicsEntitiesCoordinates:
         assert QUDT_UNIT["N-M"] in self.g[to : QUDT_SCHEMA["unit"]]
         assert QUDT_UNIT["N"] in self.g[to : QUDT_SCHEMA["unit"]]
 
+        id_ = find_subject(self.g, RBDYN_OP["AssignWrench"], [
+            (RBDYN_OP["from"], frm),
+            (RBDYN_OP["to"], to)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], RBDYN_OP["AssignWrench"]))
         self.g.add((id_, RBDYN_OP["from"], frm))
@@ -108,6 +117,13 @@ class DynamicsEntitiesCoordinates:
         assert QUDT_UNIT["N-M"] in self.g[inverse : QUDT_SCHEMA["unit"]]
         assert QUDT_UNIT["N"] in self.g[inverse : QUDT_SCHEMA["unit"]]
 
+        id_ = find_subject(self.g, RBDYN_OP["InvertWrench"], [
+            (RBDYN_OP["original"], original),
+            (RBDYN_OP["inverse"], inverse),
+            (RBDYN_OP["number-of-wrenches"], Literal(number_of_wrenches))])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], RBDYN_OP["InvertWrench"]))
         self.g.add((id_, RBDYN_OP["original"], original))
@@ -192,6 +208,13 @@ class DynamicsEntitiesCoordinates:
         assert QUDT_UNIT["N-M"] in self.g[wrench : QUDT_SCHEMA["unit"]]
         assert QUDT_UNIT["N"] in self.g[wrench : QUDT_SCHEMA["unit"]]
 
+        id_ = find_subject(self.g, RBDYN_OP["AccelerationTwistToWrenchWithRigidBodyInertia"], [
+            (RBDYN_OP["rigid-body-inertia"], rigid_body_inertia),
+            (RBDYN_OP["acceleration-twist"], acceleration_twist),
+            (RBDYN_OP["wrench"], wrench)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], RBDYN_OP["AccelerationTwistToWrenchWithRigidBodyInertia"]))
         self.g.add((id_, RBDYN_OP["rigid-body-inertia"], rigid_body_inertia))
@@ -214,6 +237,13 @@ class DynamicsEntitiesCoordinates:
         assert QUDT_UNIT["N-M"] in self.g[wrench : QUDT_SCHEMA["unit"]]
         assert QUDT_UNIT["N"] in self.g[wrench : QUDT_SCHEMA["unit"]]
 
+        id_ = find_subject(self.g, RBDYN_OP["InertialWrench"], [
+            (RBDYN_OP["rigid-body-inertia"], rigid_body_inertia),
+            (RBDYN_OP["velocity-twist"], velocity_twist),
+            (RBDYN_OP["wrench"], wrench)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], RBDYN_OP["InertialWrench"]))
         self.g.add((id_, RBDYN_OP["rigid-body-inertia"], rigid_body_inertia))
@@ -2,7 +2,7 @@
 from rdflib import Literal, RDF
 from kindynsyn.namespaces import GEOM_ENT, GEOM_REL, GEOM_COORD, RBDYN_COORD, \
     KC_ENT, KC_STAT, KC_OP, QUDT_SCHEMA, QUDT_QKIND, QUDT_UNIT
-from kindynsyn.rdflib_tools.helpers import uuid_ref
+from kindynsyn.rdflib_tools.helpers import uuid_ref, find_subject
 
 
 class KinematicChainState:
@@ -43,6 +43,13 @@ class KinematicChainOperators:
             self.g.value(pose, GEOM_COORD["of-pose"] / GEOM_REL["with-respect-to"])}
         assert pose_frames == set(self.g[joint : KC_ENT["between-attachments"]])
 
+        id_ = find_subject(self.g, KC_OP["JointPositionToPose"], [
+            (KC_OP["joint"], joint),
+            (KC_OP["joint-position"], joint_position),
+            (KC_OP["pose"], pose)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], KC_OP["JointPositionToPose"]))
         self.g.add((id_, KC_OP["joint"], joint))
@@ -54,6 +61,13 @@ class KinematicChainOperators:
         assert joint == self.g.value(joint_velocity, KC_STAT["of-joint"])
         assert self.g.value(velocity_twist, GEOM_COORD["as-seen-by"]) in set(self.g[joint : KC_ENT["between-attachments"]])
 
+        id_ = find_subject(self.g, KC_OP["JointVelocityToVelocityTwist"], [
+            (KC_OP["joint"], joint),
+            (KC_OP["joint-velocity"], joint_velocity),
+            (KC_OP["velocity-twist"], velocity_twist)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], KC_OP["JointVelocityToVelocityTwist"]))
         self.g.add((id_, KC_OP["joint"], joint))
@@ -65,6 +79,13 @@ class KinematicChainOperators:
         assert joint == self.g.value(joint_acceleration, KC_STAT["of-joint"])
         assert self.g.value(acceleration_twist, GEOM_COORD["as-seen-by"]) in set(self.g[joint : KC_ENT["between-attachments"]])
 
+        id_ = find_subject(self.g, KC_OP["JointAccelerationToAccelerationTwist"], [
+            (KC_OP["joint"], joint),
+            (KC_OP["joint-acceleration"], joint_acceleration),
+            (KC_OP["acceleration-twist"], acceleration_twist)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], KC_OP["JointAccelerationToAccelerationTwist"]))
         self.g.add((id_, KC_OP["joint"], joint))
@@ -78,6 +99,14 @@ class KinematicChainOperators:
         assert number_of_wrenches <= self.g.value(joint_force, KC_STAT["number-of-elements"])
         assert number_of_wrenches <= self.g.value(wrench, RBDYN_COORD["number-of-wrenches"])
 
+        id_ = find_subject(self.g, KC_OP["JointForceFromWrench"], [
+            (KC_OP["joint"], joint),
+            (KC_OP["number-of-wrenches"], Literal(number_of_wrenches)),
+            (KC_OP["joint-force"], joint_force),
+            (KC_OP["wrench"], wrench)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], KC_OP["JointForceFromWrench"]))
         self.g.add((id_, KC_OP["joint"], joint))
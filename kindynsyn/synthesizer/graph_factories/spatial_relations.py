@@ -2,7 +2,7 @@
 from rdflib import collection, BNode, Literal, RDF
 from kindynsyn.namespaces import GEOM_ENT, GEOM_REL, GEOM_COORD, GEOM_OP, \
     QUDT_SCHEMA, QUDT_QKIND, QUDT_UNIT
-from kindynsyn.rdflib_tools.helpers import uuid_ref
+from kindynsyn.rdflib_tools.helpers import uuid_ref, find_subject
 
 
 class SpatialRelations:
@@ -13,6 +13,12 @@ class SpatialRelations:
         assert GEOM_ENT["Frame"] in self.g[of : RDF["type"]]
         assert GEOM_ENT["Frame"] in self.g[with_respect_to : RDF["type"]]
 
+        id_ = find_subject(self.g, GEOM_REL["Pose"], [
+            (GEOM_REL["of"], of),
+            (GEOM_REL["with-respect-to"], with_respect_to)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_REL["Pose"]))
         self.g.add((id_, GEOM_REL["of"], of))
@@ -26,6 +32,13 @@ class SpatialRelations:
         assert GEOM_ENT["RigidBody"] in self.g[with_respect_to : RDF["type"]]
         assert GEOM_ENT["Point"] in self.g[reference_point : RDF["type"]]
 
+        id_ = find_subject(self.g, GEOM_REL["VelocityTwist"], [
+            (GEOM_REL["of"], of),
+            (GEOM_REL["with-respect-to"], with_respect_to),
+            (GEOM_REL["reference-point"], reference_point)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_REL["VelocityTwist"]))
         self.g.add((id_, GEOM_REL["of"], of))
@@ -40,6 +53,13 @@ class SpatialRelations:
         assert GEOM_ENT["RigidBody"] in self.g[with_respect_to : RDF["type"]]
         assert GEOM_ENT["Point"] in self.g[reference_point : RDF["type"]]
 
+        id_ = find_subject(self.g, GEOM_REL["AccelerationTwist"], [
+            (GEOM_REL["of"], of),
+            (GEOM_REL["with-respect-to"], with_respect_to),
+            (GEOM_REL["reference-point"], reference_point)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_REL["AccelerationTwist"]))
         self.g.add((id_, GEOM_REL["of"], of))
@@ -55,6 +75,14 @@ class SpatialRelationsCoordinates:
         self.g = g
 
     def pose(self, of_pose, as_seen_by, orientation=None, position=None):
+        # Coordinates with literal values are never shared
+        if not orientation and not position:
+            id_ = find_subject(self.g, GEOM_COORD["PoseCoordinate"], [
+                (GEOM_COORD["of-pose"], of_pose),
+                (GEOM_COORD["as-seen-by"], as_seen_by)])
+            if id_:
+                return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_COORD["PoseCoordinate"]))
         self.g.add((id_, RDF["type"], GEOM_COORD["PoseReference"]))
@@ -80,6 +108,14 @@ class SpatialRelationsCoordinates:
         return id_
 
     def velocity_twist(self, of_velocity, as_seen_by, angular_velocity=None, linear_velocity=None):
+        # Coordinates with literal values are never shared
+        if not angular_velocity and not linear_velocity:
+            id_ = find_subject(self.g, GEOM_COORD["VelocityTwistCoordinate"], [
+                (GEOM_COORD["of-velocity"], of_velocity),
+                (GEOM_COORD["as-seen-by"], as_seen_by)])
+            if id_:
+                return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_COORD["VelocityTwistCoordinate"]))
         self.g.add((id_, RDF["type"], GEOM_COORD["VelocityReference"]))
@@ -105,6 +141,14 @@ class SpatialRelationsCoordinates:
         return id_
 
     def acceleration_twist(self, of_acceleration, as_seen_by, angular_acceleration=None, linear_acceleration=None):
+        # Coordinates with literal values are never shared
+        if not angular_acceleration and not linear_acceleration:
+            id_ = find_subject(self.g, GEOM_COORD["AccelerationTwistCoordinate"], [
+                (GEOM_COORD["of-acceleration"], of_acceleration),
+                (GEOM_COORD["as-seen-by"], as_seen_by)])
+            if id_:
+                return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_COORD["AccelerationTwistCoordinate"]))
         self.g.add((id_, RDF["type"], GEOM_COORD["AccelerationReference"]))
@@ -131,6 +175,13 @@ class SpatialRelationsCoordinates:
 
 
     def compose_pose(self, in1, in2, composite):
+        id_ = find_subject(self.g, GEOM_OP["ComposePose"], [
+            (GEOM_OP["in1"], in1),
+            (GEOM_OP["in2"], in2),
+            (GEOM_OP["composite"], composite)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["ComposePose"]))
         self.g.add((id_, GEOM_OP["in1"], in1))
@@ -139,6 +190,13 @@ class SpatialRelationsCoordinates:
         return id_
 
     def add_velocity_twist(self, in1, in2, composite):
+        id_ = find_subject(self.g, GEOM_OP["AddVelocityTwist"], [
+            (GEOM_OP["in1"], in1),
+            (GEOM_OP["in2"], in2),
+            (GEOM_OP["composite"], composite)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["AddVelocityTwist"]))
         self.g.add((id_, GEOM_OP["in1"], in1))
@@ -147,6 +205,13 @@ class SpatialRelationsCoordinates:
         return id_
 
     def add_acceleration_twist(self, in1, in2, composite):
+        id_ = find_subject(self.g, GEOM_OP["AddAccelerationTwist"], [
+            (GEOM_OP["in1"], in1),
+            (GEOM_OP["in2"], in2),
+            (GEOM_OP["composite"], composite)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["AddAccelerationTwist"]))
         self.g.add((id_, GEOM_OP["in1"], in1))
@@ -155,6 +220,13 @@ class SpatialRelationsCoordinates:
         return id_
 
     def transform_velocity_twist_to_distal(self, pose, frm, to):
+        id_ = find_subject(self.g, GEOM_OP["TransformVelocityTwistToDistal"], [
+            (GEOM_OP["pose"], pose),
+            (GEOM_OP["from"], frm),
+            (GEOM_OP["to"], to)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["TransformVelocityTwistToDistal"]))
         self.g.add((id_, GEOM_OP["pose"], pose))
@@ -172,6 +244,13 @@ class SpatialRelationsCoordinates:
         assert QUDT_UNIT["RAD-PER-SEC"] in self.g[to : QUDT_SCHEMA["unit"]]
         assert QUDT_UNIT["M-PER-SEC"] in self.g[to : QUDT_SCHEMA["unit"]]
 
+        id_ = find_subject(self.g, GEOM_OP["RotateVelocityTwistToProximalWithPose"], [
+            (GEOM_OP["pose"], pose),
+            (GEOM_OP["from"], frm),
+            (GEOM_OP["to"], to)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["RotateVelocityTwistToProximalWithPose"]))
         self.g.add((id_, GEOM_OP["pose"], pose))
@@ -180,6 +259,15 @@ class SpatialRelationsCoordinates:
         return id_
 
     def transform_acceleration_twist_to_distal(self, pose, absolute_velocity, relative_velocity, frm, to):
+        id_ = find_subject(self.g, GEOM_OP["TransformAccelerationTwistToDistal"], [
+            (GEOM_OP["pose"], pose),
+            (GEOM_OP["absolute-velocity"], absolute_velocity),
+            (GEOM_OP["relative-velocity"], relative_velocity),
+            (GEOM_OP["from"], frm),
+            (GEOM_OP["to"], to)])
+        if id_:
+            return id_
+
         id_ = uuid_ref()
         self.g.add((id_, RDF["type"], GEOM_OP["TransformAccelerationTwistToDistal"]))
         self.g.add((id_, GEOM_OP["pose"], pose))
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MPL-2.0
+import rdflib
+from kindynsyn.namespaces import GEOM_ENT, KC_ENT, KC_NAV
+from kindynsyn.synthesizer.steps.queries import shortcut_queries, shortcut_files
+
+# The named graph that contains the shortcut edges
+SHORTCUT_GRAPH = rdflib.URIRef("https://comp-rob2b.github.io/kindyngen/navigation")
+
+
+class Shortcuts:
+    """
+    Materialize the multi-hop paths that the expanders and queries navigate
+    over and over as direct edges (see KC_NAV) in a separate named graph:
+    - body-of-frame: ^geom-ent:simplices
+    - joint-of-frame: ^kc-ent:between-attachments
+    - sibling-frame: ^kc-ent:between-attachments / kc-ent:between-attachments
+      (excluding the frame itself)
+    - next-segment-frame: body-of-frame / geom-ent:simplices / sibling-frame
+      (excluding the frame itself; the expansion of q_expand)
+
+    The edges are derived from the structural triples (geom-ent:simplices and
+    kc-ent:between-attachments). "update" materializes them again whenever
+    those triples changed. The SolverSynthesizer calls it before each
+    synthesis and then executes the shortcut variants of the expander and
+    condition queries (see shortcut_queries). Steps load the variants of their
+    query files via the "loader".
+
+    If the edges have already been materialized (e.g. in the base of a
+    LayeredGraph that many syntheses share), the "structure" that they were
+    derived from avoids materializing them again.
+    """
+    def __init__(self, g, structure=None):
+        self.g = g
+        self.queries = shortcut_queries
+        self.structure = structure
+
+    def structural_triples(self):
+        return frozenset(self.g.triples((None, GEOM_ENT["simplices"], None))) \
+            | frozenset(self.g.triples((None, KC_ENT["between-attachments"], None)))
+
+    def valid(self):
+        """
+        Return whether the shortcut edges reflect the current structure
+        """
+        return self.structure is not None and self.structure == self.structural_triples()
+
+    def update(self):
+        """
+        Materialize the shortcut edges unless they are still valid. Return
+        whether they have been materialized.
+        """
+        structure = self.structural_triples()
+        if structure == self.structure:
+            return False
+
+        ctx = self.g.get_context(SHORTCUT_GRAPH)
+        ctx.remove((None, None, None))
+        self.g.addN((s, p, o, ctx) for s, p, o in self.edges(structure))
+        self.structure = structure
+        return True
+
+    @staticmethod
+    def edges(structure):
+        frames = {}         # body -> frames
+        bodies = {}         # frame -> bodies
+        attachments = {}    # joint -> frames
+        joints = {}         # frame -> joints
+        for s, p, o in structure:
+            if p == GEOM_ENT["simplices"]:
+                frames.setdefault(s, []).append(o)
+                bodies.setdefault(o, []).append(s)
+            else:
+                attachments.setdefault(s, []).append(o)
+                joints.setdefault(o, []).append(s)
+
+        siblings = {}       # frame -> siblings
+        for frame, js in joints.items():
+            siblings[frame] = {sib for j in js for sib in attachments[j] if sib != frame}
+
+        res = set()
+        for frame, bs in bodies.items():
+            res.update((frame, KC_NAV["body-of-frame"], b) for b in bs)
+            for prox in {f for b in bs for f in frames[b] if f != frame}:
+                res.update((frame, KC_NAV["next-segment-frame"], child)
+                           for child in siblings.get(prox, ()))
+        for frame, js in joints.items():
+            res.update((frame, KC_NAV["joint-of-frame"], j) for j in js)
+            res.update((frame, KC_NAV["sibling-frame"], sib) for sib in siblings[frame])
+        return res
+
+    def loader(self, load):
+        """
+        Return a query loader that loads the shortcut variants of query files
+        (see shortcut_files) instead of the original ones.
+        """
+        def load_shortcut(file):
+            return load(shortcut_files.get(file, file))
+        return load_shortcut
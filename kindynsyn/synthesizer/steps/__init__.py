@@ -1,10 +1,5 @@
 # SPDX-License-Identifier: MPL-2.0
-from .queries import *
-from .chain_index import *
-from .joint import *
-from .motion import *
-from .inertia import *
-from .force import *
+from kindynsyn.utility.lazy import lazy_package
 
 __all__ = [
     "queries",
@@ -14,3 +9,24 @@ __all__ = [
     "inertia",
     "force"
 ]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "queries": [
+        "q_expand", "q_root", "q_leaf", "q_joint_motion", "q_expand_shortcut", "q_root_shortcut",
+        "q_leaf_shortcut", "q_joint_motion_shortcut", "shortcut_queries", "shortcut_files"
+    ],
+    "chain_index": ["ChainIndexState", "ChainIndexStep"],
+    "joint": ["JointState", "JointStep", "JointDynamicsState", "JointDynamicsStep"],
+    "motion": [
+        "is_zero_twist", "PositionPropagationState", "PositionPropagationStep",
+        "PositionAccumulationState", "PositionAccumulationStep", "VelocityPropagationState",
+        "VelocityPropagationStep", "AccelerationPropagationState", "AccelerationPropagationStep"
+    ],
+    "inertia": ["RigidBodyInertiaState", "skew", "skew_batch", "translate_inertia", "RigidBodyInertiaStep"],
+    "force": [
+        "InertialForceState", "InertialForceStep", "QuasiStaticInertialForcePropagationState",
+        "QuasiStaticInertialForcePropagationStep", "QuasiStaticExternalForcePropagationState",
+        "QuasiStaticExternalForcePropagationStep"
+    ]
+})
@@ -21,6 +21,33 @@ def skew(v):
                      [ v[2],  0.0 , -v[0]],
                      [-v[1],  v[0],  0.0 ]])
 
+def skew_batch(v):
+    """
+    Skew-symmetric matrices for a batch of vectors: (N, 3) -> (N, 3, 3)
+    """
+    s = np.zeros((len(v), 3, 3))
+    s[:, 0, 1] = -v[:, 2]
+    s[:, 0, 2] =  v[:, 1]
+    s[:, 1, 0] =  v[:, 2]
+    s[:, 1, 2] = -v[:, 0]
+    s[:, 2, 0] = -v[:, 1]
+    s[:, 2, 1] =  v[:, 0]
+    return s
+
+def translate_inertia(mass, com, m_rot_com):
+    """
+    Translate a batch of N rigid-body inertias from their centre of mass to
+    the origin of the frame in which the centre of mass is expressed:
+    - mass (N,) remains the same
+    - moment of mass (N, 3): m c
+    - rotational inertia (N, 3, 3): I_c + m cx cx^T
+    """
+    cx = skew_batch(com)
+    moment_of_mass = mass[:, None] * com
+    m_rot = m_rot_com + np.einsum("n,nij,nkj->nik", mass, cx, cx)
+    return moment_of_mass, m_rot
+
+
 class RigidBodyInertiaStep:
     q_inertia = """
     SELECT ?inertia WHERE {
@@ -28,11 +55,19 @@ class RigidBodyInertiaStep:
     }
     """
 
-    def __init__(self, g, load, algo, dyn):
+    def __init__(self, g, load, algo, dyn, batched=False):
+        """
+        In batched mode the inertias of all links are queried at once and
+        translated in a single vectorized computation (on first use). The
+        per-node configuration then only looks up the result.
+        """
         self.g = g
         self.dyn = dyn
         self.sel_inr = load("select_inertia.rq")
+        self.sel_inr_crd = load("select_inertia_coordinates.rq")
         self.algo = algo
+        self.batched = batched
+        self.batch = None
 
     def traverse(self):
         return Traverser(
@@ -40,7 +75,31 @@ class RigidBodyInertiaStep:
             node=[Dispatcher(None, self.configure, None)]
         )
 
+    def configure_batch(self):
+        rows = list(self.g.query(self.sel_inr_crd))
+        var = ["mass", "com_x", "com_y", "com_z",
+               "ixx", "iyy", "izz", "ixy", "ixz", "iyz"]
+        val = np.array([[float(r[v]) for v in var] for r in rows]).reshape(-1, len(var))
+
+        mass = val[:, 0]
+        com = val[:, 1:4]
+        ixx, iyy, izz, ixy, ixz, iyz = val[:, 4:].T
+        m_rot_com = np.stack([np.stack([ixx, ixy, ixz], axis=-1),
+                              np.stack([ixy, iyy, iyz], axis=-1),
+                              np.stack([ixz, iyz, izz], axis=-1)], axis=1)
+
+        moment_of_mass, m_rot = translate_inertia(mass, com, m_rot_com)
+
+        self.batch = {}
+        for i, r in enumerate(rows):
+            self.batch[r["frame"]] = (r["rbi"], r["tx_com"], mass[i],
+                                      moment_of_mass[i], m_rot[i])
+
     def configure(self, state, node):
+        if self.batched:
+            self.configure_batched(state, node)
+            return
+
         idx = state[node][ChainIndexState]
 
         inertia = list(self.g.query(self.sel_inr, initBindings={
@@ -89,3 +148,24 @@ class RigidBodyInertiaStep:
         state[node][RigidBodyInertiaState] = s
 
         self.algo["data"].extend([s.m_scr_prox])
+
+    def configure_batched(self, state, node):
+        idx = state[node][ChainIndexState]
+
+        if self.batch is None:
+            self.configure_batch()
+
+        rbi, tx_com, mass, moment_of_mass_prox, m_rot_prox = self.batch[idx.frm_prox]
+
+        m_scr_prox = self.dyn.rigid_body_inertia(of=idx.bdy, as_seen_by=idx.frm_prox,
+                moment_of_inertia=[m_rot_prox[0, 0], m_rot_prox[1, 1], m_rot_prox[2, 2]],
+                product_of_inertia=[m_rot_prox[0, 1], m_rot_prox[0, 2], m_rot_prox[1, 2]],
+                moment_of_mass=list(moment_of_mass_prox), mass=mass)
+
+        s = RigidBodyInertiaState()
+        s.m_scr_com = rbi
+        s.r_com = tx_com
+        s.m_scr_prox = m_scr_prox
+        state[node][RigidBodyInertiaState] = s
+
+        self.algo["data"].extend([s.m_scr_prox])
@@ -1,11 +1,30 @@
 # SPDX-License-Identifier: MPL-2.0
 from dataclasses import dataclass, field
-from rdflib import URIRef
+from rdflib import URIRef, collection
+from kindynsyn.namespaces import GEOM_COORD, GEOM_REL
 from kindynsyn.synthesizer.synthesizer import Traverser, Dispatcher
 from kindynsyn.synthesizer.steps import ChainIndexState, JointState, q_expand, \
     q_root
 
 
+def is_zero_twist(g, twist, of_twist, angular, linear):
+    """
+    A twist is provably zero if it relates a body to itself or if all its
+    coordinates are literal zeros.
+    """
+    rel = g.value(twist, GEOM_COORD[of_twist])
+    if rel is not None and g.value(rel, GEOM_REL["of"]) == g.value(rel, GEOM_REL["with-respect-to"]):
+        return True
+
+    values = []
+    for p in [angular, linear]:
+        node = g.value(twist, GEOM_COORD[p])
+        if node is None:
+            return False
+        values.extend(v.value for v in collection.Collection(g, node))
+    return all(v == 0 for v in values)
+
+
 @dataclass
 class PositionPropagationState:
     x_seg: URIRef | None = field(default=None)           # Pose across segment (this.frm_prox w.r.t. parent.frm_prox)
@@ -83,7 +102,6 @@ class PositionAccumulationStep:
         self.geom = geom
         self.geom_coord = geom_coord
         self.algo = algo
-        self.sel_tf = load("select_transform_from_frames.rq")
 
     def traverse(self):
         return Traverser(
@@ -95,17 +113,8 @@ class PositionAccumulationStep:
     def configure(self, state, node):
         idx = state[node][ChainIndexState]
 
-        res = list(self.g.query(self.sel_tf, initBindings={
-            "of_frame": idx.frm_prox,
-            "with_respect_to_frame": idx.frm_root
-        }))
-
-        if res:
-            # The transform already exists (use that one)
-            x_tot = res[0]["tf"]
-        else:
-            # Create a new transform for the root
-            x_tot = self.geom.pose(of=idx.frm_prox, with_respect_to=idx.frm_root)
+        # Returns the transform if it already exists (e.g. for the root)
+        x_tot = self.geom.pose(of=idx.frm_prox, with_respect_to=idx.frm_root)
 
         s = PositionAccumulationState()
         s.x_tot = x_tot
@@ -132,14 +141,19 @@ class VelocityPropagationState:
     xd_tot: URIRef | None = field(default=None)          # Velocity of segment's body w.r.t. root
     # Intermediate
     xd_tot_par_tf: URIRef | None = field(default=None)   # Parent link's velocity w.r.t. root transformed to segment's proximal link frame
+    xd_tot_zero: bool = field(default=False)            # Velocity w.r.t. root is known to be zero
 
 
 class VelocityPropagationStep:
     """
     Xd_{i+1} = {i+1}X_i Xd_i + S_i qd_i
+
+    For a fixed base the root's velocity is zero so that the first segment's
+    velocity is that of its joint: Xd_1 = S_0 qd_0
     """
-    def __init__(self, g, load, algo, geom, geom_coord, kc):
+    def __init__(self, g, load, algo, geom, geom_coord, kc, fixed_base=False):
         self.g = g
+        self.fixed_base = fixed_base
         self.geom = geom
         self.geom_coord = geom_coord
         self.algo = algo
@@ -170,6 +184,11 @@ class VelocityPropagationStep:
 
         s = VelocityPropagationState()
         s.xd_tot = xd_tot
+        if self.fixed_base:
+            # Literal coordinates must not contradict the fixed base
+            assert self.g.value(xd_tot, GEOM_COORD["angular-velocity"]) is None \
+                or is_zero_twist(self.g, xd_tot, "of-velocity", "angular-velocity", "linear-velocity")
+            s.xd_tot_zero = True
         state[node][VelocityPropagationState] = s
 
         self.algo["data"].extend([s.xd_tot])
@@ -178,6 +197,18 @@ class VelocityPropagationStep:
         cur = state[child][ChainIndexState]
         par = state[parent][ChainIndexState]
 
+        if state[parent][VelocityPropagationState].xd_tot_zero:
+            # The joint's velocity is the segment's velocity w.r.t. the root
+            xd_tot = self.geom.velocity_twist(of=cur.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
+
+            s = VelocityPropagationState()
+            s.xd_jnt = xd_tot
+            s.xd_tot = xd_tot
+            state[child][VelocityPropagationState] = s
+
+            self.algo["data"].extend([s.xd_tot])
+            return
+
         xd_jnt        = self.geom.velocity_twist(of=cur.bdy, with_respect_to=par.bdy,      as_seen_by=cur.frm_prox)
         xd_tot_par_tf = self.geom.velocity_twist(of=par.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
         xd_tot        = self.geom.velocity_twist(of=cur.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
@@ -198,6 +229,11 @@ class VelocityPropagationStep:
             joint=cur[ChainIndexState].joint,
             joint_velocity=cur[JointState].qd,
             velocity_twist=cur[VelocityPropagationState].xd_jnt)
+
+        if par[VelocityPropagationState].xd_tot_zero:
+            self.algo["func"].extend([to_cart])
+            return
+
         tf = self.geom_coord.transform_velocity_twist_to_distal(
             pose=cur[PositionPropagationState].x_seg,
             frm=par[VelocityPropagationState].xd_tot,
@@ -217,14 +253,23 @@ class AccelerationPropagationState:
     # Intermediate
     xdd_jnt: URIRef | None = field(default=None)        # Acceleration across segment's joint
     xdd_tot_par_tf: URIRef | None = field(default=None) # Parent link's acceleration w.r.t. root transformed to segment's proximal link frame
+    xdd_tot_zero: bool = field(default=False)           # Acceleration w.r.t. root is known to be zero
 
 
 class AccelerationPropagationStep:
     """
     Xdd_{i+1} = {i+1}X_i Xdd_i + S_i qdd_i + Xd_i x S_i qd_i
+
+    For a fixed base the root's velocity is zero. If the root's acceleration
+    is zero, too (i.e. gravity is not modelled as acceleration of the root),
+    the first segment's acceleration is that of its joint: Xdd_1 = S_0 qdd_0
+    Otherwise, the velocity product vanishes for the first segment so that the
+    root's acceleration is transformed like a velocity twist:
+    Xdd_1 = 1X_0 Xdd_0 + S_0 qdd_0
     """
-    def __init__(self, g, load, algo, geom, geom_coord, kc):
+    def __init__(self, g, load, algo, geom, geom_coord, kc, fixed_base=False):
         self.g = g
+        self.fixed_base = fixed_base
         self.geom = geom
         self.geom_coord = geom_coord
         self.algo = algo
@@ -256,6 +301,8 @@ class AccelerationPropagationStep:
 
         s = AccelerationPropagationState()
         s.xdd_tot = xdd_tot
+        s.xdd_tot_zero = self.fixed_base and is_zero_twist(self.g, xdd_tot,
+            "of-acceleration", "angular-acceleration", "linear-acceleration")
         state[node][AccelerationPropagationState] = s
 
         self.algo["data"].extend([s.xdd_tot])
@@ -264,6 +311,18 @@ class AccelerationPropagationStep:
         cur = state[child][ChainIndexState]
         par = state[parent][ChainIndexState]
 
+        if state[parent][AccelerationPropagationState].xdd_tot_zero:
+            # The joint's acceleration is the segment's acceleration w.r.t. the root
+            xdd_tot = self.geom.acceleration_twist(of=cur.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
+
+            s = AccelerationPropagationState()
+            s.xdd_jnt = xdd_tot
+            s.xdd_tot = xdd_tot
+            state[child][AccelerationPropagationState] = s
+
+            self.algo["data"].extend([s.xdd_tot])
+            return
+
         xdd_jnt        = self.geom.acceleration_twist(of=cur.bdy, with_respect_to=par.bdy,      as_seen_by=cur.frm_prox)
         xdd_tot_par_tf = self.geom.acceleration_twist(of=par.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
         xdd_tot        = self.geom.acceleration_twist(of=cur.bdy, with_respect_to=cur.bdy_root, as_seen_by=cur.frm_prox)
@@ -284,12 +343,24 @@ class AccelerationPropagationStep:
             joint=cur[ChainIndexState].joint,
             joint_acceleration=cur[JointState].qdd,
             acceleration_twist=cur[AccelerationPropagationState].xdd_jnt)
-        tf = self.geom_coord.transform_acceleration_twist_to_distal(
-            pose=cur[PositionPropagationState].x_seg,
-            absolute_velocity=par[VelocityPropagationState].xd_tot,
-            relative_velocity=cur[VelocityPropagationState].xd_jnt,
-            frm=par[AccelerationPropagationState].xdd_tot,
-            to=cur[AccelerationPropagationState].xdd_tot_par_tf)
+
+        if par[AccelerationPropagationState].xdd_tot_zero:
+            self.algo["func"].extend([to_cart])
+            return
+
+        if par[VelocityPropagationState].xd_tot_zero:
+            # Without the parent's velocity only the twist transformation remains
+            tf = self.geom_coord.transform_velocity_twist_to_distal(
+                pose=cur[PositionPropagationState].x_seg,
+                frm=par[AccelerationPropagationState].xdd_tot,
+                to=cur[AccelerationPropagationState].xdd_tot_par_tf)
+        else:
+            tf = self.geom_coord.transform_acceleration_twist_to_distal(
+                pose=cur[PositionPropagationState].x_seg,
+                absolute_velocity=par[VelocityPropagationState].xd_tot,
+                relative_velocity=cur[VelocityPropagationState].xd_jnt,
+                frm=par[AccelerationPropagationState].xdd_tot,
+                to=cur[AccelerationPropagationState].xdd_tot_par_tf)
         comp = self.geom_coord.add_acceleration_twist(
             in1=cur[AccelerationPropagationState].xdd_tot_par_tf,
             in2=cur[AccelerationPropagationState].xdd_jnt,
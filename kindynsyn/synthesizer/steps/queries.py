@@ -67,3 +67,69 @@ SELECT ?child ?parent WHERE {
     BIND(?node as ?parent)
 }
 """
+
+
+#
+# Variants of the above queries that rely on the materialized shortcut edges
+# (see kindynsyn.synthesizer.shortcuts)
+#
+q_expand_shortcut = """
+PREFIX kc-nav: <https://comp-rob2b.github.io/kindyngen/navigation#>
+
+SELECT ?child ?parent WHERE {
+    ?node kc-nav:next-segment-frame ?child .
+    BIND(?node as ?parent)
+}
+"""
+
+q_root_shortcut = """
+PREFIX geom-ent: <https://comp-rob2b.github.io/metamodels/geometry/structural-entities#>
+PREFIX kc-nav: <https://comp-rob2b.github.io/kindyngen/navigation#>
+
+ASK {
+    ?node a geom-ent:Frame .
+    FILTER NOT EXISTS {
+        ?root_prox kc-nav:next-segment-frame ?node .
+    }
+}
+"""
+
+q_leaf_shortcut = """
+PREFIX geom-ent: <https://comp-rob2b.github.io/metamodels/geometry/structural-entities#>
+PREFIX kc-nav: <https://comp-rob2b.github.io/kindyngen/navigation#>
+
+ASK {
+    ?node a geom-ent:Frame .
+    FILTER NOT EXISTS {
+        ?node kc-nav:next-segment-frame ?joint_dist .
+    }
+}
+"""
+
+q_joint_motion_shortcut = """
+PREFIX kc-nav: <https://comp-rob2b.github.io/kindyngen/navigation#>
+PREFIX kc-stat: <https://comp-rob2b.github.io/metamodels/kinematic-chain/state#>
+
+SELECT ?child ?parent WHERE {
+    ?node kc-nav:joint-of-frame / ^kc-stat:of-joint ?child .
+    { ?child a kc-stat:JointPosition }
+    UNION
+    { ?child a kc-stat:JointVelocity }
+    UNION
+    { ?child a kc-stat:JointAcceleration }
+    BIND(?node as ?parent)
+}
+"""
+
+# Query -> variant
+shortcut_queries = {
+    q_expand: q_expand_shortcut,
+    q_root: q_root_shortcut,
+    q_leaf: q_leaf_shortcut,
+    q_joint_motion: q_joint_motion_shortcut
+}
+
+# Query file -> variant
+shortcut_files = {
+    "select_sibling_frame.rq": "select_sibling_frame_shortcut.rq"
+}
@@ -3,8 +3,9 @@ import typing
 import enum
 from dataclasses import dataclass, field
 import rdflib
-from rdflib.plugins.sparql.sparql import Query
-from kindynsyn.rdflib_tools.helpers import prepare_query
+if typing.TYPE_CHECKING:
+    from rdflib.plugins.sparql.sparql import Query
+from kindynsyn.rdflib_tools.helpers import prepare_query, qname
 from kindynsyn.rdflib_tools.traversal import BreadthFirst, \
     traverse_nodes_with_parent_user
 from kindynsyn.utility import log
@@ -64,17 +65,20 @@ class SolverConfig:
 class ConditionCache:
     """
     The conditions of node visitors are independent of the concrete traverser
-    and hence can be cached.
+    and hence can be cached. The queries map conditions to the queries that
+    are executed instead (e.g. their shortcut variants).
     """
-    def __init__(self, g):
+    def __init__(self, g, queries={}):
         self.g = g
+        self.queries = queries
         self.node = {}
 
     def register(self, node, condition):
         if node not in self.node:
             self.node[node] = {}
         if condition not in self.node[node]:
-            res = self.g.query(condition, initBindings={"node": node})
+            query = self.queries.get(condition, condition)
+            res = self.g.query(query, initBindings={"node": node})
             self.node[node][condition] = res
 
 
@@ -117,9 +121,12 @@ class TraverserRegistry:
 
 
 class TreeExpander:
-    def __init__(self, graph: rdflib.Graph, expanders: dict[str, CompiledExpander]):
+    def __init__(self, graph: rdflib.Graph, expanders: dict[str, CompiledExpander],
+                 queries: dict[str, str] = {}):
         self.graph = graph
         self.expanders = expanders
+        # Expander query -> query that is executed instead
+        self.queries = queries
 
     def root(self, node: rdflib.URIRef) -> dict[str, list[CompiledExpander]]:
         # Expand the root once separately. Any user data that applies to the
@@ -138,7 +145,7 @@ class TreeExpander:
         # functions.
         ret = {}
         for query, expander in self.expanders.items():
-            res = self.graph.query(query, initBindings={"node": node})
+            res = self.graph.query(self.queries.get(query, query), initBindings={"node": node})
             for row in res:
                 child = row["child"]
 
@@ -153,15 +160,29 @@ class TreeExpander:
 
 
 class SolverSynthesizer:
-    def __init__(self, g: rdflib.Graph, conf: SolverConfig):
+    def __init__(self, g: rdflib.Graph, conf: SolverConfig, observer=None, shortcuts=None):
         self.g = g
         self.conf = conf
+        # Optional callable "observer(sweep, step, node)" that is notified
+        # before a step's function is dispatched (e.g. to attribute the
+        # contributed operations to steps)
+        self.observer = observer
+        # Optional materialized shortcut edges (see Shortcuts) whose query
+        # variants replace the expander and condition queries
+        self.shortcuts = shortcuts
+        self.queries = {}
+        self.sweep = None
         self.traversal = None
         self.conditions = None
         self.children = None
         self.state = None
 
     def execute(self, root: rdflib.URIRef, funcs: list[str]):
+        # Materialize the shortcut edges again if the kinematic chain changed
+        if self.shortcuts:
+            self.shortcuts.update()
+            self.queries = self.shortcuts.queries
+
         # Compute (serial) breadth-first traversal of graph using expanders to expand the fringe.
         # The same expander query may be used for (i) multiple steps; in (ii) different sweeps.
         # Hence, we need to keep track of the sweep and the dispatch function per expansion step
@@ -178,9 +199,13 @@ class SolverSynthesizer:
 
         # Execute functions
         for func in funcs:
-            for sweep in self.conf.sweeps:
+            for i, sweep in enumerate(self.conf.sweeps):
+                self.sweep = i
                 self._execute_sweep(sweep, func)
 
+        if self.observer:
+            self.observer(None, None, None)
+
     def _compute_traversal(self, root):
         registry = TraverserRegistry()
         for sweep in self.conf.sweeps:
@@ -192,13 +217,13 @@ class SolverSynthesizer:
         log(registry)
 
         open_set = BreadthFirst
-        ex = TreeExpander(self.g, registry.expanders)
+        ex = TreeExpander(self.g, registry.expanders, self.queries)
         entity_with_parent = list(traverse_nodes_with_parent_user(open_set, root, ex))
 
         return entity_with_parent
 
     def _cache_conditions(self, traversal):
-        conditions = ConditionCache(self.g)
+        conditions = ConditionCache(self.g, self.queries)
         for (node, _, expander_dict) in traversal:
             for expander_list in expander_dict.values():
                 for expander in expander_list:
@@ -293,6 +318,7 @@ class SolverSynthesizer:
             fn = getattr(dispatcher, func)
             log("edge:", fn)
             if fn:
+                self._notify(fn, current)
                 fn(self.state, parent, current)
 
     def _trig_dispatchers_in(self, traverser, current, func):
@@ -310,6 +336,7 @@ class SolverSynthesizer:
             # children associated with the expander query that we are currently
             # handling
             if fn and traverser.expander in self.children[current]:
+                self._notify(fn, current)
                 fn(self.state, current, self.children[current][traverser.expander])
 
     def _dispatch_to_node(self, node, dispatcher, func):
@@ -319,11 +346,49 @@ class SolverSynthesizer:
         fn = getattr(dispatcher, func)
         log("node:", fn)
         if fn:
+            self._notify(fn, node)
             fn(self.state, node)
 
+    def _notify(self, fn, node):
+        if self.observer:
+            self.observer(self.sweep, getattr(fn, "__self__", None), node)
+
     def _should_dispatch(self, node, dispatcher):
         # None is a wildcard
         if not dispatcher.condition:
             return True
 
         return bool(self.conditions.node[node][dispatcher.condition])
+
+
+class Provenance:
+    """
+    Observer for the SolverSynthesizer that records for each operation which
+    sweep (index), step and node contributed it. Operations that are
+    contributed multiple times retain their first origin.
+    """
+    def __init__(self, algo):
+        self.algo = algo
+        self.origin = {}
+        self.current = None
+        self.mark = 0
+
+    def __call__(self, sweep, step, node):
+        for f in self.algo["func"][self.mark:]:
+            self.origin.setdefault(f, self.current)
+        self.mark = len(self.algo["func"])
+        self.current = (sweep, step, node)
+
+    def table(self, g):
+        """
+        Return the origin of each operation (by its string representation) as
+        dictionary of the sweep, the step's class name and the segment.
+        """
+        res = {}
+        for f, (sweep, step, node) in self.origin.items():
+            res[str(f)] = {
+                "sweep": sweep,
+                "step": type(step).__name__,
+                "segment": qname(g, node)
+            }
+        return res
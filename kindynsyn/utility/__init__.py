@@ -1,5 +1,11 @@
 # SPDX-License-Identifier: MPL-2.0
-from .helpers import *
-from .resolver import *
+from .lazy import lazy_package
 
-__all__ = ["helpers", "resolver"]
+__all__ = ["helpers", "resolver", "lazy"]
+
+# The submodules are imported on first use
+__getattr__, __dir__ = lazy_package(__name__, __all__, {
+    "helpers": ["loader", "log"],
+    "resolver": ["IriToFileResolver", "install", "pyld_loader"],
+    "lazy": ["lazy_package"]
+})
@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import types
+import importlib
+
+
+def lazy_package(name, submodules, exports={}):
+    """
+    Return the module-level "__getattr__" and "__dir__" functions (PEP 562)
+    that import a package's submodules on first use instead of star-importing
+    them all in the package's "__init__":
+
+        __all__ = ["helpers", "resolver"]
+        __getattr__, __dir__ = lazy_package(__name__, __all__, {
+            "helpers": ["loader", "log"],
+            ...
+        })
+
+    The exports map each submodule to the names that it defines so that
+    accessing such a name only imports the defining submodule. Any other name
+    falls back to importing all submodules in order with the semantics of the
+    former star-imports (i.e. the last submodule wins) so that names that the
+    submodules re-export remain available.
+
+    An exported name that equals a submodule's name (e.g. the "cost" function
+    in the "cost" module) shadows that submodule like the star-imports did.
+    Since importing the submodule (by whatever means) binds it to the
+    package's attribute, the package's class binds the exported name instead.
+    The package keeps the exports in "__exports__".
+    """
+    index = {attr: sub for sub in submodules for attr in exports.get(sub, [])}
+    loaded = []
+
+    package = sys.modules[name]
+    package.__exports__ = exports
+
+    shadowed = {attr: index[attr] for attr in submodules if attr in index}
+    if shadowed:
+        class Package(type(package)):
+            def __setattr__(self, attr, value):
+                if attr in shadowed and isinstance(value, types.ModuleType) \
+                        and value.__name__ == name + "." + attr:
+                    value = getattr(importlib.import_module("." + shadowed[attr], name), attr)
+                super().__setattr__(attr, value)
+
+        package.__class__ = Package
+
+    def load_all(package):
+        if loaded:
+            return
+        for sub in submodules:
+            module = importlib.import_module("." + sub, name)
+            attrs = getattr(module, "__all__", None)
+            if attrs is None:
+                attrs = [a for a in vars(module) if not a.startswith("_")]
+            for attr in attrs:
+                # Do not shadow the package's own submodules (e.g. the
+                # "synthesizer" module in the "synthesizer" package) unless
+                # the exports say so
+                if attr not in submodules or index.get(attr) == sub:
+                    setattr(package, attr, getattr(module, attr))
+        loaded.append(True)
+
+    def __getattr__(attr):
+        package = importlib.import_module(name)
+
+        if attr in index:
+            value = getattr(importlib.import_module("." + index[attr], name), attr)
+            setattr(package, attr, value)
+            return value
+
+        if attr in submodules:
+            return importlib.import_module("." + attr, name)
+
+        if not attr.startswith("__"):
+            load_all(package)
+            if attr in vars(package):
+                return vars(package)[attr]
+
+        raise AttributeError("module {!r} has no attribute {!r}".format(name, attr))
+
+    def __dir__():
+        package = importlib.import_module(name)
+        return sorted(set(vars(package)) | set(submodules) | set(index))
+
+    return __getattr__, __dir__
@@ -1,5 +1,5 @@
 # SPDX-License-Identifier: MPL-2.0
-import urllib
+import urllib.request
 import pathlib
 import json
 
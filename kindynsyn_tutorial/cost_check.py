@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: MPL-2.0
+import json
+import sys
+from kindynsyn.optimizer import compare
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage:")
+        print("#", sys.argv[0], "<report> <baseline> [<tolerance>]")
+        print("where <report> and <baseline> are cost reports generated by the runner")
+        print("and <tolerance> is the accepted relative increase (default: 0)")
+        sys.exit(2)
+
+    with open(sys.argv[1]) as f:
+        report = json.load(f)
+    with open(sys.argv[2]) as f:
+        baseline = json.load(f)
+    tolerance = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    regressions = compare(report, baseline, tolerance)
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
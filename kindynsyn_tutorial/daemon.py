@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import sys
+import json
+import asyncio
+
+# Only the server imports the synthesizer (see SynthesisServer) so that
+# submitting a job does not pay for importing rdflib and the synthesizer
+SOCKET = "gen/synthesis.sock"
+OUT_FILE = "gen/solver.gen-ir.json"
+COST_FILE = "gen/solver.gen-cost.json"
+
+# Maximum size of a message (the IR of a solver is a single line of JSON)
+LIMIT = 1 << 30
+
+
+class SynthesisServer:
+    """
+    Synthesize solvers for jobs that are submitted via a Unix-domain socket.
+    In contrast to runner.py the server keeps the parsed models of each robot
+    and the compiled SPARQL queries in memory across jobs.
+
+    Each message is a single line of JSON. A job consists of:
+    - "tutorial": the tutorial module (e.g. "rne")
+    - "postprocessors": the postprocessor modules (optional, e.g. ["log"])
+    - "robot": the models, the root frame and the base state of the robot
+      (optional, by default runner.KINOVA_GEN3; partial descriptions override
+      the default's entries)
+    The reply contains the "ir" and the "cost" report or an "error" message.
+
+    The synthesis adds the solver to the graph. Hence, each job writes to a
+    layer on top of the loaded models (see kindynsyn.rdflib_tools.LayeredGraph)
+    that is discarded afterwards. The shortcut edges (see Shortcuts) are
+    materialized once in the loaded models instead of in each job's layer.
+    Jobs are executed one after another.
+    """
+    def __init__(self):
+        from kindynsyn.utility import resolver, loader
+        from kindynsyn.rdflib_tools import sparql_prepare, sparql_cache
+        from runner import URL_MAP, SPARQL_PATH
+
+        self.graphs = {}    # models -> layered graph
+        self.structures = {}    # models -> structure of the shortcut edges
+        self.cache = sparql_cache(loader(SPARQL_PATH), sparql_prepare)
+        self.lock = asyncio.Lock()
+
+        resolver.install(resolver.IriToFileResolver(URL_MAP))
+
+    def graph(self, robot):
+        """
+        Return the layered graph of the robot's models, which are loaded on
+        first use, and the shortcuts of the loaded models.
+        """
+        from runner import load
+        from kindynsyn.rdflib_tools import LayeredGraph
+        from kindynsyn.synthesizer.shortcuts import Shortcuts
+
+        key = tuple(robot["models"])
+        if key not in self.graphs:
+            base = load(robot)
+            shortcuts = Shortcuts(base)
+            shortcuts.update()
+            self.graphs[key] = LayeredGraph(base)
+            self.structures[key] = shortcuts.structure
+
+        g = self.graphs[key]
+        return g, Shortcuts(g, self.structures[key])
+
+    def run(self, job):
+        from runner import KINOVA_GEN3, load_configuration, synthesize
+        from kindynsyn.optimizer import CostModel
+
+        conf = load_configuration(job["tutorial"], job.get("postprocessors", []))
+        robot = dict(KINOVA_GEN3, **job.get("robot", {}))
+
+        g, shortcuts = self.graph(robot)
+        try:
+            _, prov, ir_prog = synthesize(conf, robot, g, self.cache, shortcuts)
+            return { "ir": ir_prog, "cost": CostModel().report(ir_prog, prov.table(g)) }
+        finally:
+            g.discard()
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        while line := await reader.readline():
+            try:
+                job = json.loads(line)
+                async with self.lock:
+                    res = await loop.run_in_executor(None, self.run, job)
+            except Exception as e:
+                res = { "error": "{}: {}".format(type(e).__name__, e) }
+
+            writer.write(json.dumps(res).encode() + b"\n")
+            await writer.drain()
+
+        writer.close()
+        await writer.wait_closed()
+
+    async def serve(self, path=SOCKET):
+        if os.path.exists(path):
+            os.unlink(path)
+
+        server = await asyncio.start_unix_server(self.handle, path, limit=LIMIT)
+        async with server:
+            await server.serve_forever()
+
+
+async def submit(job, path=SOCKET):
+    """
+    Submit a job to the server and return its reply.
+    """
+    reader, writer = await asyncio.open_unix_connection(path, limit=LIMIT)
+    writer.write(json.dumps(job).encode() + b"\n")
+    await writer.drain()
+    res = json.loads(await reader.readline())
+
+    writer.close()
+    await writer.wait_closed()
+    return res
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ["serve", "submit"] \
+            or (sys.argv[1] == "submit" and len(sys.argv) < 3):
+        print("Usage:")
+        print("#", sys.argv[0], "serve")
+        print("#", sys.argv[0], "submit <tutorial> [<postprocessor>]")
+        print("where the server listens on", SOCKET, "and submit writes the IR and")
+        print("the cost report to the same files as runner.py")
+        sys.exit(2)
+
+    if sys.argv[1] == "serve":
+        asyncio.run(SynthesisServer().serve())
+        return
+
+    res = asyncio.run(submit({ "tutorial": sys.argv[2], "postprocessors": sys.argv[3:] }))
+    if "error" in res:
+        print(res["error"])
+        sys.exit(1)
+
+    with open(OUT_FILE, "w") as f:
+        json.dump(res["ir"], f, indent=4)
+
+    with open(COST_FILE, "w") as f:
+        json.dump(res["cost"], f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 # SPDX-License-Identifier: MPL-2.0
+from kindynsyn.namespaces import GEOM_COORD, GEOM_REL
+from kindynsyn.optimizer import select_data
 from kindynsyn.synthesizer.synthesizer import SweepDirection, SweepConfig, \
     SolverConfig
 from kindynsyn.synthesizer.graph_factories import (
@@ -37,3 +39,15 @@ def solver_configurator(g, cache, ROB, slv_algo):
 
 def translator_configurator():
     return []
+
+
+def output_configurator(g, slv_algo):
+    # The poses of the chain's tips (the frames that no other pose is relative
+    # to, i.e. the end-effector) w.r.t. the root (the world). The poses of the
+    # other segments are intermediate results.
+    poses = select_data(g, slv_algo["data"], GEOM_COORD["PoseCoordinate"])
+    of = {p: g.value(p, GEOM_COORD["of-pose"] / GEOM_REL["of"]) for p in poses}
+    wrt = {p: g.value(p, GEOM_COORD["of-pose"] / GEOM_REL["with-respect-to"]) for p in poses}
+    tips = set(of.values()) - set(wrt.values())
+    roots = set(wrt.values()) - set(of.values())
+    return [p for p in poses if of[p] in tips and wrt[p] in roots]
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import ast
+import sys
+import json
+import importlib
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The report of the latest run (the baseline of later runs) in the
+# repository's "gen" directory independent of the working directory
+REPORT_FILE = os.path.join(ROOT, "gen", "import-time.json")
+
+# Entry points (imported with the tutorial's directory on the path like the
+# scripts themselves) and the expensive modules that they must not import
+ENTRY_POINTS = {
+    "kindynsyn": ["rdflib", "numpy"],
+    "kindynsyn.code_gen.__main__": ["rdflib", "numpy"],
+    "kindynsyn.optimizer": ["kindynsyn.optimizer.cost"],
+    "daemon": ["rdflib", "numpy"],
+    "runner": ["rdflib.plugins.sparql"],
+    "watch": ["rdflib.plugins.sparql"]
+}
+
+# Each entry point is imported this many times and the fastest run is reported
+RUNS = 5
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps([time.perf_counter() - start, [m for m in {forbidden!r} if m in sys.modules]]))
+"""
+
+
+def import_time(module, forbidden, runs=RUNS):
+    """
+    Import the module in fresh interpreters and return the fastest import time
+    in seconds and the forbidden modules that it imported
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(here), here] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else []))
+
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, forbidden=forbidden)],
+                             env=env, capture_output=True, text=True, check=True).stdout
+        t, imported = json.loads(out)
+        times.append(t)
+    return min(times), imported
+
+
+def definitions(path):
+    """
+    Return the public names that a module's source defines at the top level
+    (i.e. without the names that it imports)
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read())
+
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.add(node.target.id)
+    return {n for n in names if not n.startswith("_")}
+
+
+def stale_exports(root="kindynsyn"):
+    """
+    Compare the exports that each lazily imported package lists for its
+    submodules (see kindynsyn.utility.lazy) with the names that the submodules
+    define and return the differences
+    """
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+    stale = []
+    for path, _, files in sorted(os.walk(os.path.join(here, root))):
+        if "__init__.py" not in files:
+            continue
+        name = os.path.relpath(path, here).replace(os.sep, ".")
+        package = importlib.import_module(name)
+        exports = getattr(package, "__exports__", None)
+        if exports is None:
+            continue
+
+        for sub in package.__all__:
+            source = os.path.join(path, sub + ".py")
+            if not os.path.exists(source):
+                # Subpackages have their own table
+                continue
+            defined = definitions(source)
+            listed = set(exports.get(sub, []))
+            for n in sorted(defined - listed):
+                stale.append("{}: table of {} lacks {}".format(name, sub, n))
+            for n in sorted(listed - defined):
+                stale.append("{}: table of {} lists undefined {}".format(name, sub, n))
+    return stale
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print("Usage:")
+        print("#", sys.argv[0], "[<baseline> [<tolerance>]]")
+        print("where <baseline> is a report generated by a previous run (see",
+              os.path.relpath(REPORT_FILE, ROOT) + ")")
+        print("and <tolerance> is the accepted relative increase (default: 0.2)")
+        sys.exit(2)
+
+    baseline = {}
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            baseline = json.load(f)
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    report = {}
+    regressions = []
+    for module, forbidden in ENTRY_POINTS.items():
+        t, imported = import_time(module, forbidden)
+        report[module] = t
+        print("{}: {:.1f} ms".format(module, t * 1e3))
+
+        for m in imported:
+            regressions.append("{} imports {}".format(module, m))
+        if module in baseline and t > baseline[module] * (1 + tolerance):
+            regressions.append("{}: {:.1f} ms (baseline: {:.1f} ms)".format(
+                module, t * 1e3, baseline[module] * 1e3))
+
+    regressions.extend(stale_exports())
+
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w") as f:
+        json.dump(report, f, indent=4)
+
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import numpy as np
+import rne
+from runner import KINOVA_GEN3, load_configuration, synthesize
+from layered_check import seed_uuids
+
+# The coordinates of the rigid-body inertias in the IR and their accepted
+# absolute difference (the batched computation sums in another order)
+COORDINATES = ["rotational-inertia", "moment-of-mass", "mass"]
+TOLERANCE = 1e-12
+
+
+def inertias(batched):
+    """
+    Synthesize the "rne" tutorial with the batched or the per-link computation
+    of the rigid-body inertias and return the IR's rigid-body inertias
+    """
+    rne.batched_inertia = batched
+    # The same names for both syntheses
+    seed_uuids()
+    _, _, ir_prog = synthesize(load_configuration("rne"), KINOVA_GEN3)
+    return {name: var for name, var in ir_prog["variables"].items()
+            if var["quantity"] == "rigid-body-inertia"}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print("Usage:")
+        print("#", sys.argv[0])
+        print("Synthesizes the rne tutorial with the batched and the per-link")
+        print("computation of the rigid-body inertias and compares the inertias")
+        sys.exit(2)
+
+    reference, batched = inertias(False), inertias(True)
+
+    regressions = []
+    for name in sorted(set(reference) | set(batched)):
+        if name not in reference or name not in batched:
+            regressions.append("{}: only computed {}".format(
+                name, "per link" if name in reference else "in the batch"))
+            continue
+
+        for c in COORDINATES:
+            diff = np.max(np.abs(np.subtract(batched[name][c], reference[name][c])))
+            if diff > TOLERANCE:
+                regressions.append("{}: {} differs by {:g}".format(name, c, diff))
+
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
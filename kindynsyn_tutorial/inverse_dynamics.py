@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import itertools
+import numpy as np
+from rdflib import URIRef
+from kindynsyn.namespaces import KC_STAT
+from kindynsyn.ir_eval import IREvaluator, KernelCompiler
+from runner import configure, synthesize
+
+
+def joint_variables(g, ir, quantity, joints):
+    """
+    Return the names of the variables of the given quantity in the order of the
+    joints.
+    """
+    res = {}
+    for name, var in ir["variables"].items():
+        if var["quantity"] == quantity:
+            res[g.value(URIRef(var["represents"]), KC_STAT["of-joint"])] = name
+    return [res[j] for j in joints]
+
+
+def joint_forces(g, ir, joints):
+    """
+    Return the names of the joint forces that the solver computes (the results
+    of the "joint-force-from-wrench" closures) in the order of the joints. The
+    joint forces of the models are never written by the solver.
+    """
+    res = {}
+    for args in ir["closures"].values():
+        if args["operator"] == "joint-force-from-wrench":
+            var = ir["variables"][args["joint-force"]]
+            res[g.value(URIRef(var["represents"]), KC_STAT["of-joint"])] = args["joint-force"]
+    return [res[j] for j in joints]
+
+
+def read_npy(path, chunk_size):
+    # Memory-mapped, i.e. only the current chunk is loaded
+    data = np.load(path, mmap_mode="r")
+    return len(data), (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+
+
+def read_csv(path, chunk_size):
+    def rows(f):
+        # Skip empty lines and comments (e.g. a header)
+        return (l for l in f if l.strip() and not l.startswith("#"))
+
+    with open(path) as f:
+        n = sum(1 for _ in rows(f))
+
+    def chunks():
+        with open(path) as f:
+            r = rows(f)
+            for _ in range(0, n, chunk_size):
+                yield np.loadtxt(itertools.islice(r, chunk_size), delimiter=",", ndmin=2)
+
+    return n, chunks()
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage:")
+        print("#", sys.argv[0], "<trajectory> <torques> [<chunk-size>]")
+        print("where <trajectory> is a .npy or .csv file with one sample per row that")
+        print("consists of the joint positions, velocities and accelerations (in this")
+        print("order, each in the order of the joints along the chain)")
+        print("and <torques> is the .npy file for the resulting joint torques")
+        print("and <chunk-size> is the number of samples per evaluation (default: 4096)")
+        sys.exit(2)
+
+    trajectory, torques = sys.argv[1], sys.argv[2]
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 4096
+
+    # Synthesize the RNE solver as in the "rne" tutorial
+    g, _, ir = synthesize(configure([sys.argv[0], "rne"]))
+
+    positions = IREvaluator(ir).variables("joint-position")
+    joints = [g.value(URIRef(ir["variables"][q]["represents"]), KC_STAT["of-joint"])
+              for q in positions]
+    inputs = positions \
+        + joint_variables(g, ir, "joint-velocity", joints) \
+        + joint_variables(g, ir, "joint-acceleration", joints)
+    outputs = joint_forces(g, ir, joints)
+
+    if trajectory.endswith(".csv"):
+        n, chunks = read_csv(trajectory, chunk_size)
+    else:
+        n, chunks = read_npy(trajectory, chunk_size)
+
+    # The kernel's buffer holds one chunk and is reused for all chunks
+    kernel = KernelCompiler(ir).compile(chunk_size)
+    res = np.lib.format.open_memmap(torques, mode="w+", dtype=np.float64,
+                                    shape=(n, len(joints)))
+
+    begin = 0
+    for chunk in chunks:
+        if chunk.shape[1] != len(inputs):
+            print("Expected", len(inputs), "columns but found", chunk.shape[1])
+            sys.exit(1)
+
+        m = len(chunk)
+        for i, name in enumerate(inputs):
+            kernel[name][:m, 0] = chunk[:, i]
+        kernel()
+        for i, name in enumerate(outputs):
+            res[begin:begin + m, i] = kernel[name][:m, 0]
+        begin += m
+
+    res.flush()
+
+
+if __name__ == "__main__":
+    main()
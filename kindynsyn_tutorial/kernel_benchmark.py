@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import time
+import tracemalloc
+import numpy as np
+from kindynsyn.ir_eval import IREvaluator, KernelCompiler
+from runner import load_configuration, synthesize
+
+# The kernel is called this many times to measure the time per call and the
+# memory that a call allocates
+CALLS = 1000
+
+
+def set_inputs(ir, kernel, seed=0):
+    """
+    Set the joint positions, velocities and accelerations to random values
+    """
+    rng = np.random.default_rng(seed)
+    ev = IREvaluator(ir)
+    for quantity in ["joint-position", "joint-velocity", "joint-acceleration"]:
+        for name in ev.variables(quantity):
+            kernel[name][:] = rng.uniform(-1.0, 1.0, kernel[name].shape)
+
+
+def time_per_call(kernel, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        kernel()
+    return (time.perf_counter() - start) / calls
+
+
+def peak_allocation(function, calls):
+    res = 0
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            function()
+            res = max(res, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return res
+
+
+def allocation(kernel, calls=CALLS):
+    """
+    Return the largest number of bytes that has been allocated (and possibly
+    freed again) during a call without the bytes that the measurement itself
+    allocates
+    """
+    # The first iterations of the first measurement also record the
+    # allocations of the interpreter while it specializes the measurement
+    peak_allocation(lambda: None, calls)
+    return peak_allocation(kernel, calls) - peak_allocation(lambda: None, calls)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print("Usage:")
+        print("#", sys.argv[0], "[<tutorial> [<batch-size>]]")
+        print("where <tutorial> is the tutorial whose solver is compiled (default: rne)")
+        print("and <batch-size> is the number of samples per call (default: 1)")
+        sys.exit(2)
+
+    tutorial = sys.argv[1] if len(sys.argv) > 1 else "rne"
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    _, _, ir = synthesize(load_configuration(tutorial))
+    kernel = KernelCompiler(ir).compile(batch_size)
+    set_inputs(ir, kernel)
+
+    # The first call is not measured
+    kernel()
+    t = time_per_call(kernel)
+    print("{}: {:.1f} us per call ({} samples)".format(tutorial, t * 1e6, batch_size))
+
+    regressions = []
+    size = allocation(kernel)
+    if size > 0:
+        regressions.append("{}: a call allocates {} bytes".format(tutorial, size))
+
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
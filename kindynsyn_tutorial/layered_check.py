@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MPL-2.0
+import sys
+import json
+import uuid
+import random
+from kindynsyn.utility import resolver
+from kindynsyn.rdflib_tools import LayeredGraph
+from kindynsyn.optimizer import CostModel
+from runner import URL_MAP, KINOVA_GEN3, load_configuration, load, synthesize
+from daemon import SynthesisServer
+
+# The tutorials and postprocessors that are synthesized one after another on
+# the same layered graph
+JOBS = [
+    ("fpk", []),
+    ("rne", []),
+    ("rne_slv_robif", []),
+    ("rne_slv_robif_ctrl", ["log"])
+]
+
+# Each job is synthesized this many times on the layered graph and submitted
+# this many times to the synthesis server
+RUNS = 2
+
+
+def seed_uuids(seed=0):
+    """
+    Draw the UUIDs of the synthesized entities (see uuid_ref) from a seeded
+    generator so that the IRs of different syntheses are comparable
+    """
+    rng = random.Random(seed)
+    uuid.uuid4 = lambda: uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def result(conf, g):
+    """
+    Synthesize the solver in the graph and return the IR and the cost report
+    as they are written by the runner
+    """
+    seed_uuids()
+    g, prov, ir_prog = synthesize(conf, KINOVA_GEN3, g)
+    return json.dumps([ir_prog, CostModel().report(ir_prog, prov.table(g))])
+
+
+def submit(server, tutorial, postprocessors):
+    """
+    Run the job in the synthesis server and return the IR and the cost report
+    like "result"
+    """
+    seed_uuids()
+    res = server.run({ "tutorial": tutorial, "postprocessors": postprocessors })
+    if "error" in res:
+        raise RuntimeError(res["error"])
+    return json.dumps([res["ir"], res["cost"]])
+
+
+def difference(res, ref):
+    """
+    Return the first top-level entry of the IR or "cost" where the results
+    differ
+    """
+    (ir, cost), (ir_ref, cost_ref) = json.loads(res), json.loads(ref)
+    for key in sorted(set(ir) | set(ir_ref)):
+        if ir.get(key) != ir_ref.get(key):
+            return key
+    return "cost"
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print("Usage:")
+        print("#", sys.argv[0])
+        print("Synthesizes the tutorials", ", ".join(t for t, _ in JOBS), RUNS, "times on one")
+        print("layered graph and in the synthesis server and compares the IRs with")
+        print("those of fresh graphs")
+        sys.exit(2)
+
+    resolver.install(resolver.IriToFileResolver(URL_MAP))
+
+    reference = {}
+    for tutorial, postprocessors in JOBS:
+        reference[tutorial] = result(load_configuration(tutorial, postprocessors),
+                                     load(KINOVA_GEN3))
+
+    regressions = []
+    g = LayeredGraph(load(KINOVA_GEN3))
+    for run in range(RUNS):
+        for tutorial, postprocessors in JOBS:
+            res = result(load_configuration(tutorial, postprocessors), g)
+            g.discard()
+            if res != reference[tutorial]:
+                regressions.append("{} (run {}): {} differs from a fresh graph".format(
+                    tutorial, run + 1, difference(res, reference[tutorial])))
+
+    server = SynthesisServer()
+    for run in range(RUNS):
+        for tutorial, postprocessors in JOBS:
+            res = submit(server, tutorial, postprocessors)
+            if res != reference[tutorial]:
+                regressions.append("{} (job {}): {} differs from the runner".format(
+                    tutorial, run + 1, difference(res, reference[tutorial])))
+
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-from kindynsyn_tutorial.my_logger import MY_LOG, MyLoggerTranslator
+from kindynsyn_tutorial.my_logger import MY_LOG, MyLoggerTranslator, \
+    my_logger_access
 
 q = """
 PREFIX rob: <https://comp-rob2b.github.io/robots/kinova/gen3/7dof/>
@@ -31,3 +32,6 @@ def postprocessor(g):
 
 def translator_configurator():
     return [MyLoggerTranslator()]
+
+def access_configurator():
+    return my_logger_access
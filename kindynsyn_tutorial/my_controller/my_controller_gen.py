@@ -22,3 +22,9 @@ class MyCartesianControllerTranslator:
             "velocity-twist": escape(qname(g, g.value(node, EX_CTRL["velocity-twist"]))),
             "wrench": escape(qname(g, g.value(node, EX_CTRL["wrench"])))
         }
+
+
+# How the operator accesses its arguments (see kindynsyn.optimizer.access)
+my_controller_access = {
+    "ex-damping": {"read": ["velocity-twist"], "write": ["wrench"]}
+}
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MPL-2.0
 from .namespace import *
 from .my_logger_gen import *
+from .my_logger_reader import *
 
-__all__ = ["namespace", "my_logger_gen"]
+__all__ = ["namespace", "my_logger_gen", "my_logger_reader"]
@@ -3,6 +3,8 @@ from rdflib import collection, RDF
 from kindynsyn.namespaces import GEOM_COORD
 from kindynsyn.rdflib_tools import qname
 from kindynsyn.ir_gen import escape
+from kindynsyn.ir_gen.translators import translator_list
+from kindynsyn.ir_gen.layout import variable_size
 from .namespace import MY_LOG
 
 
@@ -24,3 +26,47 @@ class MyLoggerTranslator:
             "operator": "ex-logger",
             "quantity": l
         }
+
+
+class MyBinaryLoggerTranslator:
+    """
+    The binary logger writes one record per call. The record consists of the
+    cycle counter followed by the logged quantities. Their sizes (in number of
+    doubles) are those of the quantities' variables in the IR.
+    """
+
+    @staticmethod
+    def is_applicable(g, node):
+        return set([MY_LOG["BinaryLogger"]]) <= set(g[node : RDF["type"]])
+
+    @staticmethod
+    def translate(g, node):
+        fields = []
+        offset = 8  # Cycle counter
+        for e in sorted(g.objects(node, MY_LOG["quantity"]), key=lambda e: escape(qname(g, e))):
+            var = next(t.translate(g, e) for t in translator_list if t.is_applicable(g, e))
+            size = variable_size(var)
+            fields.append({
+                "name": escape(qname(g, e)),
+                "represents": str(e),
+                "quantity": var["quantity"],
+                "offset": offset,
+                "size": size
+            })
+            offset += 8 * size
+
+        return {
+            "represents": str(node),
+            "name": escape(qname(g, node)),
+            "operator": "ex-binary-logger",
+            "quantity": [f["name"] for f in fields],
+            "fields": fields,
+            "record-size": offset
+        }
+
+
+# How the operator accesses its arguments (see kindynsyn.optimizer.access)
+my_logger_access = {
+    "ex-logger": {"read": ["quantity"], "effect": True},
+    "ex-binary-logger": {"read": ["quantity"], "effect": True}
+}
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import numpy as np
+
+
+# The log file starts with the magic number and the record size (as unsigned
+# 64-bit integer) followed by the records
+LOG_MAGIC = b"kdslog01"
+LOG_HEADER_SIZE = 16
+
+
+def record_dtype(ir, name=None):
+    """
+    NumPy structured data type of the records of a binary logger in the IR
+    (the first one if no name is given).
+    """
+    for args in ir["closures"].values():
+        if args["operator"] == "ex-binary-logger" and name in [None, args["name"]]:
+            break
+    else:
+        raise ValueError("No binary logger found: {}".format(name))
+
+    return np.dtype({
+        "names": ["cycle"] + [f["name"] for f in args["fields"]],
+        "formats": ["<u8"] + [("<f8", (f["size"],)) for f in args["fields"]],
+        "offsets": [0] + [f["offset"] for f in args["fields"]],
+        "itemsize": args["record-size"]
+    })
+
+
+def read_binary_log(path, ir, name=None):
+    """
+    Memory-map a log written by the binary logger as a structured array with one
+    element per record. An incomplete last record (e.g. while the logger is
+    still running) is ignored.
+    """
+    dtype = record_dtype(ir, name)
+
+    with open(path, "rb") as f:
+        header = f.read(LOG_HEADER_SIZE)
+    if len(header) != LOG_HEADER_SIZE or header[:8] != LOG_MAGIC:
+        raise ValueError("Not a binary log: {}".format(path))
+    size = int.from_bytes(header[8:], "little")
+    if size != dtype.itemsize:
+        raise ValueError("Record size mismatch: {} (log) vs. {} (IR)".format(size, dtype.itemsize))
+
+    count = (os.path.getsize(path) - LOG_HEADER_SIZE) // size
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=LOG_HEADER_SIZE, shape=(count,))
@@ -8,6 +8,10 @@ class MY_LOG(DefinedNamespace):
     # - quantity: a symbolic pointer to the quantity
     Logger: URIRef
 
+    # The operation type to log some quantities into a binary ring buffer. It
+    # requires the same property as the Logger.
+    BinaryLogger: URIRef
+
     # The property to represent the symbolic pointer to quantity for the Logger
     # operation.
     quantity: URIRef
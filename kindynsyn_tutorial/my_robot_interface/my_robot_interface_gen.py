@@ -39,3 +39,23 @@ class JointConfigurationFromSolverTranslator:
             "destination-index": int(g.value(node, MY_IF["destination-index"])),
             "source": escape(qname(g, g.value(node, MY_IF["source"])))
         }
+
+
+# How the operators access their arguments (see kindynsyn.optimizer.access).
+# Sending the joint forces to the robot is an effect that must be retained and
+# the measurements are inputs that change in every control cycle.
+my_robot_interface_access = {
+    "joint-position-to-solver": {"write": ["destination"], "input": True},
+    "joint-velocity-to-solver": {"write": ["destination"], "input": True},
+    "joint-force-from-solver": {"read": ["source"], "effect": True}
+}
+
+
+# The robot interface's buffers (see the robif2b application templates) that
+# the joint variables alias in the zero-copy mode (see
+# kindynsyn.optimizer.InterfaceAliasing) instead of copying them per joint
+my_robot_interface_aliases = {
+    "joint-position-to-solver": {"buffer": "pos_msr", "index": "source-index", "variable": "destination"},
+    "joint-velocity-to-solver": {"buffer": "vel_msr", "index": "source-index", "variable": "destination"},
+    "joint-force-from-solver": {"buffer": "eff_cmd", "index": "destination-index", "variable": "source"}
+}
@@ -71,3 +71,9 @@ class AccumulateJointForceTranslator:
             # The destination where the accumulated forces should be store to
             "destination": destintation
         }
+
+
+# How the operator accesses its arguments (see kindynsyn.optimizer.access)
+my_solver_access = {
+    "ex-accumulate-joint-force": {"read": ["sources"], "write": ["destination"]}
+}
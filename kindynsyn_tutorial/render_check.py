@@ -0,0 +1,166 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import re
+import sys
+import json
+import shlex
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_GENERATOR_PATH = os.path.join(ROOT, "code_generator")
+APPLICATION_PATH = os.path.join(ROOT, "models", "templates", "applications")
+
+# The IRs and the outputs of the StringTemplate Standalone Tool that the
+# renderer's outputs are compared with
+GOLDEN_PATH = os.path.join(CODE_GENERATOR_PATH, "golden")
+
+# The renderer that records the golden outputs and the one that is checked
+STST = os.environ.get("STST", "stst")
+RENDERER = [sys.executable, "-m", "kindynsyn.code_gen"]
+
+# Per IR the tutorial, its postprocessors, the batch size and the applications
+# that render it. Together they cover all applications in APPLICATION_PATH.
+JOBS = {
+    "fpk": ("fpk", [], None, ["tutorial_dyn2b"]),
+    "fpk_batch": ("fpk", [], 4, ["tutorial_dyn2b"]),
+    "rne": ("rne", [], None, ["tutorial_dyn2b"]),
+    "rne_slv_robif": ("rne_slv_robif", [], None, [
+        "tutorial_dyn2b_slv_print",
+        "tutorial_dyn2b_slv_robif2b"
+    ]),
+    "rne_slv_robif_ctrl": ("rne_slv_robif_ctrl", [], None, [
+        "tutorial_dyn2b_slv_print_ctrl",
+        "tutorial_dyn2b_slv_robif2b_ctrl"
+    ]),
+    "rne_slv_robif_ctrl_log": ("rne_slv_robif_ctrl", ["log"], None, [
+        "tutorial_dyn2b_slv_print_ctrl_log",
+        "tutorial_dyn2b_slv_robif2b_ctrl_log",
+        "tutorial_dyn2b_slv_robif2b_ctrl_binlog"
+    ])
+}
+
+# The templates of an application group that the code generator renders
+TEMPLATES = ["application", "header"]
+
+
+def ir_file(job):
+    return os.path.join(GOLDEN_PATH, job + ".gen-ir.json")
+
+
+def golden_file(job, application, template):
+    return os.path.join(GOLDEN_PATH, "{}.{}.{}".format(job, application, template))
+
+
+def templates(application):
+    """
+    Return the templates of the application's group that the code generator
+    renders
+    """
+    with open(os.path.join(APPLICATION_PATH, application + ".stg")) as f:
+        group = f.read()
+    return [t for t in TEMPLATES if re.search(r"^{}\(".format(t), group, re.MULTILINE)]
+
+
+def render(command, application, template, ir):
+    """
+    Render a template of the application with an IR file like
+    code_generator/Makefile does
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT] + [p for p in [env.get("PYTHONPATH")] if p])
+    cmd = command + [
+        "-s", "<>", "-t", os.path.relpath(APPLICATION_PATH, CODE_GENERATOR_PATH),
+        "{}.{}".format(application, template), ir
+    ]
+    res = subprocess.run(cmd, cwd=CODE_GENERATOR_PATH, env=env, capture_output=True, text=True)
+    if res.returncode != 0:
+        raise RuntimeError("{} failed: {}".format(" ".join(cmd), res.stderr.strip()))
+    return res.stdout
+
+
+def record():
+    """
+    Synthesize the IRs and render their golden outputs with the StringTemplate
+    Standalone Tool
+    """
+    # The synthesis requires the models and resolves them (like the SPARQL
+    # queries) relative to the repository
+    os.chdir(ROOT)
+    from runner import KINOVA_GEN3, load_configuration, synthesize
+    from layered_check import seed_uuids
+
+    os.makedirs(GOLDEN_PATH, exist_ok=True)
+
+    for job, (tutorial, postprocessors, batch_size, applications) in JOBS.items():
+        conf = load_configuration(tutorial, postprocessors)
+        conf["batch-size"] = batch_size
+        # Stable names so that the recorded files only change with the models
+        seed_uuids()
+        _, _, ir_prog = synthesize(conf, KINOVA_GEN3)
+        with open(ir_file(job), "w") as f:
+            json.dump(ir_prog, f, indent=4)
+
+        for application in applications:
+            for template in templates(application):
+                text = render(shlex.split(STST), application, template, ir_file(job))
+                with open(golden_file(job, application, template), "w") as f:
+                    f.write(text)
+
+
+def difference(text, golden):
+    """
+    Return the number of the first line where the texts differ
+    """
+    lines, golden_lines = text.split("\n"), golden.split("\n")
+    for i, (l, g) in enumerate(zip(lines, golden_lines)):
+        if l != g:
+            return i + 1
+    return min(len(lines), len(golden_lines)) + 1
+
+
+def check():
+    """
+    Return the regressions of the renderer's outputs with respect to the
+    golden outputs
+    """
+    regressions = []
+    for job, (_, _, _, applications) in JOBS.items():
+        for application in applications:
+            for template in templates(application):
+                golden = golden_file(job, application, template)
+                if not os.path.exists(golden):
+                    regressions.append("{}: no golden output".format(os.path.relpath(golden, ROOT)))
+                    continue
+
+                with open(golden) as f:
+                    expected = f.read()
+                text = render(RENDERER, application, template, ir_file(job))
+                if text != expected:
+                    regressions.append("{}: differs in line {}".format(
+                        os.path.relpath(golden, ROOT), difference(text, expected)))
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ["-h", "--help"]:
+        print("Usage:")
+        print("#", sys.argv[0], "[--record]")
+        print("Compares the in-process renderer's outputs of all tutorial applications")
+        print("with the golden outputs of the StringTemplate Standalone Tool in")
+        print(os.path.relpath(GOLDEN_PATH, ROOT) + ". With --record, the IRs are synthesized and the")
+        print("golden outputs are rendered with the tool (see STST) instead.")
+        sys.exit(2)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--record":
+        record()
+        sys.exit(0)
+
+    regressions = check()
+    for r in regressions:
+        print("Regression:", r)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
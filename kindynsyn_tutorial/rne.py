@@ -1,4 +1,6 @@
 # SPDX-License-Identifier: MPL-2.0
+from kindynsyn.namespaces import KC_STAT
+from kindynsyn.optimizer import select_data
 from kindynsyn.synthesizer.synthesizer import SweepDirection, SweepConfig, \
     SolverConfig
 from kindynsyn.synthesizer.graph_factories import (
@@ -18,6 +20,10 @@ from kindynsyn.synthesizer.steps import (
     QuasiStaticExternalForcePropagationState,
 )
 
+# The rigid-body inertias of all links are queried and translated at once
+# (inertia_check.py compares them with those of the per-link computation)
+batched_inertia = True
+
 
 def solver_configurator(g, cache, ROB, slv_algo):
     frm_world = ROB["world-frame"]
@@ -38,9 +44,11 @@ def solver_configurator(g, cache, ROB, slv_algo):
     j_dyn = JointDynamicsStep(g, cache, kc_stat, slv_algo)
     pos_prop = PositionPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
     pos_acc = PositionAccumulationStep(g, cache, slv_algo, geom, geom_coord)
-    vel_prop = VelocityPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
-    acc_prop = AccelerationPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
-    rbi = RigidBodyInertiaStep(g, cache, slv_algo, dyn)
+    # The Kinova Gen3 is mounted on a fixed base (drop "fixed_base" for a moving
+    # base, otherwise its velocity is assumed to be zero)
+    vel_prop = VelocityPropagationStep(g, cache, slv_algo, geom, geom_coord, kc, fixed_base=True)
+    acc_prop = AccelerationPropagationStep(g, cache, slv_algo, geom, geom_coord, kc, fixed_base=True)
+    rbi = RigidBodyInertiaStep(g, cache, slv_algo, dyn, batched=batched_inertia)
     f_nrt = InertialForceStep(slv_algo, dyn_coord, dyn)
     nrt_prop = QuasiStaticInertialForcePropagationStep(slv_algo, dyn_coord, dyn, kc, kc_stat)
 
@@ -57,3 +65,7 @@ def solver_configurator(g, cache, ROB, slv_algo):
 
 def translator_configurator():
     return []
+
+
+def output_configurator(g, slv_algo):
+    return select_data(g, slv_algo["data"], KC_STAT["JointForce"])
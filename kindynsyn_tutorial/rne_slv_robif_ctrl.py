@@ -19,13 +19,15 @@ from kindynsyn.synthesizer.steps import (
     QuasiStaticExternalForcePropagationStep
 )
 from kindynsyn_tutorial.my_solver import MySolverStep, \
-    AccumulateJointForceTranslator
+    AccumulateJointForceTranslator, my_solver_access
 from kindynsyn_tutorial.my_robot_interface import (
     MY_IF, RobotInterfaceMeasurementStep, RobotInterfaceCommandStep,
-    JointConfigurationToSolverTranslator, JointConfigurationFromSolverTranslator
+    JointConfigurationToSolverTranslator, JointConfigurationFromSolverTranslator,
+    my_robot_interface_access
 )
 from kindynsyn_tutorial.my_controller import EX_CTRL, \
-    MyCartesianControllerStep, MyCartesianControllerTranslator
+    MyCartesianControllerStep, MyCartesianControllerTranslator, \
+    my_controller_access
 
 
 def solver_configurator(g, cache, ROB, slv_algo):
@@ -47,8 +49,10 @@ def solver_configurator(g, cache, ROB, slv_algo):
     j_dyn = JointDynamicsStep(g, cache, kc_stat, slv_algo)
     pos_prop = PositionPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
     pos_acc = PositionAccumulationStep(g, cache, slv_algo, geom, geom_coord)
-    vel_prop = VelocityPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
-    acc_prop = AccelerationPropagationStep(g, cache, slv_algo, geom, geom_coord, kc)
+    # The Kinova Gen3 is mounted on a fixed base (drop "fixed_base" for a moving
+    # base, otherwise its velocity is assumed to be zero)
+    vel_prop = VelocityPropagationStep(g, cache, slv_algo, geom, geom_coord, kc, fixed_base=True)
+    acc_prop = AccelerationPropagationStep(g, cache, slv_algo, geom, geom_coord, kc, fixed_base=True)
     rbi = RigidBodyInertiaStep(g, cache, slv_algo, dyn)
     f_nrt = InertialForceStep(slv_algo, dyn_coord, dyn)
     nrt_prop = QuasiStaticInertialForcePropagationStep(slv_algo, dyn_coord, dyn, kc, kc_stat)
@@ -99,3 +103,13 @@ def translator_configurator():
         JointConfigurationFromSolverTranslator(MY_IF["JointForceFromSolver"], "joint-force-from-solver"),
         MyCartesianControllerTranslator()
     ]
+
+
+def output_configurator(g, slv_algo):
+    # The joint forces are sent to the robot (an effect) so that no further
+    # outputs are required
+    return []
+
+
+def access_configurator():
+    return my_solver_access | my_robot_interface_access | my_controller_access
@@ -4,87 +4,153 @@ import rdflib
 
 from kindynsyn.namespaces import UUID
 from kindynsyn.utility import resolver, loader
-from kindynsyn.rdflib_tools import sparql_prepare, sparql_cache
+from kindynsyn.rdflib_tools import sparql_prepare, sparql_cache, parse_parallel
 from kindynsyn.ir_gen.translators import translator_list
 from kindynsyn.ir_gen import IRGenerator
-
-from kindynsyn.synthesizer.synthesizer import SolverSynthesizer
+from kindynsyn.rdflib_tools import qname
+from kindynsyn.ir_gen.translators import escape
+from kindynsyn.optimizer import DeadCodeElimination, ConstantFolding, \
+    BufferAllocation, SchedulePartition, RateGroupPartition, DependencyGraph, \
+    CostModel, LoopRolling, InterfaceAliasing
+
+from kindynsyn.synthesizer.synthesizer import SolverSynthesizer, Provenance
+from kindynsyn.synthesizer.shortcuts import Shortcuts
 from kindynsyn.synthesizer.graph_factories import Algorithm
 
 import sys
 import importlib
 
-try:
-    # Dynamically load the tutorial module as specified via the command line
+METAMODELS = "https://comp-rob2b.github.io/metamodels/"
+MODELS = "https://comp-rob2b.github.io/robot-models/"
+SPARQL_PATH = "models/sparql"
+
+URL_MAP = {
+    METAMODELS: "comp-rob2b/metamodels/",
+    MODELS: "comp-rob2b/robot-models/"
+}
+
+# The models of the Kinova Gen3 robot and its connection to the "world"
+KINOVA_GEN3 = {
+    "namespace": "https://comp-rob2b.github.io/robots/kinova/gen3/7dof/",
+    "models": [
+        MODELS + "kinova/gen3/7dof/robot.geom.json",
+        MODELS + "kinova/gen3/7dof/robot.kin-chain.json",
+        MODELS + "kinova/gen3/7dof/robot.dyn.json",
+        MODELS + "kinova/gen3/7dof/mounting-upright.geom.json"
+    ],
+    "root": "link0-root",
+    "base": [
+        "pose-coord-link0-root-wrt-world-frame",
+        "velocity-twist-coord-link0-wrt-world-body",
+        "acceleration-twist-coord-link0-wrt-world-body"
+    ]
+}
+
+
+def load_configuration(tutorial, postprocessors=[]):
+    """
+    Load the configuration from the tutorial and postprocessor modules.
+    """
+    # Dynamically load the tutorial module
     funcs = ["solver_configurator", "translator_configurator"]
-    _mod = importlib.__import__(name=sys.argv[1], fromlist=funcs)
-    solver_configurator = _mod.solver_configurator
-    translator_configurators = [_mod.translator_configurator]
+    _mod = importlib.__import__(name=tutorial, fromlist=funcs)
+    conf = {
+        "solver": _mod.solver_configurator,
+        "translators": [_mod.translator_configurator],
+        # Optional: declared outputs enable the removal of unused operations
+        "output": getattr(_mod, "output_configurator", None),
+        "access": [getattr(_mod, "access_configurator", dict)],
+        # Optional: interface buffers that variables alias instead of copies
+        "aliases": [getattr(_mod, "alias_configurator", dict)],
+        # Optional: number of samples that the solver evaluates per execution
+        "batch-size": getattr(_mod, "batch_size", None),
+        # Optional: period (in seconds) of the control loop's deadlines
+        "cycle-period": getattr(_mod, "cycle_period", None),
+        "postprocessors": []
+    }
 
-    postprocessors = []
-    for i in range(len(sys.argv) - 2):
+    for name in postprocessors:
         funcs = ["postprocessor", "translator_configurator"]
-        _mod = importlib.__import__(name=sys.argv[i + 2], fromlist=funcs)
-        postprocessors.append(_mod.postprocessor)
-        translator_configurators.append(_mod.translator_configurator)
-except:
-    print("Usage:")
-    print("#", sys.argv[0], "<tutorial> [<postprocessor>]")
-    print("where <tutorial> is one of:")
-    print("- fpk")
-    print("- rne")
-    print("- rne_slv_robif")
-    print("- rne_slv_robif_ctrl")
-    print("where <postprocessor> is one of:")
-    print("- log")
-    sys.exit()
+        _mod = importlib.__import__(name=name, fromlist=funcs)
+        conf["postprocessors"].append(_mod.postprocessor)
+        conf["translators"].append(_mod.translator_configurator)
+        conf["access"].append(getattr(_mod, "access_configurator", dict))
+        conf["aliases"].append(getattr(_mod, "alias_configurator", dict))
+
+    return conf
+
+
+def configure(argv):
+    """
+    Load the configuration from the tutorial and postprocessor modules that are
+    named on the command line.
+    """
+    try:
+        return load_configuration(argv[1], argv[2:])
+    except:
+        print("Usage:")
+        print("#", argv[0], "<tutorial> [<postprocessor>]")
+        print("where <tutorial> is one of:")
+        print("- fpk")
+        print("- rne")
+        print("- rne_slv_robif")
+        print("- rne_slv_robif_ctrl")
+        print("where <postprocessor> is one of:")
+        print("- log")
+        print("- binlog")
+        print("- zero_copy")
+        sys.exit()
+
+
+def load(robot):
+    """
+    Parse the robot's models into a new graph (the IRIs must be resolvable, see
+    URL_MAP). The models are parsed in parallel.
+    """
+    g = rdflib.ConjunctiveGraph()
+    g.bind("uuid", UUID)
 
+    return parse_parallel(g, robot["models"], "json-ld", URL_MAP)
 
-def main():
-    OUT_FILE = "gen/solver.gen-ir.json"
-    SPARQL_PATH = "models/sparql"
 
-    ROB = rdflib.Namespace("https://comp-rob2b.github.io/robots/kinova/gen3/7dof/")
-    METAMODELS = "https://comp-rob2b.github.io/metamodels/"
-    MODELS = "https://comp-rob2b.github.io/robot-models/"
+def synthesize(conf, robot=KINOVA_GEN3, g=None, cache=None, shortcuts=None):
+    """
+    Synthesize, optimize and translate the solver for the robot (by default the
+    Kinova Gen3) to the intermediate representation. Return the graph, the
+    provenance of the operations and the IR.
 
-    url_map = {
-        METAMODELS: "comp-rob2b/metamodels/",
-        MODELS: "comp-rob2b/robot-models/"
-    }
-    resolver.install(resolver.IriToFileResolver(url_map))
+    The robot's models are loaded unless a graph "g" is provided. Likewise, a
+    cache of the (compiled) SPARQL queries can be shared between syntheses and
+    the shortcut edges may already be materialized in the graph (see
+    Shortcuts). Note that the synthesis adds the solver to the graph.
+    """
+    if g is None:
+        resolver.install(resolver.IriToFileResolver(URL_MAP))
+        g = load(robot)
 
-    sparql_loader = loader(SPARQL_PATH)
-    cache = sparql_cache(sparql_loader, sparql_prepare)
-
-
-    #
-    # Load graph
-    #
-    g = rdflib.ConjunctiveGraph()
-    g.bind("uuid", UUID)
-
-    g.parse(MODELS + "kinova/gen3/7dof/robot.geom.json", format="json-ld")
-    g.parse(MODELS + "kinova/gen3/7dof/robot.kin-chain.json", format="json-ld")
-    g.parse(MODELS + "kinova/gen3/7dof/robot.dyn.json", format="json-ld")
-    g.parse(MODELS + "kinova/gen3/7dof/mounting-upright.geom.json", format="json-ld")
+    if cache is None:
+        sparql_loader = loader(SPARQL_PATH)
+        cache = sparql_cache(sparql_loader, sparql_prepare)
 
 
     #
     # Synthesize solver
     #
+    ROB = rdflib.Namespace(robot["namespace"])
 
     # Identify robot's connection to the "world"
-    frm_root = ROB["link0-root"]
-    base_x = ROB["pose-coord-link0-root-wrt-world-frame"]
-    base_v = ROB["velocity-twist-coord-link0-wrt-world-body"]
-    base_a = ROB["acceleration-twist-coord-link0-wrt-world-body"]
+    frm_root = ROB[robot["root"]]
+    slv_algo = { "data": [ ROB[b] for b in robot["base"] ], "func": [] }
 
-    slv_algo = { "data": [ base_x, base_v, base_a ], "func": [] }
-    slv_conf = solver_configurator(g, cache, ROB, slv_algo)
+    # Navigate the kinematic chain via materialized shortcut edges (the
+    # synthesizer materializes them unless they are still valid)
+    if shortcuts is None:
+        shortcuts = Shortcuts(g)
+    slv_conf = conf["solver"](g, shortcuts.loader(cache), ROB, slv_algo)
 
     # Run synthesis
-    s = SolverSynthesizer(g, slv_conf)
+    prov = Provenance(slv_algo)
+    s = SolverSynthesizer(g, slv_conf, prov, shortcuts)
     s.execute(frm_root, ["configure", "compute"])
 
     # Create algorithm representation
@@ -96,22 +162,88 @@ def main():
     #
     # Postprocess
     #
-    for postprocess in postprocessors:
+    for postprocess in conf["postprocessors"]:
         postprocess(g)
 
 
+    tr = list(translator_list)
+    for translator in conf["translators"]:
+        tr.extend(translator())
+
+
+    #
+    # Optimize
+    #
+    access = {}
+    for access_configurator in conf["access"]:
+        access |= access_configurator()
+
+    # Evaluate operations whose inputs are known at synthesis time
+    fold = ConstantFolding(g, tr, access)
+    fold.optimize(algo_id, sched)
+
+    outputs = []
+    if conf["output"]:
+        outputs = conf["output"](g, slv_algo)
+        dce = DeadCodeElimination(g, tr, access)
+        dce.optimize(algo_id, sched, outputs)
+
+
     #
     # Generate intermediate representation
     #
-    tr = translator_list
-    for translator in translator_configurators:
-        tr.extend(translator())
-    ir = IRGenerator(g, tr)
+    ir = IRGenerator(g, tr, conf["batch-size"], cycle_period=conf["cycle-period"])
     ir_prog = ir.generate(sched, algo_id)
 
-    with open(OUT_FILE, "w") as f:
+    # Alias the interface's buffers instead of copying them
+    aliases = {}
+    for alias_configurator in conf["aliases"]:
+        aliases |= alias_configurator()
+    if aliases:
+        InterfaceAliasing(aliases).optimize(ir_prog)
+
+    # Hoist the closures that are independent of runtime inputs out of the
+    # control loop
+    part = SchedulePartition(access)
+    part.optimize(ir_prog)
+
+    # Group the closures by their dependency on the joint state
+    rate = RateGroupPartition(access)
+    rate.optimize(ir_prog)
+
+    # Share memory between intermediate variables
+    alloc = BufferAllocation(access)
+    alloc.optimize(ir_prog, [escape(qname(g, o)) for o in outputs])
+
+    # Annotate the dependencies between closures (after the buffer allocation
+    # so that shared memory is taken into account)
+    dep = DependencyGraph(access)
+    dep.optimize(ir_prog)
+
+    # Roll the repeated per-segment closures into loops (last, so that the
+    # other steps operate on the individual closures)
+    loop = LoopRolling()
+    loop.optimize(ir_prog)
+
+    return g, prov, ir_prog
+
+
+def write(ir_prog, cost, ir_file="gen/solver.gen-ir.json", cost_file="gen/solver.gen-cost.json"):
+    with open(ir_file, "w") as f:
         json.dump(ir_prog, f, indent=4)
 
+    with open(cost_file, "w") as f:
+        json.dump(cost, f, indent=4)
+
+
+def main():
+    g, prov, ir_prog = synthesize(configure(sys.argv))
+
+    # Report the static cost of the schedule
+    cost = CostModel().report(ir_prog, prov.table(g))
+
+    write(ir_prog, cost)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,238 @@
+# SPDX-License-Identifier: MPL-2.0
+import os
+import re
+import sys
+import time
+import shlex
+import hashlib
+import subprocess
+from kindynsyn.rdflib_tools import LayeredGraph, sparql_prepare, sparql_cache
+from kindynsyn.utility import resolver, loader
+from kindynsyn.optimizer import CostModel
+from kindynsyn.synthesizer.shortcuts import Shortcuts
+from runner import URL_MAP, SPARQL_PATH, KINOVA_GEN3, load_configuration, \
+    load, synthesize, write
+
+TEMPLATE_PATH = "models/templates"
+APPLICATION_PATH = TEMPLATE_PATH + "/applications"
+IR_FILE = "gen/solver.gen-ir.json"
+
+# Templates of an application group and the files they are rendered to (the
+# same as in code_generator/Makefile)
+OUTPUTS = {
+    "application": "gen/main.c",
+    "header": "gen/log_record.h"
+}
+
+# The templates are rendered like in code_generator/Makefile: from its
+# directory and by the StringTemplate Standalone Tool unless the STST
+# environment variable selects another renderer (e.g. "python3 -m
+# kindynsyn.code_gen")
+CODE_GENERATOR_PATH = "code_generator"
+STST = os.environ.get("STST", "stst")
+
+# Polling interval in seconds
+INTERVAL = 0.5
+
+
+def scan(dirs):
+    """
+    Return the modification time and size of all files in the directories
+    (including symlinked ones such as the local copies of the models).
+    """
+    res = {}
+    for d in dirs:
+        for root, _, files in os.walk(d, followlinks=True):
+            for f in files:
+                path = os.path.join(root, f)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                res[path] = (st.st_mtime_ns, st.st_size)
+    return res
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class FileHashes:
+    """
+    The content hashes of all files in a set of directories. Files are only
+    hashed again if their modification time or size changed so that polling
+    is cheap and saving a file without changing it does not count as a change.
+    """
+    def __init__(self, dirs):
+        self.dirs = dirs
+        self.stats = {}
+        self.hashes = {}
+
+    def update(self):
+        """
+        Return whether any file was added, removed or changed its content
+        """
+        stats = scan(self.dirs)
+        hashes = {}
+        for path, st in stats.items():
+            if self.stats.get(path) == st:
+                hashes[path] = self.hashes[path]
+                continue
+            try:
+                hashes[path] = hash_file(path)
+            except OSError:
+                continue
+
+        changed = hashes != self.hashes
+        self.stats, self.hashes = stats, hashes
+        return changed
+
+
+class Watcher:
+    """
+    Regenerate the code whenever the models (see URL_MAP), the SPARQL queries
+    or the templates change. The stages only run if their inputs changed:
+    - "load": parse the robot's models (models)
+    - "synthesize": synthesize the solver and generate the IR (models, queries)
+    - "render": render the application's templates (IR, templates) with the
+      same renderer as the code generator (see STST)
+    A stage that fails (e.g. while a model is only partially saved) is retried
+    on the next change. The loaded models and the prepared queries are kept
+    between changes.
+    """
+    def __init__(self, tutorial, application, postprocessors=[], robot=KINOVA_GEN3):
+        self.tutorial = tutorial
+        self.postprocessors = postprocessors
+        self.application = application
+        self.robot = robot
+
+        self.models = FileHashes(list(URL_MAP.values()))
+        self.queries = FileHashes([SPARQL_PATH])
+        self.templates = FileHashes([TEMPLATE_PATH])
+
+        self.graph = None
+        self.structure = None   # of the shortcut edges in the loaded models
+        self.cache = None
+        self.outputs = {}   # file -> hash of the last written content
+        self.dirty = {"load", "synthesize", "render"}
+
+    def poll(self):
+        """
+        Return whether any input changed since the last poll
+        """
+        changed = False
+        if self.models.update():
+            self.dirty |= {"load", "synthesize", "render"}
+            changed = True
+        if self.queries.update():
+            self.cache = None
+            self.dirty |= {"synthesize", "render"}
+            changed = True
+        if self.templates.update():
+            self.dirty.add("render")
+            changed = True
+        return changed
+
+    def load(self):
+        # Materialize the shortcut edges once in the loaded models instead of
+        # in the layer that each synthesis discards
+        base = load(self.robot)
+        shortcuts = Shortcuts(base)
+        shortcuts.update()
+        self.graph = LayeredGraph(base)
+        self.structure = shortcuts.structure
+
+    def synthesize(self):
+        if self.cache is None:
+            self.cache = sparql_cache(loader(SPARQL_PATH), sparql_prepare)
+
+        # Start from the loaded models without the previous solver
+        self.graph.discard()
+        conf = load_configuration(self.tutorial, self.postprocessors)
+        g, prov, ir_prog = synthesize(conf, self.robot, self.graph, self.cache,
+                                      Shortcuts(self.graph, self.structure))
+        write(ir_prog, CostModel().report(ir_prog, prov.table(g)), IR_FILE)
+
+    def render(self):
+        with open(os.path.join(APPLICATION_PATH, self.application + ".stg")) as f:
+            group = f.read()
+
+        for name, path in OUTPUTS.items():
+            if re.search(r"^{}\(".format(name), group, re.MULTILINE):
+                self.output(path, self.stst(name))
+
+        with open(os.path.join(TEMPLATE_PATH, "CMakeLists.txt")) as f:
+            self.output("gen/CMakeLists.txt", f.read())
+
+    def stst(self, name):
+        """
+        Render a template of the application with the IR file
+        """
+        cmd = shlex.split(STST) + [
+            "-s", "<>", "-t", os.path.relpath(APPLICATION_PATH, CODE_GENERATOR_PATH),
+            "{}.{}".format(self.application, name), os.path.relpath(IR_FILE, CODE_GENERATOR_PATH)
+        ]
+        res = subprocess.run(cmd, cwd=CODE_GENERATOR_PATH, capture_output=True, text=True)
+        if res.returncode != 0:
+            raise RuntimeError("{} failed: {}".format(" ".join(cmd), res.stderr.strip()))
+        return res.stdout
+
+    def output(self, path, text):
+        """
+        Write a generated file unless its content is unchanged (so that the
+        build system does not recompile it)
+        """
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        if self.outputs.get(path) == digest and os.path.exists(path):
+            return
+
+        with open(path, "w") as f:
+            f.write(text)
+        self.outputs[path] = digest
+
+    def run(self):
+        """
+        Execute the stages that are out of date
+        """
+        for stage in ["load", "synthesize", "render"]:
+            if stage not in self.dirty:
+                continue
+
+            start = time.perf_counter()
+            try:
+                getattr(self, stage)()
+            except Exception as e:
+                print("{}: failed: {}: {}".format(stage, type(e).__name__, e))
+                return
+            self.dirty.discard(stage)
+            print("{}: {:.2f} s".format(stage, time.perf_counter() - start))
+
+    def watch(self):
+        self.poll()
+        self.run()
+        while True:
+            time.sleep(INTERVAL)
+            if self.poll():
+                self.run()
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage:")
+        print("#", sys.argv[0], "<tutorial> <application> [<postprocessor>]")
+        print("where <application> is a group in", APPLICATION_PATH)
+        print("(e.g. tutorial_dyn2b for the rne tutorial)")
+        sys.exit()
+
+    resolver.install(resolver.IriToFileResolver(URL_MAP))
+
+    watcher = Watcher(sys.argv[1], sys.argv[2], sys.argv[3:])
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
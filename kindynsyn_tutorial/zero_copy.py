@@ -0,0 +1,13 @@
+from kindynsyn_tutorial.my_robot_interface import my_robot_interface_aliases
+
+# The joint variables alias the robot interface's buffers so that the
+# per-joint copies disappear from the schedule (robif2b applications only)
+
+def postprocessor(g):
+    pass
+
+def translator_configurator():
+    return []
+
+def alias_configurator():
+    return my_robot_interface_aliases